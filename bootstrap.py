@@ -0,0 +1,162 @@
+"""
+Vectorized bootstrap confidence intervals.
+
+Every series (a route, a financial metric) is a row of an ``(M, n)`` matrix
+of observations, with NaN where a row has no value for a quarter. The
+``n_resamples`` bootstrap resamples are drawn once, as a ``(B, n)`` matrix of
+how often each observation appears in each resample, and shared by all rows:
+resampled sums of every row are then one matrix product with that count
+matrix, and means and standard deviations follow from sums of (row-centered)
+values and squares with missing observations masked out. Percentile
+intervals come from one quantile reduction over the ``(M, B)`` statistics.
+
+When ``M * B * n`` exceeds ``parallel_threshold`` the rows are split across a
+process pool. The observations and the count matrix are placed once in a
+shared memory block (``scenario_pool.SharedArrays``) and each worker writes
+its rows of the result in place.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from scenario_pool import BlockSpec, SharedArrays
+
+STATISTICS = ('mean', 'std')
+
+@dataclass
+class BootstrapResult:
+    """Point estimates and percentile confidence intervals, one entry per row."""
+    labels: List[str]
+    estimate: np.ndarray
+    lower: np.ndarray
+    upper: np.ndarray
+    std_error: np.ndarray  # standard deviation of the bootstrap distribution
+    confidence: float
+    n_resamples: int
+
+    def as_dict(self) -> Dict[str, Dict[str, float]]:
+        """Per-label estimate, interval and standard error as native floats."""
+        return {
+            label: {
+                'estimate': float(self.estimate[i]),
+                'lower': float(self.lower[i]),
+                'upper': float(self.upper[i]),
+                'std_error': float(self.std_error[i]),
+            }
+            for i, label in enumerate(self.labels)
+        }
+
+def resample_counts(n: int, n_resamples: int, seed: Optional[int] = None) -> np.ndarray:
+    """``(n_resamples, n)`` counts of each observation in each resample with replacement."""
+    rng = np.random.default_rng(seed)
+    indices = rng.integers(0, n, size=(n_resamples, n))
+    indices += np.arange(n_resamples)[:, None] * n
+    return np.bincount(indices.ravel(), minlength=n_resamples * n).reshape(n_resamples, n).astype(float)
+
+def _estimate(values: np.ndarray, statistic: str) -> np.ndarray:
+    """Statistic of each row over its observed values."""
+    counts = (~np.isnan(values)).sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        if statistic == 'mean':
+            return np.where(counts > 0, np.nansum(values, axis=1) / np.maximum(counts, 1), np.nan)
+        means = np.nansum(values, axis=1) / np.maximum(counts, 1)
+        squares = np.nansum((values - means[:, None]) ** 2, axis=1)
+        return np.where(counts > 1, np.sqrt(squares / np.maximum(counts - 1, 1)), np.nan)
+
+def _resampled_statistics(values: np.ndarray, counts: np.ndarray, statistic: str) -> np.ndarray:
+    """``(rows, n_resamples)`` statistic of every row under every resample."""
+    observed = ~np.isnan(values)
+    # Center each row so second moments do not cancel catastrophically
+    center = np.nan_to_num(_estimate(values, 'mean'))
+    centered = np.where(observed, values - center[:, None], 0.0)
+    k = observed.astype(float) @ counts.T
+    sums = centered @ counts.T
+    with np.errstate(invalid='ignore', divide='ignore'):
+        means = np.where(k > 0, sums / k, np.nan)
+        if statistic == 'mean':
+            return means + center[:, None]
+        squares = (centered * centered) @ counts.T
+        variance = np.maximum(squares - k * means * means, 0.0) / (k - 1)
+        return np.where(k > 1, np.sqrt(variance), np.nan)
+
+def _summarize(values: np.ndarray, counts: np.ndarray, statistic: str,
+               confidence: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Lower bound, upper bound and standard error of each row's bootstrap distribution."""
+    resampled = _resampled_statistics(values, counts, statistic)
+    alpha = (1 - confidence) / 2
+    lower, upper = np.full(len(values), np.nan), np.full(len(values), np.nan)
+    std_error = np.full(len(values), np.nan)
+    valid = ~np.isnan(resampled).all(axis=1)
+    if valid.any():
+        bounds = np.nanquantile(resampled[valid], [alpha, 1 - alpha], axis=1)
+        lower[valid], upper[valid] = bounds
+        std_error[valid] = np.nanstd(resampled[valid], axis=1)
+    return lower, upper, std_error
+
+def _bootstrap_rows(inputs_spec: BlockSpec, outputs_spec: BlockSpec, statistic: str,
+                    confidence: float, start: int, stop: int) -> int:
+    """Worker: summarize rows ``start:stop`` of the shared observations in place."""
+    inputs = SharedArrays.attach(inputs_spec)
+    outputs = SharedArrays.attach(outputs_spec, readonly=False)
+    try:
+        lower, upper, std_error = _summarize(inputs['values'][start:stop], inputs['counts'],
+                                             statistic, confidence)
+        outputs['lower'][start:stop] = lower
+        outputs['upper'][start:stop] = upper
+        outputs['std_error'][start:stop] = std_error
+    finally:
+        inputs.close()
+        outputs.close()
+    return stop - start
+
+def bootstrap_ci(values, statistic: str = 'mean', n_resamples: int = 2000, confidence: float = 0.95,
+                 seed: Optional[int] = None, labels: Optional[Sequence[str]] = None,
+                 workers: Optional[int] = None, parallel_threshold: float = 5e7,
+                 chunk_rows: int = 256) -> BootstrapResult:
+    """Percentile bootstrap intervals of a statistic for every row of ``values``.
+
+    ``values`` is ``(M, n)`` (or a single series) with NaN for missing
+    observations. ``workers=None`` uses a process pool of ``os.cpu_count()``
+    workers only when ``M * n_resamples * n`` reaches ``parallel_threshold``;
+    ``workers=0`` always stays in-process.
+    """
+    if statistic not in STATISTICS:
+        raise ValueError(f"Unknown statistic: {statistic}. Must be one of {list(STATISTICS)}")
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    n_rows, n = values.shape
+    labels = [str(i) for i in range(n_rows)] if labels is None else list(labels)
+    if len(labels) != n_rows:
+        raise ValueError("Number of labels does not match number of rows")
+
+    estimate = _estimate(values, statistic)
+    if n == 0 or n_rows == 0:
+        empty = np.full(n_rows, np.nan)
+        return BootstrapResult(labels, estimate, empty, empty.copy(), empty.copy(), confidence, n_resamples)
+
+    counts = resample_counts(n, n_resamples, seed)
+    if workers is None:
+        workers = (os.cpu_count() or 1) if n_rows * n_resamples * n >= parallel_threshold else 0
+    workers = min(workers, -(-n_rows // chunk_rows))
+
+    if workers <= 1:
+        parts = [_summarize(values[i:i + chunk_rows], counts, statistic, confidence)
+                 for i in range(0, n_rows, chunk_rows)]
+        lower, upper, std_error = (np.concatenate(part) for part in zip(*parts))
+    else:
+        inputs = SharedArrays.create({'values': values, 'counts': counts})
+        outputs = SharedArrays.create({name: np.full(n_rows, np.nan) for name in ('lower', 'upper', 'std_error')})
+        try:
+            starts = list(range(0, n_rows, chunk_rows))
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(_bootstrap_rows, [inputs.spec] * len(starts), [outputs.spec] * len(starts),
+                              [statistic] * len(starts), [confidence] * len(starts),
+                              starts, [min(s + chunk_rows, n_rows) for s in starts]))
+            lower, upper, std_error = (outputs[name].copy() for name in ('lower', 'upper', 'std_error'))
+        finally:
+            inputs.close()
+            outputs.close()
+    return BootstrapResult(labels, estimate, lower, upper, std_error, confidence, n_resamples)
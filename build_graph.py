@@ -0,0 +1,173 @@
+"""
+Dependency-tracked incremental builds of output artifacts.
+
+A ``Target`` lists the files an artifact is built from (quarterly reports,
+images, other artifacts), the parameters it is built with and the function
+that builds it. Its key is a SHA-256 digest of the input file contents, the
+parameters (as sorted JSON) and the code version: the sources of every project
+module loaded in the process. A ``BuildGraph`` keeps each target's last key
+and outputs in a JSON manifest and rebuilds a target only when its key
+changed or one of its outputs is missing. Targets are built in dependency
+order, so a target fed by another target's outputs is checked after that
+target has been brought up to date.
+
+File digests are cached in the manifest by size and modification time, so
+checking thousands of unchanged reports does not re-read them.
+"""
+import hashlib
+import json
+import os
+import sys
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Union
+
+_PROJECT_ROOT = Path(__file__).resolve().parent
+_code_digest: Optional[str] = None
+
+def code_version() -> str:
+    """Digest of the sources of all project modules loaded in this process."""
+    global _code_digest
+    if _code_digest is None:
+        sources = set()
+        for module in list(sys.modules.values()):
+            path = getattr(module, '__file__', None)
+            if path and path.endswith('.py'):
+                path = Path(path).resolve()
+                if _PROJECT_ROOT in path.parents:
+                    sources.add(path)
+        digest = hashlib.sha256()
+        for path in sorted(sources):
+            digest.update(str(path.relative_to(_PROJECT_ROOT)).encode('utf-8'))
+            digest.update(path.read_bytes())
+        _code_digest = digest.hexdigest()[:16]
+    return _code_digest
+
+@dataclass
+class Target:
+    """An artifact, the inputs it depends on and how to build it.
+
+    ``build`` returns the paths it wrote, or None to use ``outputs``; use
+    this for outputs whose names are only known after building (e.g.
+    timestamped exports).
+    """
+    name: str
+    outputs: List[Path] = field(default_factory=list)
+    inputs: List[Path] = field(default_factory=list)
+    params: Dict = field(default_factory=dict)
+    build: Optional[Callable[[], Optional[Iterable[Union[str, Path]]]]] = None
+
+    def __post_init__(self):
+        self.outputs = [Path(path) for path in self.outputs]
+        self.inputs = [Path(path) for path in self.inputs]
+
+class BuildGraph:
+    """Targets rebuilt only when their inputs, parameters or code changed."""
+
+    def __init__(self, manifest_path: Union[str, Path] = 'visualizations/.build_manifest.json'):
+        self.manifest_path = Path(manifest_path)
+        self.targets: Dict[str, Target] = {}
+        self.manifest = {'targets': {}, 'files': {}}
+        if self.manifest_path.exists():
+            with open(self.manifest_path, 'r') as f:
+                self.manifest = json.load(f)
+
+    def add(self, target: Target) -> Target:
+        if target.name in self.targets:
+            raise ValueError(f"Duplicate build target: {target.name}")
+        self.targets[target.name] = target
+        return target
+
+    def file_digest(self, path: Path) -> str:
+        """Content digest of a file, cached by size and modification time."""
+        stat = path.stat()
+        cached = self.manifest['files'].get(str(path))
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        self.manifest['files'][str(path)] = [stat.st_size, stat.st_mtime_ns, digest]
+        return digest
+
+    def key(self, target: Target) -> str:
+        """Digest of everything the target's outputs depend on."""
+        digest = hashlib.sha256()
+        digest.update(code_version().encode('utf-8'))
+        digest.update(json.dumps(target.params, sort_keys=True, default=str).encode('utf-8'))
+        for path in sorted(set(target.inputs)):
+            digest.update(str(path).encode('utf-8'))
+            digest.update(self.file_digest(path).encode('utf-8') if path.exists() else b'missing')
+        return digest.hexdigest()
+
+    def stale(self, target: Target) -> bool:
+        """Whether the target's recorded key differs or an output is missing."""
+        record = self.manifest['targets'].get(target.name)
+        if record is None or record['key'] != self.key(target):
+            return True
+        return not record['outputs'] or not all(Path(path).exists() for path in record['outputs'])
+
+    def outputs(self, name: str) -> List[Path]:
+        """Outputs recorded by the last build of a target."""
+        record = self.manifest['targets'].get(name)
+        return [Path(path) for path in record['outputs']] if record else []
+
+    def record(self, target: Target, outputs: Optional[Iterable[Union[str, Path]]] = None):
+        """Mark a target as built from its current inputs and save the manifest."""
+        outputs = [str(path) for path in (outputs if outputs is not None else target.outputs)]
+        self.manifest['targets'][target.name] = {
+            'key': self.key(target),
+            'outputs': outputs,
+            'built_at': datetime.now().isoformat(timespec='seconds'),
+        }
+        # Outputs may be inputs of later targets; refresh their cached digests
+        for path in outputs:
+            self.manifest['files'].pop(path, None)
+        self.save()
+
+    def save(self):
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.manifest_path.with_name(f'.{self.manifest_path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _order(self) -> List[Target]:
+        """Targets sorted so producers come before the targets reading their outputs."""
+        producers = {}
+        for target in self.targets.values():
+            for path in list(target.outputs) + self.outputs(target.name):
+                producers[path] = target.name
+        ordered, visiting, done = [], set(), set()
+
+        def visit(name: str):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Build targets form a cycle at: {name}")
+            visiting.add(name)
+            for path in self.targets[name].inputs:
+                producer = producers.get(path)
+                if producer is not None and producer != name:
+                    visit(producer)
+            visiting.discard(name)
+            done.add(name)
+            ordered.append(self.targets[name])
+
+        for name in self.targets:
+            visit(name)
+        return ordered
+
+    def build(self, names: Optional[Sequence[str]] = None, force: bool = False) -> Dict[str, bool]:
+        """Bring targets up to date; returns whether each one was rebuilt."""
+        built = {}
+        for target in self._order():
+            if names is not None and target.name not in names:
+                continue
+            if force or self.stale(target):
+                outputs = target.build() if target.build is not None else None
+                self.record(target, outputs)
+                built[target.name] = True
+            else:
+                built[target.name] = False
+        self.save()  # keep refreshed file digests even when nothing was rebuilt
+        return built
@@ -0,0 +1,122 @@
+"""
+Binary checkpoint/restart support for long simulation runs.
+
+A checkpoint holds the full mutable state of a ``BimanSimulation``: the fleet,
+the route network, the financial model (metrics, liabilities, assets), the
+action log, the maintenance scheduler, the revenue-management model (its
+random generator and remembered base values), the current quarter and the
+reports produced so far. It also records the run it belongs to (quarter count
+and compiled action plan), so a resume can refuse a checkpoint written by a
+different run. It is stored as a short header followed by a zlib-compressed
+pickle and written atomically, so a crash mid-write never corrupts the
+previous checkpoint.
+"""
+import os
+import pickle
+import zlib
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+MAGIC = b'BIMANCKP'
+FORMAT_VERSION = 1
+CHECKPOINT_PATTERN = 'checkpoint_*.ckpt'
+
+
+def snapshot_state(simulation) -> bytes:
+    """Serialize the mutable model state of a simulation in memory (no compression)."""
+    return pickle.dumps(
+        (simulation.fleet, simulation.route_network, simulation.financial_model,
+         simulation.action_log, simulation.current_quarter, simulation.maintenance,
+         simulation.revenue_management),
+        protocol=pickle.HIGHEST_PROTOCOL
+    )
+
+
+def restore_snapshot(simulation, data: bytes):
+    """Restore simulation state from ``snapshot_state`` bytes."""
+    (simulation.fleet, simulation.route_network, simulation.financial_model,
+     simulation.action_log, simulation.current_quarter, simulation.maintenance,
+     simulation.revenue_management) = pickle.loads(data)
+
+
+def checkpoint_path(checkpoint_dir: Union[str, Path], quarter_index: int) -> Path:
+    """Get the checkpoint file path for a completed quarter index."""
+    return Path(checkpoint_dir) / f'checkpoint_{quarter_index:04d}.ckpt'
+
+
+def save_checkpoint(simulation, checkpoint_dir: Union[str, Path],
+                    quarter_index: int, reports: list, keep: int = 2,
+                    run: Optional[Dict] = None) -> Path:
+    """Write a checkpoint after ``quarter_index`` quarters have completed.
+
+    ``run`` identifies the run being checkpointed (see ``check_checkpoint_run``).
+    """
+    state = {
+        'run': run,
+        'quarter_index': quarter_index,
+        'current_quarter': simulation.current_quarter,
+        'fleet': simulation.fleet,
+        'route_network': simulation.route_network,
+        'financial_model': simulation.financial_model,
+        'action_log': simulation.action_log,
+        'maintenance': simulation.maintenance,
+        'revenue_management': simulation.revenue_management,
+        'reports': reports,
+    }
+    payload = zlib.compress(pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL), 6)
+
+    directory = Path(checkpoint_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = checkpoint_path(directory, quarter_index)
+    tmp_path = path.with_suffix('.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + bytes([FORMAT_VERSION]) + payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+    # Prune older checkpoints, keeping the most recent ``keep`` files
+    if keep:
+        for old_path in sorted(directory.glob(CHECKPOINT_PATTERN))[:-keep]:
+            old_path.unlink()
+    return path
+
+
+def load_checkpoint(path: Union[str, Path]) -> Dict:
+    """Load a checkpoint file and return its state dict."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    header_len = len(MAGIC) + 1
+    if data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not a simulation checkpoint: {path}")
+    if data[len(MAGIC)] != FORMAT_VERSION:
+        raise ValueError(f"Unsupported checkpoint format version {data[len(MAGIC)]} in {path}")
+    return pickle.loads(zlib.decompress(data[header_len:]))
+
+
+def latest_checkpoint(checkpoint_dir: Union[str, Path]) -> Optional[Path]:
+    """Get the most recent checkpoint in a directory, if any."""
+    checkpoints = sorted(Path(checkpoint_dir).glob(CHECKPOINT_PATTERN))
+    return checkpoints[-1] if checkpoints else None
+
+
+def check_checkpoint_run(state: Dict, run: Dict, path: Union[str, Path]):
+    """Raise ``ValueError`` unless a loaded checkpoint was written by ``run``.
+
+    ``run`` holds the ``quarters`` count and the compiled ``plan`` ops per quarter.
+    """
+    saved = state.get('run') or {}
+    for name, description in (('quarters', 'quarter count'), ('plan', 'action plan')):
+        if saved.get(name) != run[name]:
+            raise ValueError(f"Checkpoint {path} was written by a run with a different {description}")
+
+
+def restore_checkpoint(simulation, state: Dict):
+    """Restore simulation state from a loaded checkpoint."""
+    simulation.fleet = state['fleet']
+    simulation.route_network = state['route_network']
+    simulation.financial_model = state['financial_model']
+    simulation.action_log = state['action_log']
+    simulation.current_quarter = state['current_quarter']
+    simulation.maintenance = state.get('maintenance', simulation.maintenance)
+    simulation.revenue_management = state.get('revenue_management', simulation.revenue_management)
@@ -0,0 +1,190 @@
+"""
+Offline, split-payload output for the Plotly dashboard.
+
+The split layout writes one HTML shell per dashboard that references a single
+``plotly.min.js`` bundle shared by every dashboard in the output directory,
+plus one JSON (optionally pre-gzipped) data file per subplot panel. Panels are
+fetched lazily as they scroll into view, so nothing is loaded from the network
+and a dashboard's HTML stays a few kilobytes regardless of data volume.
+
+The files are loaded with ``fetch``, so the directory must be opened through a
+local static file server (e.g. ``python -m http.server``) rather than
+``file://``.
+"""
+import gzip
+import html
+import json
+from pathlib import Path
+from typing import Dict, List, Union
+
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+PLOTLY_BUNDLE = 'plotly.min.js'
+
+_PAGE_TEMPLATE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>{title}</title>
+<script src="{bundle}"></script>
+<style>
+body {{ font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; background: #f8f9fa; }}
+h1 {{ color: #003366; text-align: center; }}
+.panels {{ display: grid; grid-template-columns: repeat(auto-fit, minmax(800px, 1fr)); gap: 16px; padding: 16px; }}
+.panel {{ background: white; min-height: {panel_height}px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+</style>
+</head>
+<body>
+<h1>{title}</h1>
+<div class="panels">
+{panels}
+</div>
+<script>
+const TEMPLATE = {template};
+function loadPayload(src) {{
+    return fetch(src).then(function (response) {{
+        if (!response.ok) {{ throw new Error(src + ': ' + response.status); }}
+        if (src.endsWith('.gz')) {{
+            const stream = response.body.pipeThrough(new DecompressionStream('gzip'));
+            return new Response(stream).json();
+        }}
+        return response.json();
+    }});
+}}
+function renderPanel(div) {{
+    loadPayload(div.dataset.src).then(function (payload) {{
+        payload.layout.template = TEMPLATE;
+        Plotly.newPlot(div, payload.data, payload.layout, {{responsive: true}});
+    }}).catch(function (err) {{ div.textContent = 'Failed to load panel: ' + err; }});
+}}
+const observer = new IntersectionObserver(function (entries) {{
+    entries.forEach(function (entry) {{
+        if (entry.isIntersecting) {{
+            observer.unobserve(entry.target);
+            renderPanel(entry.target);
+        }}
+    }});
+}}, {{rootMargin: '200px'}});
+document.querySelectorAll('.panel').forEach(function (div) {{ observer.observe(div); }});
+</script>
+</body>
+</html>
+'''
+
+
+def ensure_plotly_bundle(output_dir: Union[str, Path]) -> Path:
+    """Write the shared plotly.js bundle into ``output_dir`` unless already present."""
+    bundle_path = Path(output_dir) / PLOTLY_BUNDLE
+    if not bundle_path.exists():
+        bundle_path.write_text(get_plotlyjs(), encoding='utf-8')
+    return bundle_path
+
+
+def _subplot_title(fig: go.Figure, x_domain, y_domain) -> str:
+    """Get the ``make_subplots`` title annotation centred above a panel, if any."""
+    x, y = (x_domain[0] + x_domain[1]) / 2, y_domain[1]
+    for annotation in fig.layout.annotations:
+        if (annotation.xref == 'paper' and annotation.yref == 'paper'
+                and annotation.x is not None and annotation.y is not None
+                and abs(annotation.x - x) < 1e-9 and abs(annotation.y - y) < 1e-9):
+            return annotation.text
+    return ''
+
+
+def split_subplot_panels(fig: go.Figure) -> List[Dict]:
+    """Split a ``make_subplots`` figure into one standalone payload per non-empty panel.
+
+    Traces are grouped by their own anchors: cartesian traces by ``xaxis``
+    and domain traces (tables, pies) by ``domain``. A panel's secondary y
+    axes become ``yaxis2``, ``yaxis3``, ... overlaying its primary y axis.
+    Panels are ordered top to bottom, left to right.
+    """
+    groups: Dict[tuple, List] = {}
+    for trace in fig.data:
+        if 'xaxis' in trace:
+            key = ('xy', trace.xaxis or 'x')
+        elif 'domain' in trace:
+            key = ('domain', tuple(trace.domain.x or (0, 1)), tuple(trace.domain.y or (0, 1)))
+        else:
+            continue
+        groups.setdefault(key, []).append(trace)
+
+    panels = []
+    for key, traces in groups.items():
+        if key[0] == 'xy':
+            xaxis_name = 'xaxis' + key[1][1:]
+            yaxis_name = 'yaxis' + (fig.layout[xaxis_name].anchor or 'y')[1:]
+            x_domain = fig.layout[xaxis_name].domain or (0, 1)
+            y_domain = fig.layout[yaxis_name].domain or (0, 1)
+        else:
+            _, x_domain, y_domain = key
+        title = _subplot_title(fig, x_domain, y_domain)
+        layout = {'title': {'text': title}, 'height': 450, 'showlegend': True}
+        y_refs: Dict[str, str] = {}  # source y axis -> panel y axis
+        if key[0] == 'xy':
+            primary = 'y' + yaxis_name[len('yaxis'):]
+            y_refs[primary] = 'y'
+            for trace in traces:
+                y_refs.setdefault(trace.yaxis or 'y', f'y{len(y_refs) + 1}')
+            layout['xaxis'] = fig.layout[xaxis_name].to_plotly_json()
+            for source, target in y_refs.items():
+                layout['yaxis' + target[1:]] = fig.layout['yaxis' + source[1:]].to_plotly_json()
+            for axis_name in ['xaxis'] + ['yaxis' + target[1:] for target in y_refs.values()]:
+                for axis_key in ('anchor', 'domain', 'matches', 'overlaying'):
+                    layout[axis_name].pop(axis_key, None)
+                if axis_name not in ('xaxis', 'yaxis'):
+                    layout[axis_name].update(anchor='x', overlaying='y')
+            layout['barmode'] = fig.layout.barmode
+
+        data = []
+        for trace in traces:
+            trace_json = trace.to_plotly_json()
+            for trace_key in ('xaxis', 'yaxis', 'domain', 'uid'):
+                trace_json.pop(trace_key, None)
+            if key[0] == 'xy' and y_refs[trace.yaxis or 'y'] != 'y':
+                trace_json['yaxis'] = y_refs[trace.yaxis]
+            data.append(trace_json)
+        panels.append(((-y_domain[1], x_domain[0]),
+                       {'title': title, 'data': data, 'layout': layout}))
+    panels.sort(key=lambda item: item[0])
+    return [panel for _, panel in panels]
+
+
+def write_split_dashboard(fig: go.Figure, save_path: Union[str, Path],
+                          gzip_payload: bool = False) -> Path:
+    """Write ``fig`` as an HTML shell plus lazily loaded per-panel data files."""
+    save_path = Path(save_path)
+    output_dir = save_path.parent
+    output_dir.mkdir(parents=True, exist_ok=True)
+    ensure_plotly_bundle(output_dir)
+
+    data_dir = output_dir / f'{save_path.stem}_data'
+    data_dir.mkdir(exist_ok=True)
+    suffix = '.json.gz' if gzip_payload else '.json'
+    for stale in list(data_dir.glob('panel_*.json')) + list(data_dir.glob('panel_*.json.gz')):
+        stale.unlink()
+
+    panel_divs = []
+    for i, panel in enumerate(split_subplot_panels(fig)):
+        payload = pio.to_json({'data': panel['data'], 'layout': panel['layout']},
+                              validate=False).encode('utf-8')
+        data_path = data_dir / f'panel_{i}{suffix}'
+        if gzip_payload:
+            payload = gzip.compress(payload, compresslevel=6, mtime=0)
+        data_path.write_bytes(payload)
+        panel_divs.append(
+            f'<div class="panel" data-src="{data_dir.name}/{data_path.name}"></div>'
+        )
+
+    template = fig.layout.template.to_plotly_json() if fig.layout.template else {}
+    title = fig.layout.title.text or 'Dashboard'
+    save_path.write_text(_PAGE_TEMPLATE.format(
+        title=html.escape(title),
+        bundle=PLOTLY_BUNDLE,
+        panel_height=450,
+        panels='\n'.join(panel_divs),
+        template=json.dumps(template, separators=(',', ':'))
+    ), encoding='utf-8')
+    return save_path
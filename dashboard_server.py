@@ -0,0 +1,284 @@
+"""
+Live local dashboard server with server-sent event (SSE) push updates.
+
+``LiveDashboardServer`` runs a small asyncio HTTP server on a background
+thread. Each quarterly report handed to ``publish`` (or registered as a
+report listener on ``BimanSimulation``) is reduced to a compact delta and
+streamed to every open dashboard over ``/events``; the page appends the new
+points to its existing traces instead of rebuilding figures. Clients that
+connect mid-run first receive the deltas published so far, up to the most
+recent ``max_history`` of them (older deltas are dropped so a long-lived
+server does not grow without bound).
+
+The server needs no network access: plotly.js is served from the installed
+plotly package, and an optional ``static_dir`` is served as plain files (e.g.
+split dashboards written by ``dashboard_output``).
+"""
+import asyncio
+import json
+import mimetypes
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Deque, Dict, Optional, Set, Union
+
+from plotly.offline import get_plotlyjs
+
+HEARTBEAT_SECONDS = 15
+MAX_HISTORY = 1000  # quarterly deltas replayed to new clients
+
+_LIVE_PAGE = '''<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="UTF-8">
+<title>Biman Bangladesh Airlines Live Dashboard</title>
+<script src="/plotly.min.js"></script>
+<style>
+body { font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0; background: #f8f9fa; }
+h1 { color: #003366; text-align: center; }
+#status { text-align: center; color: #666; }
+.panels { display: grid; grid-template-columns: repeat(auto-fit, minmax(700px, 1fr)); gap: 16px; padding: 16px; }
+.panel { background: white; height: 420px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+</style>
+</head>
+<body>
+<h1>Biman Bangladesh Airlines Live Dashboard</h1>
+<div id="status">Waiting for simulation results...</div>
+<div class="panels">
+<div class="panel" id="financial"></div>
+<div class="panel" id="fleet"></div>
+<div class="panel" id="profit"></div>
+<div class="panel" id="load"></div>
+</div>
+<script>
+const layouts = {
+    financial: {title: {text: 'Financial Performance'}},
+    fleet: {title: {text: 'Fleet Status'}, barmode: 'stack'},
+    profit: {title: {text: 'Route Profitability'}, barmode: 'relative'},
+    load: {title: {text: 'Load Factors (%)'}}
+};
+const traceIndex = {financial: {}, fleet: {}, profit: {}, load: {}};
+Object.keys(layouts).forEach(function (id) { Plotly.newPlot(id, [], layouts[id], {responsive: true}); });
+
+function appendPoints(panel, type, values, quarter) {
+    const names = Object.keys(values);
+    const fresh = names.filter(function (name) { return !(name in traceIndex[panel]); });
+    if (fresh.length) {
+        const start = document.getElementById(panel).data.length;
+        Plotly.addTraces(panel, fresh.map(function (name, i) {
+            traceIndex[panel][name] = start + i;
+            return {x: [], y: [], name: name, type: type,
+                    mode: type === 'scatter' ? 'lines+markers' : undefined};
+        }));
+    }
+    Plotly.extendTraces(panel, {
+        x: names.map(function () { return [quarter]; }),
+        y: names.map(function (name) { return [values[name]]; })
+    }, names.map(function (name) { return traceIndex[panel][name]; }));
+}
+
+const source = new EventSource('/events');
+source.addEventListener('quarter', function (event) {
+    const delta = JSON.parse(event.data);
+    appendPoints('financial', 'scatter', delta.financial, delta.quarter);
+    appendPoints('fleet', 'bar', delta.fleet, delta.quarter);
+    appendPoints('profit', 'bar', delta.route_profit, delta.quarter);
+    appendPoints('load', 'scatter', delta.route_load_factor, delta.quarter);
+    document.getElementById('status').textContent = 'Latest quarter: ' + delta.quarter;
+});
+source.onerror = function () {
+    document.getElementById('status').textContent = 'Disconnected - retrying...';
+};
+</script>
+</body>
+</html>
+'''
+
+
+def report_delta(report: Dict) -> Dict:
+    """Reduce a quarterly report to the values the live dashboard appends."""
+    key_metrics = report['key_metrics']
+    fleet_status = report['fleet_status']
+    route_details = report['route_performance']['route_details']
+    return {
+        'quarter': report['quarter'],
+        'financial': {
+            'Operating Margin (%)': key_metrics['operating_margin'],
+            'ROIC (%)': key_metrics['roic']
+        },
+        'fleet': {
+            'Active': fleet_status['active_aircraft'],
+            'Maintenance': fleet_status['maintenance_aircraft'],
+            'Grounded': fleet_status['grounded_aircraft']
+        },
+        'route_profit': {route: m['profit'] for route, m in route_details.items()},
+        'route_load_factor': {route: m['load_factor'] * 100 for route, m in route_details.items()}
+    }
+
+
+class LiveDashboardServer:
+    """Asyncio HTTP server that pushes quarterly deltas to open dashboards."""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 8050,
+                 static_dir: Optional[Union[str, Path]] = None, max_history: Optional[int] = MAX_HISTORY):
+        self.host = host
+        self.port = port
+        self.static_dir = Path(static_dir).resolve() if static_dir else None
+        self._history: Deque[bytes] = deque(maxlen=max_history)
+        self._clients: Set[asyncio.Queue] = set()
+        self._plotlyjs: Optional[bytes] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._handlers: Set[asyncio.Task] = set()
+        self._ready = threading.Event()
+        self._stopped = False
+        self._error: Optional[BaseException] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL of the running server."""
+        return f'http://{self.host}:{self.port}/'
+
+    def start(self) -> 'LiveDashboardServer':
+        """Start serving on a background thread and wait until it is listening."""
+        self._thread = threading.Thread(target=self._run, name='LiveDashboardServer', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+        if self._error is not None:
+            raise self._error
+        return self
+
+    def stop(self):
+        """Stop the server and close all client streams."""
+        self._stopped = True
+        if self._loop and self._server:
+            self._loop.call_soon_threadsafe(self._server.close)
+        if self._thread:
+            self._thread.join(timeout=5)
+
+    def publish(self, report: Dict):
+        """Push a quarterly report to all connected dashboards (thread-safe).
+
+        Does nothing once the server has been stopped.
+        """
+        if self._stopped:
+            return
+        event = f"event: quarter\ndata: {json.dumps(report_delta(report))}\n\n".encode('utf-8')
+        if self._loop is None:
+            self._history.append(event)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._broadcast, event)
+        except RuntimeError:  # the loop closed on its own (e.g. the server failed)
+            pass
+
+    __call__ = publish
+
+    def _broadcast(self, event: bytes):
+        """Record an event and queue it for every client (runs on the loop)."""
+        self._history.append(event)
+        for queue in self._clients:
+            queue.put_nowait(event)
+
+    def _run(self):
+        """Event loop thread entry point."""
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        try:
+            self._loop.run_until_complete(self._serve())
+        except BaseException as exc:  # surfaced by start() instead of leaving it waiting
+            self._error = exc
+        finally:
+            self._ready.set()
+            self._loop.close()
+
+    async def _serve(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._ready.set()
+        try:
+            await self._server.serve_forever()
+        except asyncio.CancelledError:
+            pass
+        # Release open event streams and let in-flight requests finish
+        for queue in list(self._clients):
+            queue.put_nowait(None)
+        if self._handlers:
+            await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle a single HTTP/1.1 request."""
+        task = asyncio.current_task()
+        self._handlers.add(task)
+        try:
+            request_line = await reader.readline()
+            while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+                pass
+            parts = request_line.decode('latin-1').split()
+            if len(parts) < 2 or parts[0] != 'GET':
+                await self._respond(writer, 405, b'Method Not Allowed', 'text/plain')
+                return
+            path = parts[1].split('?', 1)[0]
+
+            if path == '/events':
+                await self._stream_events(writer)
+            elif path in ('/', '/index.html'):
+                await self._respond(writer, 200, _LIVE_PAGE.encode('utf-8'), 'text/html; charset=utf-8')
+            elif path == '/plotly.min.js':
+                if self._plotlyjs is None:
+                    self._plotlyjs = get_plotlyjs().encode('utf-8')
+                await self._respond(writer, 200, self._plotlyjs, 'application/javascript')
+            else:
+                await self._serve_static(writer, path)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            self._handlers.discard(task)
+
+    async def _respond(self, writer: asyncio.StreamWriter, status: int, body: bytes, content_type: str):
+        reason = {200: 'OK', 404: 'Not Found', 405: 'Method Not Allowed'}.get(status, '')
+        writer.write(
+            f'HTTP/1.1 {status} {reason}\r\nContent-Type: {content_type}\r\n'
+            f'Content-Length: {len(body)}\r\nConnection: close\r\n\r\n'.encode('latin-1') + body
+        )
+        await writer.drain()
+
+    async def _serve_static(self, writer: asyncio.StreamWriter, path: str):
+        """Serve a file from ``static_dir`` without escaping it."""
+        if self.static_dir is None:
+            await self._respond(writer, 404, b'Not Found', 'text/plain')
+            return
+        target = (self.static_dir / path.lstrip('/')).resolve()
+        if self.static_dir not in target.parents or not target.is_file():
+            await self._respond(writer, 404, b'Not Found', 'text/plain')
+            return
+        content_type = mimetypes.guess_type(target.name)[0] or 'application/octet-stream'
+        await self._respond(writer, 200, target.read_bytes(), content_type)
+
+    async def _stream_events(self, writer: asyncio.StreamWriter):
+        """Stream SSE events to one client, replaying history first."""
+        # Snapshot history and register in one loop step, so events broadcast
+        # while the replay drains are queued rather than lost
+        queue: asyncio.Queue = asyncio.Queue()
+        history = list(self._history)
+        self._clients.add(queue)
+        try:
+            writer.write(b'HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n'
+                         b'Cache-Control: no-cache\r\nConnection: keep-alive\r\n\r\n')
+            for event in history:
+                writer.write(event)
+            await writer.drain()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    event = b': heartbeat\n\n'
+                if event is None:
+                    break
+                writer.write(event)
+                await writer.drain()
+        finally:
+            self._clients.discard(queue)
@@ -0,0 +1,357 @@
+"""
+Reusable matplotlib figure templates for fast re-rendering of report charts.
+
+Creating a figure (axes, styling, legends, layout) costs far more than
+drawing one. A ``FigureTemplate`` builds its figure once for a layout - the
+number of quarters and the set of routes - and every later ``render`` only
+updates the data of the existing artists (line data, bar heights and
+offsets, fill polygons, tick labels, text) before saving. A different
+layout rebuilds the figure.
+
+``ChartTemplates`` holds one template per ``SimulationVisualizer`` chart.
+Pass one instance to many visualizers (``templates=``) to render
+per-scenario chart sets with shared, persistent figures.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+import matplotlib.pyplot as plt
+from matplotlib.layout_engine import TightLayoutEngine
+import numpy as np
+
+from bootstrap import bootstrap_ci
+
+FINANCIAL_SERIES = (('Operating Margin (%)', 'operating_margin'), ('ROIC (%)', 'roic'))
+FLEET_SERIES = (('Active', 'active_aircraft'), ('Maintenance', 'maintenance_aircraft'),
+                ('Grounded', 'grounded_aircraft'))
+BAR_WIDTH = 0.5  # pandas bar plot default
+
+def report_routes(reports: List[Dict]) -> List[str]:
+    """Routes in order of first appearance."""
+    return list(dict.fromkeys(route for report in reports
+                              for route in report['route_performance']['route_details']))
+
+def route_matrix(reports: List[Dict], routes: List[str], field: str, scale: float = 1.0) -> np.ndarray:
+    """``(quarters, routes)`` values of a route detail field, NaN where a route is absent."""
+    values = np.full((len(reports), len(routes)), np.nan)
+    index = {route: j for j, route in enumerate(routes)}
+    for i, report in enumerate(reports):
+        for route, details in report['route_performance']['route_details'].items():
+            values[i, index[route]] = details[field] * scale
+    return values
+
+def stack_bars(values: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Bottoms and heights of stacked bars; positives stack up and negatives down, like pandas."""
+    heights = np.nan_to_num(values)
+    bottoms = np.zeros_like(heights)
+    positive = np.zeros(len(heights))
+    negative = np.zeros(len(heights))
+    for j in range(heights.shape[1]):
+        column = heights[:, j]
+        bottoms[:, j] = np.where(column >= 0, positive, negative)
+        positive += np.where(column >= 0, column, 0)
+        negative += np.where(column < 0, column, 0)
+    return bottoms, heights
+
+def summary_text(analysis: Dict) -> str:
+    """Text block of mean, std and trend per financial metric."""
+    text = "Statistical Summary:\n\n"
+    for metric, stats in analysis.items():
+        if isinstance(stats, dict) and 'mean' in stats:
+            text += f"{metric}:\n"
+            text += f"Mean: {stats['mean']:.2f}\n"
+            text += f"Std: {stats['std']:.2f}\n"
+            text += f"Trend: {stats['trend']:.2f}\n\n"
+    return text
+
+def _bar_chart(ax, series: List[str], n: int) -> List:
+    """Zero-height bar containers per series, framed like a pandas bar plot."""
+    x = np.arange(n)
+    bars = [ax.bar(x, np.zeros(n), BAR_WIDTH, label=name) for name in series]
+    ax.set_xlim(-0.5, n - 0.5)  # fixed x limits; later rescaling only moves y
+    return bars
+
+def _set_bars(bars, bottoms: np.ndarray, heights: np.ndarray):
+    for patch, bottom, height in zip(bars, bottoms, heights):
+        patch.set_y(bottom)
+        patch.set_height(height)
+
+def _set_route_lines(lines: List, values: np.ndarray):
+    """Point each route's line at the quarters where the route is present."""
+    x = np.arange(len(values))
+    for j, line in enumerate(lines):
+        present = ~np.isnan(values[:, j])
+        line.set_data(x[present], values[present, j])
+
+def _set_quarter_ticks(ax, quarters: List[str], rotation: float = 0):
+    ax.set_xticks(np.arange(len(quarters)), quarters, rotation=rotation)
+
+def _rescale(*axes):
+    for ax in axes:
+        ax.relim()
+        ax.autoscale_view()
+
+class FigureTemplate(ABC):
+    """A figure built once per layout and re-rendered by updating artist data."""
+    tight_layout = True  # apply tight_layout once, when the layout is built
+
+    def __init__(self):
+        self.fig: Optional[plt.Figure] = None
+        self.layout: Optional[Tuple] = None
+        self.builds = 0
+        self._bbox = None  # tight bounding box (inches) reused while tick label extents are similar
+        self._bbox_signature: Optional[Tuple] = None
+
+    def layout_key(self, reports: List[Dict]) -> Tuple:
+        return (len(reports),)
+
+    @abstractmethod
+    def build(self, reports: List[Dict]):
+        """Create the figure, axes and artists (with placeholder data)."""
+
+    @abstractmethod
+    def update(self, reports: List[Dict], **context):
+        """Set the artists' data from the reports."""
+
+    def render(self, reports: List[Dict], save_path: Optional[str] = None, **context):
+        layout = self.layout_key(reports)
+        if self.fig is None or layout != self.layout:
+            self.close()
+            self.build(reports)
+            self.layout = layout
+            self.builds += 1
+            self.update(reports, **context)
+            if self.tight_layout:
+                # Applied once without attaching an engine; an attached engine
+                # (even the placeholder fig.tight_layout leaves) costs a dry draw per save
+                TightLayoutEngine().execute(self.fig)
+        else:
+            self.update(reports, **context)
+        if save_path:
+            self.fig.savefig(save_path, bbox_inches=self._tight_bbox())
+
+    def _limits_signature(self) -> Tuple:
+        """Sign and order of magnitude of every y limit, which bound the tick label widths."""
+        signature = []
+        for ax in self.fig.axes:
+            for limit in ax.get_ylim():
+                signature.append((np.sign(limit), int(np.floor(np.log10(abs(limit)))) if limit else 0))
+        return tuple(signature)
+
+    def _tight_bbox(self):
+        """Tight bounding box, recomputed only when the layout or the y limit magnitudes change."""
+        signature = self._limits_signature()
+        if self._bbox is None or signature != self._bbox_signature:
+            renderer = self.fig.canvas.get_renderer()
+            self._bbox = self.fig.get_tightbbox(renderer).padded(plt.rcParams['savefig.pad_inches'])
+            self._bbox_signature = signature
+        return self._bbox
+
+    def close(self):
+        if self.fig is not None:
+            plt.close(self.fig)
+            self.fig = None
+            self.layout = None
+            self._bbox = None
+
+class FinancialMetricsTemplate(FigureTemplate):
+    """Operating margin and ROIC with cash burn rate on a secondary axis."""
+    tight_layout = False
+
+    def build(self, reports: List[Dict]):
+        self.fig, self.ax1 = plt.subplots(figsize=(12, 6))
+        ax1 = self.ax1
+        self.margin_line, = ax1.plot([], [], 'b-', marker='o', label='Operating Margin (%)')
+        self.roic_line, = ax1.plot([], [], 'g-', marker='s', label='ROIC (%)')
+        ax1.set_xlabel('Quarter')
+        ax1.set_ylabel('Percentage (%)')
+        ax1.grid(True)
+
+        self.ax2 = ax1.twinx()
+        self.burn_line, = self.ax2.plot([], [], 'r-', marker='^', label='Cash Burn Rate')
+        self.ax2.set_ylabel('Cash Burn Rate')
+
+        lines1, labels1 = ax1.get_legend_handles_labels()
+        lines2, labels2 = self.ax2.get_legend_handles_labels()
+        ax1.legend(lines1 + lines2, labels1 + labels2, bbox_to_anchor=(1.05, 1), loc='upper left')
+        self.ax2.set_title('Financial Metrics Over Time')
+
+    def update(self, reports: List[Dict], **context):
+        x = np.arange(len(reports))
+        metrics = [report['key_metrics'] for report in reports]
+        self.margin_line.set_data(x, [m['operating_margin'] for m in metrics])
+        self.roic_line.set_data(x, [m['roic'] for m in metrics])
+        self.burn_line.set_data(x, [m['cash_burn_rate'] for m in metrics])
+        _set_quarter_ticks(self.ax1, [report['quarter'] for report in reports])
+        _rescale(self.ax1, self.ax2)
+
+class RoutePerformanceTemplate(FigureTemplate):
+    """Stacked route profit bars and load factors against break-even."""
+
+    def layout_key(self, reports: List[Dict]) -> Tuple:
+        return len(reports), tuple(report_routes(reports))
+
+    def build(self, reports: List[Dict]):
+        self.routes = report_routes(reports)
+        self.bar_routes = sorted(self.routes)  # pivoted columns are sorted
+        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(15, 12))
+        self.bars = _bar_chart(self.ax1, self.bar_routes, len(reports))
+        self.ax1.set_title('Route Profitability Over Time')
+        self.ax1.set_xlabel('Quarter')
+        self.ax1.set_ylabel('Profit')
+        self.ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        self.ax1.grid(True)
+
+        self.load_lines, self.break_even_lines = [], []
+        for route in self.routes:
+            self.load_lines.append(self.ax2.plot([], [], marker='o', label=f'{route} LF')[0])
+            self.break_even_lines.append(self.ax2.plot([], [], '--', label=f'{route} Break-even')[0])
+        self.ax2.set_title('Load Factors vs Break-even Points')
+        self.ax2.set_xlabel('Quarter')
+        self.ax2.set_ylabel('Load Factor (%)')
+        self.ax2.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        self.ax2.grid(True)
+
+    def update(self, reports: List[Dict], **context):
+        bottoms, heights = stack_bars(route_matrix(reports, self.bar_routes, 'profit'))
+        for j, bars in enumerate(self.bars):
+            _set_bars(bars, bottoms[:, j], heights[:, j])
+        _set_route_lines(self.load_lines, route_matrix(reports, self.routes, 'load_factor', 100))
+        _set_route_lines(self.break_even_lines, route_matrix(reports, self.routes, 'break_even_load_factor', 100))
+        quarters = [report['quarter'] for report in reports]
+        _set_quarter_ticks(self.ax1, quarters, rotation=90)
+        _set_quarter_ticks(self.ax2, quarters)
+        _rescale(self.ax1, self.ax2)
+
+class FleetUtilizationTemplate(FigureTemplate):
+    """Stacked fleet status bars and the active share of the fleet."""
+
+    def build(self, reports: List[Dict]):
+        self.fig, (self.ax1, self.ax2) = plt.subplots(2, 1, figsize=(12, 10))
+        self.bars = _bar_chart(self.ax1, [name for name, _ in FLEET_SERIES], len(reports))
+        self.ax1.set_title('Fleet Status Over Time')
+        self.ax1.set_xlabel('Quarter')
+        self.ax1.set_ylabel('Number of Aircraft')
+        self.ax1.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+        self.ax1.grid(True)
+
+        self.utilization_line, = self.ax2.plot([], [], marker='o')
+        self.ax2.set_title('Fleet Utilization Rate')
+        self.ax2.set_xlabel('Quarter')
+        self.ax2.set_ylabel('Utilization Rate (%)')
+        self.ax2.grid(True)
+
+    def update(self, reports: List[Dict], **context):
+        status = np.array([[report['fleet_status'][field] for _, field in FLEET_SERIES] for report in reports],
+                          dtype=float).reshape(len(reports), len(FLEET_SERIES))
+        bottoms, heights = stack_bars(status)
+        for j, bars in enumerate(self.bars):
+            _set_bars(bars, bottoms[:, j], heights[:, j])
+        self.utilization_line.set_data(np.arange(len(reports)), status[:, 0] / status.sum(axis=1) * 100)
+        quarters = [report['quarter'] for report in reports]
+        _set_quarter_ticks(self.ax1, quarters, rotation=90)
+        _set_quarter_ticks(self.ax2, quarters)
+        _rescale(self.ax1, self.ax2)
+
+class SummaryReportTemplate(FigureTemplate):
+    """Five-panel summary: financials with intervals, route profit, fleet, load factors, statistics."""
+
+    def layout_key(self, reports: List[Dict]) -> Tuple:
+        return len(reports), tuple(report_routes(reports))
+
+    def build(self, reports: List[Dict]):
+        self.routes = report_routes(reports)
+        x = np.arange(len(reports))
+        self.fig = plt.figure(figsize=(20, 15))
+        gs = self.fig.add_gridspec(4, 2)
+
+        self.ax1 = self.fig.add_subplot(gs[0, 0])
+        self.financial_lines, self.financial_bands = [], []
+        for name, _ in FINANCIAL_SERIES:
+            line, = self.ax1.plot([], [], marker='o', label=name)
+            self.financial_lines.append(line)
+            self.financial_bands.append(self.ax1.fill_between(x, 0, 0, alpha=0.2))
+        self.ax1.set_title('Financial Performance with Confidence Intervals')
+        self.ax1.grid(True)
+        self.ax1.legend()
+
+        self.ax2 = self.fig.add_subplot(gs[0, 1])
+        self.bar_routes = sorted(self.routes)
+        self.profit_bars = _bar_chart(self.ax2, self.bar_routes, len(reports))
+        self.ax2.set_title('Route Profitability')
+        self.ax2.set_xlabel('Quarter')
+        self.ax2.grid(True)
+        self.ax2.legend(title='Route')
+
+        self.ax3 = self.fig.add_subplot(gs[1, :])
+        self.fleet_bars = _bar_chart(self.ax3, [name for name, _ in FLEET_SERIES], len(reports))
+        self.trend_line, = self.ax3.plot([], [], "r--", alpha=0.8)
+        self.ax3.set_title('Fleet Status with Utilization Trend')
+        self.ax3.grid(True)
+        self.ax3.legend()
+
+        self.ax4 = self.fig.add_subplot(gs[2, :])
+        self.load_lines, self.break_even_lines = [], []
+        for route in self.routes:
+            self.load_lines.append(self.ax4.plot([], [], marker='o', label=f'{route} LF')[0])
+            self.break_even_lines.append(self.ax4.plot([], [], '--', label=f'{route} Break-even')[0])
+        self.ax4.set_title('Load Factors vs Break-even Points')
+        self.ax4.grid(True)
+        self.ax4.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
+
+        self.ax5 = self.fig.add_subplot(gs[3, :])
+        self.stats_text = self.ax5.text(0.1, 0.5, '', fontsize=10, va='center')
+        self.ax5.axis('off')
+
+    def update(self, reports: List[Dict], analysis: Optional[Dict] = None, **context):
+        x = np.arange(len(reports))
+        quarters = [report['quarter'] for report in reports]
+
+        series = [[report['key_metrics'][field] for report in reports] for _, field in FINANCIAL_SERIES]
+        intervals = bootstrap_ci(series, labels=[name for name, _ in FINANCIAL_SERIES], seed=0)
+        for i, (line, band) in enumerate(zip(self.financial_lines, self.financial_bands)):
+            values = np.asarray(series[i], dtype=float)
+            lower = values - (intervals.estimate[i] - intervals.lower[i])
+            upper = values + (intervals.upper[i] - intervals.estimate[i])
+            line.set_data(x, values)
+            band.set_verts([np.column_stack([np.r_[x, x[::-1]], np.r_[upper, lower[::-1]]])])
+
+        bottoms, heights = stack_bars(route_matrix(reports, self.bar_routes, 'profit'))
+        for j, bars in enumerate(self.profit_bars):
+            _set_bars(bars, bottoms[:, j], heights[:, j])
+
+        status = np.array([[report['fleet_status'][field] for _, field in FLEET_SERIES] for report in reports],
+                          dtype=float).reshape(len(reports), len(FLEET_SERIES))
+        bottoms, heights = stack_bars(status)
+        for j, bars in enumerate(self.fleet_bars):
+            _set_bars(bars, bottoms[:, j], heights[:, j])
+        if len(reports) > 1:
+            self.trend_line.set_data(x, np.poly1d(np.polyfit(x, status[:, 0], 1))(x))
+
+        _set_route_lines(self.load_lines, route_matrix(reports, self.routes, 'load_factor', 100))
+        _set_route_lines(self.break_even_lines, route_matrix(reports, self.routes, 'break_even_load_factor', 100))
+        self.stats_text.set_text(summary_text(analysis or {}))
+
+        _set_quarter_ticks(self.ax1, quarters)
+        for ax in (self.ax2, self.ax3):
+            _set_quarter_ticks(ax, quarters, rotation=90)
+        _set_quarter_ticks(self.ax4, quarters)
+        # relim ignores collections, so add the interval bands' extents back
+        self.ax1.relim()
+        for band in self.financial_bands:
+            self.ax1.update_datalim(band.get_paths()[0].vertices)
+        self.ax1.autoscale_view()
+        _rescale(self.ax2, self.ax3, self.ax4)
+
+class ChartTemplates:
+    """Persistent templates for each chart of ``SimulationVisualizer``."""
+
+    def __init__(self):
+        self.financial_metrics = FinancialMetricsTemplate()
+        self.route_performance = RoutePerformanceTemplate()
+        self.fleet_utilization = FleetUtilizationTemplate()
+        self.summary_report = SummaryReportTemplate()
+
+    def close(self):
+        for template in (self.financial_metrics, self.route_performance,
+                         self.fleet_utilization, self.summary_report):
+            template.close()
@@ -1,13 +1,24 @@
 import os
+import sys
 import json
 import base64
 from pathlib import Path
 import pandas as pd
 from jinja2 import Environment, FileSystemLoader, select_autoescape
+from results_warehouse import ResultsWarehouse
+from build_graph import BuildGraph, Target
 
 # Paths
 VIS_DIR = Path('visualizations')
 REPORTS_DIR = Path('reports')
+WAREHOUSE_PATH = Path('results.sqlite')
+OUTPUT_PATH = VIS_DIR / 'detailed_report.html'
+IMAGE_FILES = {
+    'financial_metrics': 'visualizations/financial_metrics.png',
+    'route_performance': 'visualizations/route_performance.png',
+    'fleet_utilization': 'visualizations/fleet_utilization.png',
+    'summary_report': 'visualizations/summary_report.png',
+}
 
 # Helper to encode images as base64 data URIs
 def img_to_base64(path):
@@ -16,32 +27,43 @@ def img_to_base64(path):
     ext = os.path.splitext(path)[1][1:]
     return f"data:image/{ext};base64,{encoded}"
 
+# Skip the rebuild when no image, analysis, report or code input changed
+analysis_files = sorted(VIS_DIR.glob('analysis_*.json'), reverse=True)
+graph = BuildGraph(VIS_DIR / '.build_manifest.json')
+report_target = Target(
+    'detailed_report.html',
+    outputs=[OUTPUT_PATH],
+    inputs=[Path(p) for p in IMAGE_FILES.values()] + analysis_files[:1] +
+           ([WAREHOUSE_PATH, WAREHOUSE_PATH.with_name(WAREHOUSE_PATH.name + '-wal')]
+            if WAREHOUSE_PATH.exists() else sorted(REPORTS_DIR.glob('*_report.json')))
+)
+if '--force' not in sys.argv and not graph.stale(report_target):
+    print(f"Detailed HTML report is up to date: {OUTPUT_PATH}")
+    sys.exit(0)
+
 # Load key images as base64
 images = {}
-for key, rel_path in {
-    'financial_metrics': 'visualizations/financial_metrics.png',
-    'route_performance': 'visualizations/route_performance.png',
-    'fleet_utilization': 'visualizations/fleet_utilization.png',
-    'summary_report': 'visualizations/summary_report.png',
-}.items():
+for key, rel_path in IMAGE_FILES.items():
     if Path(rel_path).exists():
         images[key] = img_to_base64(rel_path)
     else:
         images[key] = ''
 
 # Load analysis (latest JSON)
-analysis_files = sorted(VIS_DIR.glob('analysis_*.json'), reverse=True)
 analysis = {}
 if analysis_files:
     with open(analysis_files[0], 'r') as f:
         analysis = json.load(f)
 
-# Load a sample report (latest quarter)
-report_files = sorted(REPORTS_DIR.glob('*_report.json'), reverse=True)
-sample_report = {}
-if report_files:
-    with open(report_files[0], 'r') as f:
-        sample_report = json.load(f)
+# Load a sample report: the last quarter of the latest run in the warehouse,
+# or of the reports directory ingested in quarter order
+if WAREHOUSE_PATH.exists():
+    warehouse = ResultsWarehouse(WAREHOUSE_PATH)
+else:
+    warehouse = ResultsWarehouse(':memory:')
+    warehouse.ingest_directory(REPORTS_DIR)
+sample_report = warehouse.latest_report()
+warehouse.close()
 
 # Prepare tables
 key_metrics = sample_report.get('key_metrics', {})
@@ -330,8 +352,8 @@ html = template.render(
 )
 
 # Output file
-output_path = VIS_DIR / 'detailed_report.html'
-with open(output_path, 'w', encoding='utf-8') as f:
+with open(OUTPUT_PATH, 'w', encoding='utf-8') as f:
     f.write(html)
+graph.record(report_target)
 
-print(f"Detailed HTML report generated: {output_path}") 
\ No newline at end of file
+print(f"Detailed HTML report generated: {OUTPUT_PATH}") 
\ No newline at end of file
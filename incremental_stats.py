@@ -0,0 +1,390 @@
+"""
+Online, incremental statistics for quarter-by-quarter analysis.
+
+``IncrementalAnalysis`` folds each new quarterly report into a fixed-size
+state in O(1) and produces the same analysis as the batch
+``SimulationVisualizer.perform_advanced_statistical_analysis``:
+
+* ``RunningMoments`` - count, mean, variance, skewness and kurtosis from
+  Welford/Pebay central-moment updates, plus min, max and sum;
+* ``RegressionStats`` - sufficient statistics (means and co-moments) of a
+  least-squares line, giving slope, R^2, p-value and standard error;
+* ``QuantileSketch`` - a KLL sketch for medians and IQRs: exact while it
+  holds at most ``k`` values, mergeable, and logarithmic in size beyond.
+
+All three support ``merge`` so states built on separate workers or report
+shards can be combined.
+"""
+import math
+import random
+from typing import Dict, List, Optional
+import numpy as np
+from scipy import stats
+
+from models.seasonal_demand import quarter_of_year
+
+# Display name -> key_metrics field, as in the batch analysis
+FINANCIAL_METRICS = {
+    'Operating Margin': 'operating_margin',
+    'ROIC': 'roic',
+    'Cash Burn Rate': 'cash_burn_rate',
+}
+
+class RunningMoments:
+    """Streaming count, mean and central moments up to the fourth."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.m3 = 0.0
+        self.m4 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.sum = 0.0
+        self.abs_max = 0.0
+
+    def update(self, x: float):
+        n1 = self.n
+        self.n += 1
+        n = self.n
+        delta = x - self.mean
+        delta_n = delta / n
+        delta_n2 = delta_n * delta_n
+        term1 = delta * delta_n * n1
+        self.mean += delta_n
+        self.m4 += term1 * delta_n2 * (n * n - 3 * n + 3) + 6 * delta_n2 * self.m2 - 4 * delta_n * self.m3
+        self.m3 += term1 * delta_n * (n - 2) - 3 * delta_n * self.m2
+        self.m2 += term1
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        self.sum += x
+        self.abs_max = max(self.abs_max, abs(x))
+
+    def merge(self, other: 'RunningMoments') -> 'RunningMoments':
+        """Combine another stream's moments into this one."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        na, nb = self.n, other.n
+        n = na + nb
+        delta = other.mean - self.mean
+        delta2 = delta * delta
+        m2 = self.m2 + other.m2 + delta2 * na * nb / n
+        m3 = (self.m3 + other.m3 + delta * delta2 * na * nb * (na - nb) / n ** 2
+              + 3 * delta * (na * other.m2 - nb * self.m2) / n)
+        m4 = (self.m4 + other.m4 + delta2 * delta2 * na * nb * (na * na - na * nb + nb * nb) / n ** 3
+              + 6 * delta2 * (na * na * other.m2 + nb * nb * self.m2) / n ** 2
+              + 4 * delta * (na * other.m3 - nb * self.m3) / n)
+        self.n, self.mean, self.m2, self.m3, self.m4 = n, self.mean + delta * nb / n, m2, m3, m4
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.sum += other.sum
+        self.abs_max = max(self.abs_max, other.abs_max)
+        return self
+
+    def variance(self, ddof: int = 0) -> float:
+        return self.m2 / (self.n - ddof) if self.n > ddof else math.nan
+
+    def std(self, ddof: int = 0) -> float:
+        return math.sqrt(self.variance(ddof)) if self.n > ddof else math.nan
+
+    def skewness(self) -> float:
+        """Biased sample skewness (scipy.stats.skew default)."""
+        if self.n == 0 or self.m2 <= 0:
+            return math.nan
+        return math.sqrt(self.n) * self.m3 / self.m2 ** 1.5
+
+    def kurtosis(self) -> float:
+        """Biased excess kurtosis (scipy.stats.kurtosis default)."""
+        if self.n == 0 or self.m2 <= 0:
+            return math.nan
+        return self.n * self.m4 / (self.m2 * self.m2) - 3.0
+
+class RegressionStats:
+    """Streaming least-squares fit of y on x from means and co-moments."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean_x = 0.0
+        self.mean_y = 0.0
+        self.sxx = 0.0
+        self.syy = 0.0
+        self.sxy = 0.0
+
+    def update(self, x: float, y: float):
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.sxx += dx * (x - self.mean_x)
+        self.syy += dy * (y - self.mean_y)
+        self.sxy += dx * (y - self.mean_y)
+
+    def merge(self, other: 'RegressionStats') -> 'RegressionStats':
+        """Combine another stream's statistics into this one."""
+        if other.n == 0:
+            return self
+        if self.n == 0:
+            self.__dict__.update(other.__dict__)
+            return self
+        n = self.n + other.n
+        dx = other.mean_x - self.mean_x
+        dy = other.mean_y - self.mean_y
+        weight = self.n * other.n / n
+        self.sxx += other.sxx + dx * dx * weight
+        self.syy += other.syy + dy * dy * weight
+        self.sxy += other.sxy + dx * dy * weight
+        self.mean_x += dx * other.n / n
+        self.mean_y += dy * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def slope(self) -> float:
+        return self.sxy / self.sxx if self.sxx > 0 else math.nan
+
+    @property
+    def intercept(self) -> float:
+        return self.mean_y - self.slope * self.mean_x
+
+    @property
+    def r_value(self) -> float:
+        if self.sxx <= 0 or self.syy <= 0:
+            return 0.0
+        return max(-1.0, min(1.0, self.sxy / math.sqrt(self.sxx * self.syy)))
+
+    def summary(self) -> Dict[str, float]:
+        """Slope, R^2, two-sided p-value and slope standard error (as scipy.stats.linregress)."""
+        r = self.r_value
+        df = self.n - 2
+        if df <= 0 or self.sxx <= 0:
+            p_value = std_err = math.nan
+        else:
+            tiny = 1.0e-20
+            t = r * math.sqrt(df / ((1.0 - r + tiny) * (1.0 + r + tiny)))
+            p_value = 2 * stats.t.sf(abs(t), df)
+            std_err = math.sqrt((1 - r * r) * self.syy / self.sxx / df)
+        return {'slope': self.slope, 'r_squared': r * r, 'p_value': p_value, 'std_err': std_err}
+
+class QuantileSketch:
+    """KLL quantile sketch with compactors of geometrically shrinking capacity.
+
+    Values are kept exactly until more than ``k`` have been added; beyond that
+    each full compactor sorts its items and promotes every other one (random
+    offset) to the next level, where each item stands for twice the weight.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None):
+        if k < 2:
+            raise ValueError("Sketch size k must be at least 2")
+        self.k = k
+        self.n = 0
+        self.compactors: List[List[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def _size(self) -> int:
+        return sum(len(items) for items in self.compactors)
+
+    def _max_size(self) -> int:
+        return sum(self._capacity(level) for level in range(len(self.compactors)))
+
+    def _compress(self):
+        """Compact the lowest over-capacity levels until the sketch fits its budget."""
+        for level in range(len(self.compactors)):
+            if len(self.compactors[level]) > self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                items = sorted(self.compactors[level])
+                keep = [items.pop()] if len(items) % 2 else []
+                offset = int(self._rng.random() < 0.5)
+                self.compactors[level + 1].extend(items[offset::2])
+                self.compactors[level] = keep
+                if self._size() <= self._max_size():
+                    break
+
+    def update(self, x: float):
+        self.compactors[0].append(float(x))
+        self.n += 1
+        if len(self.compactors[0]) > self._capacity(0) and self._size() > self._max_size():
+            self._compress()
+
+    def merge(self, other: 'QuantileSketch') -> 'QuantileSketch':
+        """Combine another sketch into this one."""
+        while len(self.compactors) < len(other.compactors):
+            self.compactors.append([])
+        for level, items in enumerate(other.compactors):
+            self.compactors[level].extend(items)
+        self.n += other.n
+        while self._size() > self._max_size():
+            self._compress()
+        return self
+
+    @property
+    def exact(self) -> bool:
+        """Whether every value added is still held at unit weight."""
+        return len(self.compactors) == 1
+
+    def values(self) -> List[float]:
+        """The values held (all values added while the sketch is exact)."""
+        return [x for items in self.compactors for x in items]
+
+    def quantile(self, q: float) -> float:
+        """Quantile with linear interpolation (exactly numpy's while exact)."""
+        if self.n == 0:
+            return math.nan
+        if self.exact:
+            return float(np.quantile(self.compactors[0], q))
+        values = np.concatenate([np.asarray(items, dtype=float) for items in self.compactors])
+        weights = np.concatenate([np.full(len(items), 2.0 ** level) for level, items in enumerate(self.compactors)])
+        order = np.argsort(values, kind='stable')
+        values, weights = values[order], weights[order]
+        midpoints = np.cumsum(weights) - weights / 2
+        return float(np.interp(q * weights.sum(), midpoints, values))
+
+    def median(self) -> float:
+        return self.quantile(0.5)
+
+    def iqr(self) -> float:
+        return self.quantile(0.75) - self.quantile(0.25)
+
+class _MetricState:
+    """Moments, trend and quantiles of one key metric."""
+
+    def __init__(self, sketch_size: int, seed: Optional[int]):
+        self.moments = RunningMoments()
+        self.trend = RegressionStats()
+        self.sketch = QuantileSketch(sketch_size, seed)
+
+    def update(self, x: float, y: float):
+        self.moments.update(y)
+        self.trend.update(x, y)
+        self.sketch.update(y)
+
+    def normality_p_value(self) -> float:
+        """Shapiro-Wilk on the exact values, else Jarque-Bera from the moments."""
+        if self.moments.n < 3:
+            return math.nan
+        if self.sketch.exact:
+            return float(stats.shapiro(self.sketch.values())[1])
+        skewness, kurtosis = self.moments.skewness(), self.moments.kurtosis()
+        jb = self.moments.n / 6 * (skewness ** 2 + kurtosis ** 2 / 4)
+        return float(stats.chi2.sf(jb, 2))
+
+    def summary(self) -> Dict:
+        moments = self.moments
+        trend = self.trend.summary()
+        p_value = self.normality_p_value()
+        return {
+            'mean': moments.mean,
+            'std': moments.std(),
+            'min': moments.min,
+            'max': moments.max,
+            'median': self.sketch.median(),
+            'iqr': self.sketch.iqr(),
+            'skewness': moments.skewness(),
+            'kurtosis': moments.kurtosis(),
+            'trend': trend['slope'],
+            'normality_test': {'p_value': p_value, 'is_normal': p_value > 0.05},
+            'trend_analysis': trend,
+        }
+
+class _RouteState:
+    """Profit and load factor aggregates of one route."""
+
+    def __init__(self, sketch_size: int, seed: Optional[int]):
+        self.profit = RunningMoments()
+        self.profit_sketch = QuantileSketch(sketch_size, seed)
+        self.load_factor = RunningMoments()
+        self.load_factor_sketch = QuantileSketch(sketch_size, seed)
+        # Load factor sums and counts grouped by quarter of the year (Q1..Q4)
+        self.seasonal_sum = np.zeros(4)
+        self.seasonal_count = np.zeros(4)
+
+    def update(self, quarter: str, profit: float, load_factor: float):
+        self.profit.update(profit)
+        self.profit_sketch.update(profit)
+        self.load_factor.update(load_factor)
+        self.load_factor_sketch.update(load_factor)
+        q = quarter_of_year(quarter) - 1
+        self.seasonal_sum[q] += load_factor
+        self.seasonal_count[q] += 1
+
+    def summary(self) -> Dict:
+        profit, load_factor = self.profit, self.load_factor
+        seasonal_means = np.divide(self.seasonal_sum, self.seasonal_count,
+                                   out=np.zeros(4), where=self.seasonal_count > 0)
+        return {
+            'profitability': {
+                'mean': profit.mean,
+                'std': profit.std(ddof=1),
+                'min': profit.min,
+                'max': profit.max,
+                'median': self.profit_sketch.median(),
+                'profit_margin': (profit.sum / profit.n) / profit.abs_max if profit.abs_max else math.nan,
+            },
+            'load_factor': {
+                'mean': load_factor.mean,
+                'std': load_factor.std(ddof=1),
+                'min': load_factor.min,
+                'max': load_factor.max,
+                'median': self.load_factor_sketch.median(),
+            },
+            'seasonality': {f'q{q + 1}_mean': float(seasonal_means[q]) for q in range(4)},
+        }
+
+class IncrementalAnalysis:
+    """Analysis state updated in O(1) per quarterly report.
+
+    Instances are callable, so they can be registered directly as a
+    simulation report listener.
+    """
+
+    def __init__(self, sketch_size: int = 200, seed: Optional[int] = None):
+        self.sketch_size = sketch_size
+        self.seed = seed
+        self.count = 0
+        self.metrics = {name: _MetricState(sketch_size, seed) for name in FINANCIAL_METRICS}
+        self.routes: Dict[str, _RouteState] = {}
+
+    def update(self, report: Dict):
+        """Fold one quarterly report into the state."""
+        x = float(self.count)
+        for name, field in FINANCIAL_METRICS.items():
+            self.metrics[name].update(x, report['key_metrics'][field])
+        for route, metrics in report['route_performance']['route_details'].items():
+            state = self.routes.get(route)
+            if state is None:
+                state = self.routes[route] = _RouteState(self.sketch_size, self.seed)
+            state.update(report['quarter'], metrics['profit'], metrics['load_factor'])
+        self.count += 1
+
+    __call__ = update
+
+    def analysis(self) -> Dict:
+        """Statistical analysis in the layout of the batch analysis."""
+        analysis = {name: state.summary() for name, state in self.metrics.items()}
+        analysis['Route Performance'] = {route: state.summary() for route, state in self.routes.items()}
+
+        # Pooled-variance t-tests from each route's profit moments
+        route_comparison = {}
+        routes = list(self.routes.items())
+        for i, (route1, state1) in enumerate(routes):
+            for route2, state2 in routes[i + 1:]:
+                a, b = state1.profit, state2.profit
+                t_stat, p_value = stats.ttest_ind_from_stats(a.mean, a.std(ddof=1), a.n,
+                                                             b.mean, b.std(ddof=1), b.n)
+                route_comparison[f"{route1}_vs_{route2}"] = {
+                    't_statistic': t_stat,
+                    'p_value': p_value,
+                    'significant_difference': p_value < 0.05
+                }
+        analysis['Route Comparison'] = route_comparison
+        return analysis
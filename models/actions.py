@@ -0,0 +1,147 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict, List, Tuple, Union
+from .aircraft import Aircraft
+from .route import Route
+
+# Op codes of the compiled op-log
+ADD_ROUTE = 'add_route'
+MODIFY_ROUTE = 'modify_route'
+ADD_AIRCRAFT = 'add_aircraft'
+REMOVE_AIRCRAFT = 'remove_aircraft'
+UPDATE_LIABILITY = 'liability'
+UPDATE_ASSET = 'asset'
+
+ROUTE_FIELDS: Dict[str, type] = {f.name: f.type for f in fields(Route)}
+AIRCRAFT_FIELDS: Dict[str, type] = {f.name: f.type for f in fields(Aircraft)}
+
+
+def _check_value(owner: str, name: str, expected: type, value: Any):
+    """Check a single attribute value against its dataclass field type."""
+    if expected is float:
+        ok = isinstance(value, (int, float)) and not isinstance(value, bool)
+    elif expected is int:
+        ok = isinstance(value, int) and not isinstance(value, bool)
+    else:
+        ok = isinstance(value, expected)
+    if not ok:
+        raise ValueError(
+            f"Invalid value for {owner}.{name}: expected {expected.__name__}, "
+            f"got {type(value).__name__}"
+        )
+
+
+def _check_attributes(owner: str, schema: Dict[str, type], data: Dict, complete: bool):
+    """Validate attribute names (and optionally completeness) against a dataclass schema."""
+    unknown = set(data) - set(schema)
+    if unknown:
+        raise ValueError(f"Unknown {owner} attribute(s): {sorted(unknown)}")
+    if complete:
+        missing = set(schema) - set(data)
+        if missing:
+            raise ValueError(f"Missing {owner} attribute(s): {sorted(missing)}")
+    for name, value in data.items():
+        _check_value(owner, name, schema[name], value)
+
+
+@dataclass(frozen=True)
+class CompiledActions:
+    """Validated op-log for a single quarter's actions.
+
+    Each op is a ``(opcode, key, payload)`` tuple. Route keys are pre-resolved
+    to the ``RouteNetwork.routes`` dict keys and consecutive aircraft removals
+    are merged into a single registration set, so every op applies in O(1)
+    and bulk removals take one pass over the fleet.
+    """
+    ops: Tuple[Tuple[str, Any, Any], ...] = ()
+
+    def __len__(self) -> int:
+        return len(self.ops)
+
+    def apply(self, fleet, route_network, financial_model):
+        """Apply the op-log to a fleet, route network and financial model."""
+        routes = route_network.routes
+        for opcode, key, payload in self.ops:
+            if opcode == MODIFY_ROUTE:
+                route = routes.get(key)
+                if route is not None:
+                    route.__dict__.update(payload)
+            elif opcode == ADD_ROUTE:
+                routes[key] = Route(**payload)
+            elif opcode == REMOVE_AIRCRAFT:
+                fleet.remove_aircraft(payload)
+            elif opcode == ADD_AIRCRAFT:
+                fleet.aircraft.append(Aircraft(**payload))
+            elif opcode == UPDATE_LIABILITY:
+                financial_model.update_liabilities(key, payload)
+            elif opcode == UPDATE_ASSET:
+                financial_model.update_assets(key, payload)
+
+
+def compile_actions(actions: Dict) -> CompiledActions:
+    """Compile a raw quarter actions dict into a validated op-log.
+
+    Ops keep the order of the original interpreter: route changes, then fleet
+    changes, then financial changes. Raises ``ValueError`` on unknown actions,
+    unknown attribute names or mistyped values.
+    """
+    ops: List[Tuple[str, Any, Any]] = []
+
+    for change in actions.get('route_changes', []):
+        action = change.get('action')
+        if action == 'add':
+            data = dict(change['route_data'])
+            _check_attributes('Route', ROUTE_FIELDS, data, complete=True)
+            ops.append((ADD_ROUTE, f"{data['origin']}-{data['destination']}", data))
+        elif action == 'modify':
+            modifications = dict(change['modifications'])
+            _check_attributes('Route', ROUTE_FIELDS, modifications, complete=False)
+            ops.append((MODIFY_ROUTE, f"{change['origin']}-{change['destination']}", modifications))
+        else:
+            raise ValueError(f"Invalid route action: {action!r}")
+
+    pending_removals: List[str] = []
+    for change in actions.get('fleet_changes', []):
+        action = change.get('action')
+        if action == 'remove':
+            pending_removals.append(change['registration'])
+            continue
+        if pending_removals:
+            ops.append((REMOVE_AIRCRAFT, None, frozenset(pending_removals)))
+            pending_removals = []
+        if action == 'add':
+            data = dict(change['aircraft_data'])
+            _check_attributes('Aircraft', AIRCRAFT_FIELDS, data, complete=True)
+            ops.append((ADD_AIRCRAFT, data['registration'], data))
+        else:
+            raise ValueError(f"Invalid fleet action: {action!r}")
+    if pending_removals:
+        ops.append((REMOVE_AIRCRAFT, None, frozenset(pending_removals)))
+
+    for change in actions.get('financial_changes', []):
+        change_type = change.get('type')
+        if change_type not in (UPDATE_LIABILITY, UPDATE_ASSET):
+            raise ValueError(f"Invalid financial change type: {change_type!r}")
+        _check_value('FinancialModel', change['category'], float, change['amount'])
+        ops.append((change_type, change['category'], change['amount']))
+
+    return CompiledActions(ops=tuple(ops))
+
+
+class ActionPlan:
+    """Multi-quarter action plan compiled once and re-applied many times."""
+
+    def __init__(self, actions_by_quarter: Dict[str, Union[Dict, CompiledActions]]):
+        self.quarters: Dict[str, CompiledActions] = {
+            quarter: actions if isinstance(actions, CompiledActions) else compile_actions(actions)
+            for quarter, actions in actions_by_quarter.items()
+        }
+
+    def get(self, quarter: str) -> CompiledActions:
+        """Get the compiled actions for a quarter (empty if none)."""
+        return self.quarters.get(quarter, _EMPTY)
+
+    def __len__(self) -> int:
+        return sum(len(compiled) for compiled in self.quarters.values())
+
+
+_EMPTY = CompiledActions()
@@ -28,9 +28,9 @@ class Aircraft:
         """Calculate fuel consumption for given block hours."""
         return block_hours * self.fuel_efficiency
     
-    def needs_maintenance(self) -> bool:
-        """Check if aircraft needs maintenance based on utilization and time."""
-        return (datetime.now() - self.last_maintenance).days >= 30 or \
+    def needs_maintenance(self, as_of: Optional[datetime] = None) -> bool:
+        """Check if aircraft needs maintenance based on utilization and time (as of now by default)."""
+        return ((as_of or datetime.now()) - self.last_maintenance).days >= 30 or \
                self.utilization_hours >= 100  # Maintenance every 100 block hours
     
     def update_status(self, new_status: str):
@@ -0,0 +1,278 @@
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import heapq
+from .fleet import Fleet
+from .route import RouteNetwork
+
+HOURS_PER_WEEK = 168
+
+@dataclass(frozen=True)
+class CrewRules:
+    """Duty-time limits and pay rules for crew pairings."""
+    base: str = 'DAC'
+    report_hours: float = 1.0  # before the first departure of a duty
+    release_hours: float = 0.5  # after the last arrival of a duty
+    max_duty_hours: float = 13.0
+    max_block_hours_per_duty: float = 9.0
+    max_legs_per_duty: int = 4
+    max_augmented_duty_hours: float = 18.0  # single long-haul leg flown with an augmented crew
+    augmented_crew_factor: float = 1.5  # cost multiple of an augmented crew
+    min_connection_hours: float = 0.75
+    max_connection_hours: float = 4.0
+    min_rest_hours: float = 12.0
+    max_pairing_hours: float = 120.0  # from first report to last release
+    turn_hours: float = 1.5  # aircraft ground time before the return leg
+    min_credit_per_duty: float = 5.0  # paid hours guaranteed per duty
+    duty_credit_ratio: float = 0.5  # paid hours per duty hour, if more than block
+    layover_rate_per_hour: float = 15.0  # per diem for the crew away from base
+    hotel_per_night: float = 500.0
+    deadhead_cost: float = 2000.0  # positioning a crew to cover an otherwise unpairable leg
+    hourly_rate: Dict[str, float] = field(default_factory=lambda: {
+        'B777-300ER': 260.0,
+        'B787-8': 250.0,
+        'B787-9': 250.0,
+        'B737-800': 220.0,
+        'Dash8-Q400': 180.0,
+    })  # crew complement cost per paid hour
+
+@dataclass(frozen=True)
+class Leg:
+    """A single scheduled flight in the quarter."""
+    index: int
+    route_key: str
+    origin: str
+    destination: str
+    departure: float  # hours from the start of the quarter
+    arrival: float
+    aircraft_type: str
+
+@dataclass
+class Pairing:
+    """A sequence of duties starting and ending at the crew base."""
+    duties: List[Tuple[int, ...]]  # leg indices per duty
+    cost: float
+    legs: Tuple[int, ...] = field(init=False)
+
+    def __post_init__(self):
+        self.legs = tuple(leg for duty in self.duties for leg in duty)
+
+@dataclass
+class RosterSolution:
+    """Selected pairings covering a quarter's schedule and their cost."""
+    pairings: List[Pairing]
+    total_cost: float
+    route_costs: Dict[str, float]  # pairing cost allocated to routes by block hours
+    legs: int
+    deadheads: int  # legs covered by deadhead positioning
+    duty_count: int
+    candidates: int  # pairings generated for the set cover
+
+class CrewPairingEngine:
+    """Builds and costs legal crew pairings for a quarter's schedule.
+
+    Outbound legs leave the base at route-staggered hours on evenly spread
+    weekdays (routes flown more than daily repeat at even intervals through
+    the day), and each returns on the same aircraft after ``turn_hours``.
+    Duties are chained from connecting legs found by bisecting a per-station
+    departure index (long-haul legs beyond the block limit become single-leg
+    augmented-crew duties); pairings chain duties across legal rests back to
+    base. Only the earliest ``max_branching`` legal continuations are
+    explored at each step, which keeps generation linear in the schedule.
+    A greedy set cover (cost per newly covered leg, with a lazily updated
+    heap) selects pairings, deadheading any leg no legal pairing covers, and
+    a final pass drops pairings made redundant by later picks.
+    """
+
+    def __init__(self, rules: Optional[CrewRules] = None, weeks: int = 13, max_branching: int = 3):
+        self.rules = rules or CrewRules()
+        self.weeks = weeks
+        self.max_branching = max_branching  # connections / onward duties explored per step
+
+    def build_schedule(self, route_network: RouteNetwork, fleet: Fleet) -> List[Leg]:
+        """Lay out the quarter's legs, sorted by departure."""
+        served_types = fleet.get_seats_by_type()
+        flights = []
+        for i, (key, route) in enumerate(route_network.routes.items()):
+            if route.frequency <= 0 or route.aircraft_type not in served_types:
+                continue
+            outbound_hour = 6 + (i * 1.5) % 16
+            per_day = -(-route.frequency // 7)
+            for week in range(self.weeks):
+                for k in range(route.frequency):
+                    day = (k * 7) // route.frequency
+                    slot = k + (-day * route.frequency // 7)  # earlier departures on the same day
+                    departure = week * HOURS_PER_WEEK + day * 24 + outbound_hour + slot * 24 / per_day
+                    arrival = departure + route.flight_time
+                    flights.append((departure, arrival, key, route.origin, route.destination, route.aircraft_type))
+                    back = arrival + self.rules.turn_hours
+                    flights.append((back, back + route.flight_time, key, route.destination, route.origin,
+                                    route.aircraft_type))
+        flights.sort()
+        legs = [Leg(i, key, origin, destination, departure, arrival, aircraft_type)
+                for i, (departure, arrival, key, origin, destination, aircraft_type) in enumerate(flights)]
+        return legs
+
+    def _index(self, legs: List[Leg]) -> Dict[str, Tuple[List[float], List[int]]]:
+        """Per-station sorted departure times and leg indices."""
+        index: Dict[str, Tuple[List[float], List[int]]] = {}
+        for leg in legs:  # legs are sorted by departure
+            times, ids = index.setdefault(leg.origin, ([], []))
+            times.append(leg.departure)
+            ids.append(leg.index)
+        return index
+
+    def _duties(self, legs: List[Leg], index) -> List[Tuple[int, ...]]:
+        """Enumerate legal duties (connected leg sequences) by depth-first search."""
+        rules = self.rules
+        duties = []
+
+        def extend(path: List[int], block: float):
+            first, last = legs[path[0]], legs[path[-1]]
+            duties.append(tuple(path))
+            if len(path) >= rules.max_legs_per_duty:
+                return
+            times, ids = index.get(last.destination, ((), ()))
+            lo = bisect_left(times, last.arrival + rules.min_connection_hours)
+            hi = bisect_right(times, last.arrival + rules.max_connection_hours)
+            taken = 0
+            for j in ids[lo:hi]:
+                nxt = legs[j]
+                duty = nxt.arrival - first.departure + rules.report_hours + rules.release_hours
+                leg_block = nxt.arrival - nxt.departure
+                if duty <= rules.max_duty_hours and block + leg_block <= rules.max_block_hours_per_duty \
+                        and nxt.aircraft_type == first.aircraft_type:
+                    path.append(j)
+                    extend(path, block + leg_block)
+                    path.pop()
+                    taken += 1
+                    if taken >= self.max_branching:
+                        break
+
+        for leg in legs:
+            block = leg.arrival - leg.departure
+            duty = block + rules.report_hours + rules.release_hours
+            if block <= rules.max_block_hours_per_duty and duty <= rules.max_duty_hours:
+                extend([leg.index], block)
+            elif duty <= rules.max_augmented_duty_hours:
+                duties.append((leg.index,))
+        return duties
+
+    def _duty_pay(self, legs: List[Leg], duty: Tuple[int, ...]) -> float:
+        """Credited hours for a duty at the crew rate of its aircraft type."""
+        rules = self.rules
+        rate = rules.hourly_rate.get(legs[duty[0]].aircraft_type, 250.0)
+        block = sum(legs[i].arrival - legs[i].departure for i in duty)
+        duty_hours = legs[duty[-1]].arrival - legs[duty[0]].departure + rules.report_hours + rules.release_hours
+        pay = rate * max(block, duty_hours * rules.duty_credit_ratio, rules.min_credit_per_duty)
+        if block > rules.max_block_hours_per_duty:
+            pay *= rules.augmented_crew_factor
+        return pay
+
+    def _layover_cost(self, rest_hours: float) -> float:
+        """Per diem and hotel for a rest away from base."""
+        return rest_hours * self.rules.layover_rate_per_hour + \
+            self.rules.hotel_per_night * max(1, round(rest_hours / 24))
+
+    def generate_pairings(self, legs: List[Leg]) -> List[Pairing]:
+        """Chain duties into base-to-base pairings within the pairing time limit."""
+        rules = self.rules
+        base = rules.base
+        index = self._index(legs)
+        duties = self._duties(legs, index)
+
+        # Duties indexed by start station and start time for rest lookups
+        by_station: Dict[str, Tuple[List[float], List[int]]] = {}
+        for d in sorted(range(len(duties)), key=lambda d: legs[duties[d][0]].departure):
+            times, ids = by_station.setdefault(legs[duties[d][0]].origin, ([], []))
+            times.append(legs[duties[d][0]].departure)
+            ids.append(d)
+
+        duty_pay = [self._duty_pay(legs, duty) for duty in duties]
+        pairings = []
+
+        def chain(sequence: List[int], cost: float):
+            first = legs[duties[sequence[0]][0]]
+            last = legs[duties[sequence[-1]][-1]]
+            if last.destination == base:
+                pairings.append(Pairing([duties[d] for d in sequence], cost))
+                return
+            times, ids = by_station.get(last.destination, ((), ()))
+            earliest = last.arrival + rules.release_hours + rules.min_rest_hours + rules.report_hours
+            latest = first.departure - rules.report_hours + rules.max_pairing_hours
+            # Only the earliest legal onward duties; later ones just lengthen the layover
+            lo = bisect_left(times, earliest)
+            taken = 0
+            for d in ids[lo:bisect_right(times, latest)]:
+                end = legs[duties[d][-1]]
+                if end.arrival + rules.release_hours - (first.departure - rules.report_hours) > rules.max_pairing_hours:
+                    continue
+                if legs[duties[d][0]].aircraft_type != first.aircraft_type:
+                    continue
+                rest = legs[duties[d][0]].departure - last.arrival
+                chain(sequence + [d], cost + self._layover_cost(rest) + duty_pay[d])
+                taken += 1
+                if taken >= self.max_branching:
+                    break
+
+        for d, duty in enumerate(duties):
+            if legs[duty[0]].origin == base:
+                chain([d], duty_pay[d])
+        return pairings
+
+    def solve(self, route_network: RouteNetwork, fleet: Fleet) -> RosterSolution:
+        """Build the schedule, generate pairings and select a low-cost cover."""
+        legs = self.build_schedule(route_network, fleet)
+        candidates = self.generate_pairings(legs)
+        # Deadhead singletons guarantee every leg can be covered
+        for leg in legs:
+            candidates.append(Pairing([(leg.index,)],
+                                      self._duty_pay(legs, (leg.index,)) + self.rules.deadhead_cost))
+        n_generated = len(candidates) - len(legs)
+
+        covered = [0] * len(legs)
+        heap = [(c.cost / len(c.legs), i, len(c.legs)) for i, c in enumerate(candidates)]
+        heapq.heapify(heap)
+        selected = []
+        remaining = len(legs)
+        while remaining and heap:
+            ratio, i, counted = heapq.heappop(heap)
+            fresh = sum(1 for leg in candidates[i].legs if not covered[leg])
+            if fresh == 0:
+                continue
+            if fresh != counted:  # stale ratio; re-queue with the current gain
+                heapq.heappush(heap, (candidates[i].cost / fresh, i, fresh))
+                continue
+            selected.append(i)
+            for leg in candidates[i].legs:
+                if not covered[leg]:
+                    remaining -= 1
+                covered[leg] += 1
+
+        # Drop pairings whose legs are all covered by others, most expensive first
+        dropped = set()
+        for i in sorted(selected, key=lambda i: -candidates[i].cost):
+            if all(covered[leg] > 1 for leg in candidates[i].legs):
+                for leg in candidates[i].legs:
+                    covered[leg] -= 1
+                dropped.add(i)
+        selected = [i for i in selected if i not in dropped]
+
+        chosen = [candidates[i] for i in selected]
+        route_costs: Dict[str, float] = {}
+        for pairing in chosen:
+            leg_ids = pairing.legs
+            block = [legs[i].arrival - legs[i].departure for i in leg_ids]
+            total_block = sum(block) or 1.0
+            for i, hours in zip(leg_ids, block):
+                key = legs[i].route_key
+                route_costs[key] = route_costs.get(key, 0.0) + pairing.cost * hours / total_block
+        return RosterSolution(
+            pairings=chosen,
+            total_cost=sum(p.cost for p in chosen),
+            route_costs=route_costs,
+            legs=len(legs),
+            deadheads=sum(1 for i in selected if i >= n_generated),
+            duty_count=sum(len(p.duties) for p in chosen),
+            candidates=n_generated
+        )
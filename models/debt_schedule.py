@@ -0,0 +1,249 @@
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+import numpy as np
+
+@dataclass(frozen=True)
+class LiabilityTerms:
+    """Repayment terms for a liability, effective from ``start_quarter``."""
+    annual_rate: float
+    term_quarters: int  # level payments after any deferral
+    deferral_quarters: int = 0  # interest accrues and is capitalized
+    start_quarter: int = 0
+    principal_change: float = 0.0  # added to the balance carried into this segment
+
+@dataclass(frozen=True)
+class DepreciationTerms:
+    """Straight-line depreciation terms for an asset."""
+    cost: float
+    useful_life_quarters: int
+    salvage_value: float = 0.0
+    elapsed_quarters: int = 0  # life already used at quarter 0
+
+# Default terms for the liabilities carried by FinancialModel
+DEFAULT_LIABILITY_TERMS: Dict[str, LiabilityTerms] = {
+    'aircraft_loans': LiabilityTerms(annual_rate=0.05, term_quarters=48),
+    'fuel_payments': LiabilityTerms(annual_rate=0.09, term_quarters=12),  # late-payment interest
+    'employee_benefits': LiabilityTerms(annual_rate=0.06, term_quarters=40),
+    'airport_charges': LiabilityTerms(annual_rate=0.07, term_quarters=20),
+}
+
+def amortize(principal: float, annual_rate: float, term_quarters: int,
+             deferral_quarters: int, length: int) -> Dict[str, np.ndarray]:
+    """Compute a level-payment amortization schedule as arrays of ``length`` quarters.
+
+    During the deferral period interest is capitalized, which shows up as a
+    negative principal repayment. Quarters after the final payment are zero.
+    """
+    r = annual_rate / 4
+    t = np.arange(length)
+    growth_d = (1 + r) ** deferral_quarters
+    deferred = t < deferral_quarters
+
+    # Deferral phase: balance compounds from the original principal
+    opening = np.where(deferred, principal * (1 + r) ** np.minimum(t, deferral_quarters), 0.0)
+
+    # Amortization phase: closed-form annuity balance after k payments
+    k = t - deferral_quarters
+    amortizing = (~deferred) & (k < term_quarters)
+    balance = principal * growth_d
+    if term_quarters > 0:
+        if r == 0:
+            payment = balance / term_quarters
+            remaining = balance - payment * k
+        else:
+            payment = balance * r / (1 - (1 + r) ** -term_quarters)
+            growth_k = (1 + r) ** np.clip(k, 0, None)
+            remaining = balance * growth_k - payment * (growth_k - 1) / r
+        opening = np.where(amortizing, remaining, opening)
+    else:
+        payment = 0.0
+
+    interest = opening * r
+    principal_paid = np.where(amortizing, payment - interest, np.where(deferred, -interest, 0.0))
+    closing = opening - principal_paid
+    closing = np.where(amortizing | deferred, closing, 0.0)
+    return {
+        'opening': opening,
+        'interest': interest,
+        'principal': principal_paid,
+        'closing': np.where(np.abs(closing) < 1e-6, 0.0, closing),
+    }
+
+def depreciate(terms: List[DepreciationTerms], length: int) -> np.ndarray:
+    """Straight-line depreciation for many assets as an ``(n_assets, length)`` array."""
+    if not terms:
+        return np.zeros((0, length))
+    cost = np.array([a.cost for a in terms], dtype=float)
+    salvage = np.array([a.salvage_value for a in terms], dtype=float)
+    life = np.array([max(a.useful_life_quarters, 1) for a in terms], dtype=float)
+    elapsed = np.array([a.elapsed_quarters for a in terms], dtype=float)
+    age = elapsed[:, None] + np.arange(length)[None, :]
+    per_quarter = ((cost - salvage) / life)[:, None]
+    return np.where(age < life[:, None], per_quarter, 0.0)
+
+class DebtScheduleEngine:
+    """Precomputes interest, amortization and depreciation schedules over a horizon.
+
+    Each liability is a sequence of term segments; each quarter is then a table
+    lookup. Restructuring a liability (refinance, deferral, new terms) only
+    recomputes that liability's schedule.
+    """
+
+    def __init__(self, horizon_quarters: int):
+        self.horizon_quarters = horizon_quarters
+        self.principals: Dict[str, float] = {}
+        self.terms: Dict[str, List[LiabilityTerms]] = {}
+        self.assets: Dict[str, DepreciationTerms] = {}
+        self._schedules: Dict[str, Dict[str, np.ndarray]] = {}
+        self._depreciation: Optional[np.ndarray] = None
+        self._totals: Optional[Dict[str, np.ndarray]] = None
+        self._names: List[str] = []
+
+    @classmethod
+    def from_financial_model(cls, model, horizon_quarters: int, fleet=None,
+                             terms: Optional[Dict[str, LiabilityTerms]] = None,
+                             aircraft_life_years: float = 20) -> 'DebtScheduleEngine':
+        """Build schedules for a FinancialModel's liabilities and aircraft.
+
+        With a fleet, the aircraft book value is allocated by seating capacity
+        and each tail depreciates over its remaining life; otherwise the book
+        value depreciates as one asset over ``aircraft_life_years``.
+        """
+        engine = cls(horizon_quarters)
+        terms = {**DEFAULT_LIABILITY_TERMS, **(terms or {})}
+        for name, amount in model.liabilities.items():
+            engine.add_liability(name, amount, terms.get(name, LiabilityTerms(0.0, 40)))
+
+        book_value = model.assets['aircraft']
+        life_quarters = int(aircraft_life_years * 4)
+        if fleet is not None and fleet.aircraft:
+            total_seats = sum(a.seating_capacity for a in fleet.aircraft)
+            for aircraft in fleet.aircraft:
+                remaining = max(life_quarters - int(aircraft.age * 4), 1)
+                engine.add_asset(aircraft.registration, DepreciationTerms(
+                    cost=book_value * aircraft.seating_capacity / total_seats,
+                    useful_life_quarters=remaining
+                ))
+        else:
+            engine.add_asset('aircraft', DepreciationTerms(book_value, life_quarters))
+        return engine
+
+    def add_liability(self, name: str, principal: float, terms: LiabilityTerms):
+        """Add (or replace) a liability with its initial terms."""
+        self.principals[name] = principal
+        self.terms[name] = [replace(terms, start_quarter=0)]
+        self._invalidate(name)
+
+    def add_asset(self, name: str, terms: DepreciationTerms):
+        """Add (or replace) a depreciating asset."""
+        self.assets[name] = terms
+        self._depreciation = None
+        self._totals = None
+
+    def restructure(self, name: str, terms: LiabilityTerms):
+        """Apply new terms to a liability from ``terms.start_quarter`` onwards."""
+        if name not in self.terms:
+            raise ValueError(f"Unknown liability: {name}")
+        if terms.start_quarter == 0:
+            self.terms[name] = [terms]
+        else:
+            kept = [seg for seg in self.terms[name] if seg.start_quarter < terms.start_quarter]
+            self.terms[name] = kept + [terms]
+        self._invalidate(name)
+
+    def refinance(self, name: str, quarter: int, annual_rate: float, term_quarters: int):
+        """Refinance a liability's outstanding balance at ``quarter``."""
+        self.restructure(name, LiabilityTerms(annual_rate, term_quarters, 0, quarter))
+
+    def _remaining_terms(self, name: str, quarter: int) -> LiabilityTerms:
+        """The terms in force at ``quarter``, restated as a segment starting there."""
+        if name not in self.terms:
+            raise ValueError(f"Unknown liability: {name}")
+        current = [seg for seg in self.terms[name] if seg.start_quarter <= quarter][-1]
+        if current.start_quarter == quarter:
+            return current
+        elapsed = quarter - current.start_quarter
+        paid = max(elapsed - current.deferral_quarters, 0)
+        return LiabilityTerms(current.annual_rate, max(current.term_quarters - paid, 1),
+                              max(current.deferral_quarters - elapsed, 0), quarter)
+
+    def defer(self, name: str, quarter: int, deferral_quarters: int):
+        """Defer payments from ``quarter``, keeping the rate and remaining payment count."""
+        self.restructure(name, replace(self._remaining_terms(name, quarter),
+                                       deferral_quarters=deferral_quarters))
+
+    def adjust_balance(self, name: str, quarter: int, amount: float):
+        """Add ``amount`` to a liability's balance at the start of ``quarter``.
+
+        The new balance is re-amortized over the remaining payments of the
+        terms in force, e.g. a repayment (negative amount) lowers the
+        following payments rather than shortening the term.
+        """
+        current = self._remaining_terms(name, quarter)
+        self.restructure(name, replace(current, principal_change=current.principal_change + amount))
+
+    def _invalidate(self, name: str):
+        self._schedules.pop(name, None)
+        self._totals = None
+
+    def liability_schedule(self, name: str) -> Dict[str, np.ndarray]:
+        """Get (computing if stale) the schedule arrays for one liability."""
+        schedule = self._schedules.get(name)
+        if schedule is None:
+            schedule = {key: np.zeros(self.horizon_quarters)
+                        for key in ('opening', 'interest', 'principal', 'closing')}
+            segments = self.terms[name]
+            balance = self.principals[name]
+            for i, seg in enumerate(segments):
+                balance += seg.principal_change
+                start = min(seg.start_quarter, self.horizon_quarters)
+                end = self.horizon_quarters if i + 1 == len(segments) else \
+                    min(segments[i + 1].start_quarter, self.horizon_quarters)
+                if end <= start:
+                    continue
+                part = amortize(balance, seg.annual_rate, seg.term_quarters,
+                                seg.deferral_quarters, end - start)
+                for key, values in part.items():
+                    schedule[key][start:end] = values
+                balance = schedule['closing'][end - 1]
+            self._schedules[name] = schedule
+        return schedule
+
+    def depreciation_schedule(self) -> np.ndarray:
+        """Get the ``(n_assets, horizon)`` depreciation array."""
+        if self._depreciation is None:
+            self._depreciation = depreciate(list(self.assets.values()), self.horizon_quarters)
+        return self._depreciation
+
+    def totals(self) -> Dict[str, np.ndarray]:
+        """Network-wide per-quarter totals across all liabilities and assets."""
+        if self._totals is None:
+            names = list(self.terms)
+            schedules = [self.liability_schedule(name) for name in names]
+            closing = np.zeros((len(names), self.horizon_quarters))
+            interest = np.zeros(self.horizon_quarters)
+            principal = np.zeros(self.horizon_quarters)
+            for row, schedule in enumerate(schedules):
+                closing[row] = schedule['closing']
+                interest += schedule['interest']
+                principal += schedule['principal']
+            self._totals = {
+                'interest': interest,
+                'principal': principal,
+                'depreciation': self.depreciation_schedule().sum(axis=0),
+                'closing': closing,
+            }
+            self._names = names
+        return self._totals
+
+    def quarter(self, index: int) -> Dict:
+        """Look up interest, principal, depreciation and balances for a quarter."""
+        if not 0 <= index < self.horizon_quarters:
+            raise IndexError(f"Quarter {index} outside schedule horizon of {self.horizon_quarters}")
+        totals = self.totals()
+        return {
+            'interest': float(totals['interest'][index]),
+            'principal': float(totals['principal'][index]),
+            'depreciation': float(totals['depreciation'][index]),
+            'balances': dict(zip(self._names, totals['closing'][:, index].tolist())),
+        }
@@ -2,6 +2,7 @@ from dataclasses import dataclass
 from typing import Dict, List, Optional
 from datetime import datetime, timedelta
 from decimal import Decimal
+import numpy as np
 
 @dataclass
 class FinancialMetrics:
@@ -50,6 +51,8 @@ class FinancialModel:
             'cash': 50000000,        # Initial cash balance
             'other_assets': 100000000
         }
+        self.debt_schedule = None
+        self.schedule_quarter = 0
         self.initialize_financials()
     
     def initialize_financials(self):
@@ -83,17 +86,28 @@ class FinancialModel:
         operating_cost = operating_costs
         ebitda = revenue - operating_cost
         
-        # Calculate interest expense (assuming 5% annual rate)
-        interest_expense = (self.liabilities['aircraft_loans'] * 0.05) / 4
-        
-        # Calculate depreciation (assuming 20-year life for aircraft)
-        depreciation = (self.assets['aircraft'] / 20) / 4
-        
-        # Calculate net income
-        net_income = ebitda - interest_expense - depreciation
-        
-        # Update cash balance
-        self.assets['cash'] += net_income
+        if self.debt_schedule is not None:
+            # Interest, repayments and depreciation come from the precomputed schedules
+            scheduled = self.debt_schedule.quarter(self.schedule_quarter)
+            self.schedule_quarter += 1
+            interest_expense = scheduled['interest']
+            depreciation = scheduled['depreciation']
+            net_income = ebitda - interest_expense - depreciation
+            self.assets['cash'] += net_income - scheduled['principal']
+            self.assets['aircraft'] -= depreciation
+            self.liabilities.update(scheduled['balances'])
+        else:
+            # Calculate interest expense (assuming 5% annual rate)
+            interest_expense = (self.liabilities['aircraft_loans'] * 0.05) / 4
+            
+            # Calculate depreciation (assuming 20-year life for aircraft)
+            depreciation = (self.assets['aircraft'] / 20) / 4
+            
+            # Calculate net income
+            net_income = ebitda - interest_expense - depreciation
+            
+            # Update cash balance
+            self.assets['cash'] += net_income
         
         # Create and store metrics
         metrics = FinancialMetrics(
@@ -114,6 +128,16 @@ class FinancialModel:
         self.metrics[quarter] = metrics
         return metrics
     
+    def attach_debt_schedule(self, engine):
+        """Use a DebtScheduleEngine for interest, repayments and depreciation.
+        
+        Liability balances then follow the engine's schedules. Changes made
+        through ``update_liabilities`` are applied to the schedule from the
+        current quarter; change rates or terms through the engine.
+        """
+        self.debt_schedule = engine
+        self.schedule_quarter = 0
+    
     def get_quarterly_metrics(self, quarter: str) -> Optional[FinancialMetrics]:
         """Get financial metrics for a specific quarter."""
         return self.metrics.get(quarter)
@@ -139,9 +163,15 @@ class FinancialModel:
         return metrics.net_income / 90  # Daily cash burn rate
     
     def update_liabilities(self, liability_type: str, amount: float):
-        """Update a specific liability."""
+        """Update a specific liability.
+        
+        With a debt schedule attached, the scheduled liability is re-amortized
+        from its new balance so later quarters keep the change.
+        """
         if liability_type in self.liabilities:
             self.liabilities[liability_type] += amount
+            if self.debt_schedule is not None and liability_type in self.debt_schedule.terms:
+                self.debt_schedule.adjust_balance(liability_type, self.schedule_quarter, amount)
     
     def update_assets(self, asset_type: str, amount: float):
         """Update a specific asset."""
@@ -163,4 +193,128 @@ class FinancialModel:
             'debt_to_equity': metrics.debt_to_equity,
             'roic': self.calculate_roic(quarter),
             'cash_burn_rate': self.calculate_cash_burn_rate(quarter)
-        } 
\ No newline at end of file
+        } 
+
+# Per-scenario quarterly metrics produced by BatchedFinancialModel
+BATCHED_METRICS_DTYPE = np.dtype([
+    ('revenue', 'f8'),
+    ('operating_cost', 'f8'),
+    ('fuel_cost', 'f8'),
+    ('maintenance_cost', 'f8'),
+    ('labor_cost', 'f8'),
+    ('airport_charges', 'f8'),
+    ('other_costs', 'f8'),
+    ('ebitda', 'f8'),
+    ('interest_expense', 'f8'),
+    ('depreciation', 'f8'),
+    ('net_income', 'f8'),
+    ('cash_balance', 'f8'),
+    ('total_debt', 'f8'),
+    ('total_assets', 'f8'),
+    ('operating_margin', 'f8'),
+    ('debt_to_equity', 'f8'),
+    ('roic', 'f8'),
+    ('cash_burn_rate', 'f8'),
+])
+
+class BatchedFinancialModel:
+    """Evolves the financial position of many scenarios in one vectorized step.
+    
+    Liabilities and assets are held as arrays of shape ``(n_scenarios,)`` and
+    follow the same rules as ``FinancialModel.calculate_quarterly_metrics``:
+    5% annual interest on aircraft loans, 20-year straight-line aircraft
+    depreciation and net income accumulating into cash.
+    """
+    
+    def __init__(self, n_scenarios: int, liabilities: Optional[Dict[str, float]] = None,
+                 assets: Optional[Dict[str, float]] = None,
+                 interest_rate: float = 0.05, aircraft_life_years: float = 20):
+        if liabilities is None or assets is None:
+            defaults = FinancialModel()
+            liabilities = defaults.liabilities if liabilities is None else liabilities
+            assets = defaults.assets if assets is None else assets
+        self.n_scenarios = n_scenarios
+        self.interest_rate = interest_rate
+        self.aircraft_life_years = aircraft_life_years
+        self.liabilities: Dict[str, np.ndarray] = {
+            k: np.full(n_scenarios, v, dtype=float) for k, v in liabilities.items()
+        }
+        self.assets: Dict[str, np.ndarray] = {
+            k: np.full(n_scenarios, v, dtype=float) for k, v in assets.items()
+        }
+        self.metrics: Dict[str, np.ndarray] = {}
+    
+    @classmethod
+    def from_model(cls, model: FinancialModel, n_scenarios: int) -> 'BatchedFinancialModel':
+        """Broadcast the current state of a scalar model across N scenarios."""
+        return cls(n_scenarios, liabilities=model.liabilities, assets=model.assets)
+    
+    def _per_scenario(self, values) -> np.ndarray:
+        """Reduce per-route arrays ``(N, R)`` to per-scenario totals ``(N,)``."""
+        values = np.asarray(values, dtype=float)
+        if values.ndim == 2:
+            values = values.sum(axis=1)
+        return np.broadcast_to(values, (self.n_scenarios,))
+    
+    def calculate_quarterly_metrics(self, quarter: str, route_revenue, operating_costs,
+                                    fuel_costs=0.0, maintenance_costs=0.0, labor_costs=0.0,
+                                    airport_costs=0.0, other_costs=0.0) -> np.ndarray:
+        """Calculate metrics for all scenarios for a quarter.
+        
+        Revenue and cost inputs may be scalars, per-scenario arrays ``(N,)``
+        or per-route arrays ``(N, R)`` which are summed over routes.
+        """
+        out = np.empty(self.n_scenarios, dtype=BATCHED_METRICS_DTYPE)
+        revenue = self._per_scenario(route_revenue)
+        operating_cost = self._per_scenario(operating_costs)
+        out['revenue'] = revenue
+        out['operating_cost'] = operating_cost
+        out['fuel_cost'] = self._per_scenario(fuel_costs)
+        out['maintenance_cost'] = self._per_scenario(maintenance_costs)
+        out['labor_cost'] = self._per_scenario(labor_costs)
+        out['airport_charges'] = self._per_scenario(airport_costs)
+        out['other_costs'] = self._per_scenario(other_costs)
+        
+        ebitda = revenue - operating_cost
+        interest_expense = self.liabilities['aircraft_loans'] * self.interest_rate / 4
+        depreciation = self.assets['aircraft'] / self.aircraft_life_years / 4
+        net_income = ebitda - interest_expense - depreciation
+        self.assets['cash'] += net_income
+        
+        total_debt = sum(self.liabilities.values())
+        total_assets = sum(self.assets.values())
+        equity = total_assets - total_debt
+        with np.errstate(divide='ignore', invalid='ignore'):
+            out['operating_margin'] = np.where(revenue == 0, 0.0, ebitda / revenue * 100)
+            out['debt_to_equity'] = np.where(equity == 0, np.inf, total_debt / equity)
+            out['roic'] = np.where(equity == 0, 0.0, net_income / equity * 100)
+        
+        out['ebitda'] = ebitda
+        out['interest_expense'] = interest_expense
+        out['depreciation'] = depreciation
+        out['net_income'] = net_income
+        out['cash_balance'] = self.assets['cash']
+        out['total_debt'] = total_debt
+        out['total_assets'] = total_assets
+        out['cash_burn_rate'] = net_income / 90
+        
+        self.metrics[quarter] = out
+        return out
+    
+    def update_liabilities(self, liability_type: str, amount):
+        """Update a liability by a scalar or per-scenario amount."""
+        if liability_type in self.liabilities:
+            self.liabilities[liability_type] += amount
+    
+    def update_assets(self, asset_type: str, amount):
+        """Update an asset by a scalar or per-scenario amount."""
+        if asset_type in self.assets:
+            self.assets[asset_type] += amount
+    
+    def get_scenario_metrics(self, quarter: str, scenario: int) -> Optional[FinancialMetrics]:
+        """Get one scenario's quarter as a scalar FinancialMetrics object."""
+        batch = self.metrics.get(quarter)
+        if batch is None:
+            return None
+        row = batch[scenario]
+        return FinancialMetrics(**{name: float(row[name]) for name in FinancialMetrics.__dataclass_fields__})
@@ -1,11 +1,12 @@
-from typing import List, Dict
+from typing import Iterable, List, Dict, Optional
 from datetime import datetime
 from .aircraft import Aircraft
 
 class Fleet:
     """Manages the entire aircraft fleet of Biman Bangladesh Airlines."""
     
-    def __init__(self):
+    def __init__(self, as_of: Optional[datetime] = None):
+        self.as_of = as_of or datetime.now()  # reference date for maintenance records
         self.aircraft: List[Aircraft] = []
         self.fleet_composition: Dict[str, int] = {
             'B777-300ER': 4,
@@ -25,8 +26,8 @@ class Fleet:
                 type='B777-300ER',
                 age=10.0,
                 purchase_date=datetime(2015, 1, 1),
-                last_maintenance=datetime.now(),
-                next_maintenance=datetime.now(),
+                last_maintenance=self.as_of,
+                next_maintenance=self.as_of,
                 status='active',
                 utilization_hours=10.5,
                 fuel_efficiency=8500,  # liters per block hour
@@ -41,8 +42,8 @@ class Fleet:
                 type='B787-8',
                 age=7.0,
                 purchase_date=datetime(2018, 1, 1),
-                last_maintenance=datetime.now(),
-                next_maintenance=datetime.now(),
+                last_maintenance=self.as_of,
+                next_maintenance=self.as_of,
                 status='active',
                 utilization_hours=11.0,
                 fuel_efficiency=4500,
@@ -57,8 +58,8 @@ class Fleet:
                 type='B787-9',
                 age=5.5,
                 purchase_date=datetime(2020, 1, 1),
-                last_maintenance=datetime.now(),
-                next_maintenance=datetime.now(),
+                last_maintenance=self.as_of,
+                next_maintenance=self.as_of,
                 status='active',
                 utilization_hours=11.5,
                 fuel_efficiency=4800,
@@ -73,8 +74,8 @@ class Fleet:
                 type='B737-800',
                 age=13.5,
                 purchase_date=datetime(2012, 1, 1),
-                last_maintenance=datetime.now(),
-                next_maintenance=datetime.now(),
+                last_maintenance=self.as_of,
+                next_maintenance=self.as_of,
                 status='active',
                 utilization_hours=9.5,
                 fuel_efficiency=2500,
@@ -89,8 +90,8 @@ class Fleet:
                 type='Dash8-Q400',
                 age=8.0,
                 purchase_date=datetime(2017, 1, 1),
-                last_maintenance=datetime.now(),
-                next_maintenance=datetime.now(),
+                last_maintenance=self.as_of,
+                next_maintenance=self.as_of,
                 status='active',
                 utilization_hours=8.5,
                 fuel_efficiency=1200,
@@ -98,6 +99,11 @@ class Fleet:
                 cargo_capacity=8000
             ))
     
+    def remove_aircraft(self, registrations: Iterable[str]):
+        """Remove all aircraft with the given registrations in a single pass."""
+        registrations = frozenset(registrations)
+        self.aircraft = [a for a in self.aircraft if a.registration not in registrations]
+    
     def get_available_aircraft(self, aircraft_type: str = None) -> List[Aircraft]:
         """Get list of available aircraft, optionally filtered by type."""
         available = [a for a in self.aircraft if a.status == 'active']
@@ -105,6 +111,22 @@ class Fleet:
             available = [a for a in available if a.type == aircraft_type]
         return available
     
+    def get_seats_by_type(self) -> Dict[str, int]:
+        """Get seating capacity per aircraft type, from the first active aircraft of each type."""
+        seats: Dict[str, int] = {}
+        for a in self.aircraft:
+            if a.status == 'active' and a.type not in seats:
+                seats[a.type] = a.seating_capacity
+        return seats
+    
+    def get_weekly_block_hours(self) -> Dict[str, float]:
+        """Get available weekly block hours per aircraft type across active aircraft."""
+        hours: Dict[str, float] = {}
+        for a in self.aircraft:
+            if a.status == 'active':
+                hours[a.type] = hours.get(a.type, 0.0) + a.utilization_hours * 7
+        return hours
+    
     def get_maintenance_aircraft(self) -> List[Aircraft]:
         """Get list of aircraft currently in maintenance."""
         return [a for a in self.aircraft if a.status == 'maintenance']
@@ -0,0 +1,230 @@
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Deque, Dict, List, Optional, Set, Tuple
+import heapq
+import numpy as np
+from .fleet import Fleet
+from .route import RouteNetwork
+
+# Event kinds on the scheduler heap
+CHECK_DUE = 'due'
+CHECK_DONE = 'done'
+FAILURE = 'failure'
+RETURN_TO_SERVICE = 'return'
+
+@dataclass(frozen=True)
+class MaintenanceProgram:
+    """Check intervals and shop capacity for the maintenance scheduler."""
+    check_interval_hours: float = 600.0  # block hours between checks
+    check_interval_days: float = 120.0  # calendar limit between checks
+    check_duration_days: float = 2.0
+    hangar_slots: int = 2  # concurrent checks; due tails wait grounded for a slot
+    failure_rate_per_1000_hours: float = 0.0  # unscheduled AOG events
+    aog_duration_days: float = 3.0
+
+@dataclass
+class TailState:
+    """Scheduler bookkeeping for one aircraft."""
+    hours_since_check: float
+    last_check_day: float
+    active_since: Optional[float]  # clock day the tail last became active, None if not active
+    version: int = 0  # renewed from a scheduler-wide sequence on every status change; stale heap events are skipped
+    active_days: float = 0.0  # within the current quarter
+
+@dataclass
+class MaintenanceSummary:
+    """What happened to the fleet during one scheduler period."""
+    checks_started: int = 0
+    checks_completed: int = 0
+    failures: int = 0
+    grounded_waiting: int = 0  # tails waiting for a hangar slot at period end
+    availability: Dict[str, float] = field(default_factory=dict)  # active share of tail-days per type
+
+class MaintenanceScheduler:
+    """Event-driven maintenance scheduling on the simulation clock.
+
+    Every active tail has a pending check-due event on a min-heap, at the
+    earlier of its block-hour and calendar limits; block hours accrue lazily
+    from ``utilization_hours`` while the tail is active. When a check falls
+    due the tail goes to 'maintenance' if a hangar slot is free and is
+    'grounded' until one frees up otherwise. Optional random failures ground
+    active tails for ``aog_duration_days``. Advancing the clock pops only the
+    events that fall inside the period, so a quarter costs
+    O(events * log n) rather than a scan of the fleet per day.
+    """
+
+    def __init__(self, program: Optional[MaintenanceProgram] = None,
+                 start_date: datetime = datetime(2025, 1, 1), seed: Optional[int] = None):
+        self.program = program or MaintenanceProgram()
+        self.start_date = start_date
+        self.clock = 0.0  # days since start_date
+        self.rng = np.random.default_rng(seed)
+        self.tails: Dict[str, TailState] = {}
+        self.heap: List[Tuple[float, int, str, str, int]] = []
+        self.waiting: Deque[str] = deque()
+        self.in_check: Set[str] = set()  # tails occupying a hangar slot
+        self.period_days = 0.0  # length of the last advanced period
+        self._seq = 0
+        self._versions = 0  # never reused, so a re-added registration cannot revive old events
+
+    def _date(self, day: float) -> datetime:
+        return self.start_date + timedelta(days=day)
+
+    def _push(self, day: float, kind: str, registration: str):
+        self._seq += 1
+        heapq.heappush(self.heap, (day, self._seq, kind, registration,
+                                   self.tails[registration].version))
+
+    def _new_version(self) -> int:
+        self._versions += 1
+        return self._versions
+
+    def _hours(self, state: TailState, aircraft, day: float) -> float:
+        """Block hours since the last check, accrued up to ``day``."""
+        if state.active_since is None:
+            return state.hours_since_check
+        return state.hours_since_check + (day - state.active_since) * aircraft.utilization_hours
+
+    def _leave_active(self, state: TailState, aircraft, day: float, period_start: float):
+        state.hours_since_check = self._hours(state, aircraft, day)
+        state.active_days += day - max(state.active_since, period_start)
+        state.active_since = None
+        state.version = self._new_version()
+
+    def _activate(self, registration: str, aircraft, day: float):
+        """Put a tail into service and schedule its next check (and failure)."""
+        state = self.tails[registration]
+        state.version = self._new_version()
+        state.active_since = day
+        aircraft.status = 'active'
+        program = self.program
+        remaining_hours = max(program.check_interval_hours - state.hours_since_check, 0.0)
+        by_hours = day + remaining_hours / aircraft.utilization_hours if aircraft.utilization_hours > 0 else float('inf')
+        by_calendar = state.last_check_day + program.check_interval_days
+        due = max(min(by_hours, by_calendar), day)
+        aircraft.next_maintenance = self._date(due)
+        self._push(due, CHECK_DUE, registration)
+        if program.failure_rate_per_1000_hours > 0 and aircraft.utilization_hours > 0:
+            hours_to_failure = self.rng.exponential(1000.0 / program.failure_rate_per_1000_hours)
+            self._push(day + hours_to_failure / aircraft.utilization_hours, FAILURE, registration)
+
+    def _start_check(self, registration: str, aircraft, day: float, summary: MaintenanceSummary):
+        self.in_check.add(registration)
+        aircraft.status = 'maintenance'
+        self._push(day + self.program.check_duration_days, CHECK_DONE, registration)
+        summary.checks_started += 1
+
+    def _track_new(self, fleet: Fleet, summary: MaintenanceSummary):
+        """Start tracking tails added since the last period, staggering their first checks."""
+        new = [a for a in fleet.aircraft if a.registration not in self.tails]
+        for i, aircraft in enumerate(new):
+            registration = aircraft.registration
+            stagger = (i + 0.5) / len(new)
+            self.tails[registration] = TailState(
+                hours_since_check=self.program.check_interval_hours * stagger,
+                last_check_day=self.clock - self.program.check_interval_days * stagger,
+                active_since=None,
+                version=self._new_version()
+            )
+            if aircraft.status == 'active':
+                self._activate(registration, aircraft, self.clock)
+            elif aircraft.status == 'maintenance':
+                if len(self.in_check) < self.program.hangar_slots:
+                    self._start_check(registration, aircraft, self.clock, summary)
+                else:
+                    aircraft.status = 'grounded'
+                    self.waiting.append(registration)
+            # tails already grounded stay parked outside the schedule
+
+    def advance(self, fleet: Fleet, days: float = 90.0) -> MaintenanceSummary:
+        """Run the schedule forward ``days`` on the simulation clock, updating tail statuses."""
+        summary = MaintenanceSummary()
+        by_registration = {a.registration: a for a in fleet.aircraft}
+        removed = [r for r in self.tails if r not in by_registration]
+        for registration in removed:
+            del self.tails[registration]  # removed from the fleet; its events go stale
+            self.in_check.discard(registration)
+        if removed:
+            self.waiting = deque(r for r in self.waiting if r in self.tails)
+        self._track_new(fleet, summary)
+
+        period_start, end = self.clock, self.clock + days
+        for state in self.tails.values():
+            state.active_days = 0.0
+
+        while self.heap and self.heap[0][0] < end:
+            day, _, kind, registration, version = heapq.heappop(self.heap)
+            state = self.tails.get(registration)
+            if state is None or state.version != version:
+                continue
+            aircraft = by_registration[registration]
+
+            if kind == CHECK_DUE:
+                self._leave_active(state, aircraft, day, period_start)
+                if len(self.in_check) < self.program.hangar_slots:
+                    self._start_check(registration, aircraft, day, summary)
+                else:
+                    aircraft.status = 'grounded'
+                    self.waiting.append(registration)
+            elif kind == CHECK_DONE:
+                self.in_check.discard(registration)
+                summary.checks_completed += 1
+                state.hours_since_check = 0.0
+                state.last_check_day = day
+                aircraft.last_maintenance = self._date(day)
+                self._activate(registration, aircraft, day)
+                while self.waiting and len(self.in_check) < self.program.hangar_slots:
+                    queued = self.waiting.popleft()
+                    if queued in self.tails:
+                        self._start_check(queued, by_registration[queued], day, summary)
+            elif kind == FAILURE:
+                summary.failures += 1
+                self._leave_active(state, aircraft, day, period_start)
+                aircraft.status = 'grounded'
+                self._push(day + self.program.aog_duration_days, RETURN_TO_SERVICE, registration)
+            elif kind == RETURN_TO_SERVICE:
+                self._activate(registration, aircraft, day)
+
+        # Close out active intervals and summarize availability per type
+        tail_days: Dict[str, float] = {}
+        active_days: Dict[str, float] = {}
+        for registration, state in self.tails.items():
+            aircraft_type = by_registration[registration].type
+            if state.active_since is not None:
+                state.active_days += end - max(state.active_since, period_start)
+            tail_days[aircraft_type] = tail_days.get(aircraft_type, 0.0) + days
+            active_days[aircraft_type] = active_days.get(aircraft_type, 0.0) + state.active_days
+        summary.availability = {t: active_days[t] / tail_days[t] for t in tail_days}
+        summary.grounded_waiting = sum(1 for r in self.waiting if r in self.tails)
+        self.clock = end
+        self.period_days = days
+        return summary
+
+    def weekly_block_hours(self, fleet: Fleet) -> Dict[str, float]:
+        """Weekly block hours per type over the last period, net of maintenance and AOG days."""
+        hours: Dict[str, float] = {}
+        for aircraft in fleet.aircraft:
+            state = self.tails.get(aircraft.registration)
+            if state is None:
+                continue
+            if self.period_days:
+                share = state.active_days / self.period_days
+            else:
+                share = 1.0 if aircraft.status == 'active' else 0.0
+            hours[aircraft.type] = hours.get(aircraft.type, 0.0) + aircraft.utilization_hours * 7 * share
+        return hours
+
+    def service_factors(self, fleet: Fleet, route_network: RouteNetwork) -> Dict[str, float]:
+        """Share of scheduled flights each aircraft type could fly given its availability.
+
+        Compares available weekly block hours with the out-and-back block
+        hours the current frequencies need.
+        """
+        available = self.weekly_block_hours(fleet)
+        required: Dict[str, float] = {}
+        for route in route_network.routes.values():
+            required[route.aircraft_type] = required.get(route.aircraft_type, 0.0) + \
+                route.frequency * 2 * route.flight_time
+        return {aircraft_type: min(1.0, available.get(aircraft_type, 0.0) / hours) if hours > 0 else 1.0
+                for aircraft_type, hours in required.items()}
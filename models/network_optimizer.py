@@ -0,0 +1,140 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+import heapq
+from .fleet import Fleet
+from .route import RouteNetwork
+
+@dataclass
+class FrequencyPlan:
+    """Result of a network frequency optimization."""
+    frequencies: Dict[str, int]  # weekly frequency per route key
+    weekly_profit: float
+    block_hours_used: Dict[str, float]  # per aircraft type
+    block_hours_available: Dict[str, float]  # per aircraft type
+    unserved_routes: List[str] = field(default_factory=list)  # no active aircraft of the type
+
+    def to_actions(self, route_network: RouteNetwork) -> Dict:
+        """Express the plan as route 'modify' actions for frequencies that change."""
+        return {
+            'route_changes': [
+                {
+                    'action': 'modify',
+                    'origin': route_network.routes[key].origin,
+                    'destination': route_network.routes[key].destination,
+                    'modifications': {'frequency': frequency}
+                }
+                for key, frequency in self.frequencies.items()
+                if route_network.routes[key].frequency != frequency
+            ]
+        }
+
+class FrequencyOptimizer:
+    """Chooses weekly route frequencies to maximize network profit.
+
+    Each weekly frequency is one out-and-back rotation from DAC costing
+    ``2 * flight_time`` block hours of the route's aircraft type, limited by
+    the weekly block hours of active aircraft (``utilization_hours * 7``).
+    Weekly demand per route is capped at ``demand_headroom`` times the
+    passengers carried at the current frequency and load factor, so marginal
+    profit falls once a route saturates. Allocation is a heap-based greedy
+    over marginal profit per block hour. Without the block-hour limits the
+    problem is separable and concave and the greedy is optimal; under the
+    limits it is an integer knapsack per aircraft type and the greedy is a
+    heuristic. A high-ratio frequency can leave hours unused that a
+    lower-ratio one would have filled more profitably.
+    """
+
+    def __init__(self, route_network: RouteNetwork, fleet: Fleet,
+                 max_frequency: int = 21, demand_headroom: float = 1.5,
+                 round_trip: bool = True):
+        self.route_network = route_network
+        self.fleet = fleet
+        self.max_frequency = max_frequency
+        self.demand_headroom = demand_headroom
+        self.round_trip = round_trip
+
+    def optimize(self, min_frequency: Optional[Dict[str, int]] = None,
+                 max_frequency: Optional[Dict[str, int]] = None) -> FrequencyPlan:
+        """Solve for weekly frequencies, honouring optional per-route bounds.
+
+        Raises ``ValueError`` if the minimum frequencies alone exceed the
+        available block hours of an aircraft type.
+        """
+        min_frequency = min_frequency or {}
+        max_frequency = max_frequency or {}
+        seats_by_type = self.fleet.get_seats_by_type()
+        capacity = self.fleet.get_weekly_block_hours()
+        used = {aircraft_type: 0.0 for aircraft_type in capacity}
+
+        keys, hours, unit_revenue, unit_cost, demand_flights, upper = [], [], [], [], [], []
+        frequencies: Dict[str, int] = {}
+        unserved: List[str] = []
+        for key, route in self.route_network.routes.items():
+            seats = seats_by_type.get(route.aircraft_type)
+            if seats is None:
+                frequencies[key] = 0
+                unserved.append(key)
+                continue
+            revenue = route.calculate_revenue(seats)
+            cost = route.calculate_operating_cost(seats)
+            keys.append(key)
+            hours.append(route.flight_time * (2 if self.round_trip else 1))
+            unit_revenue.append(revenue)
+            unit_cost.append(cost)
+            # Demand expressed in full flights at the route's load factor
+            demand_flights.append(max(route.frequency, 1) * self.demand_headroom)
+            upper.append(max_frequency.get(key, self.max_frequency))
+
+        def marginal_gain(i: int, n: int) -> float:
+            """Profit of adding the (n+1)-th weekly frequency to route i."""
+            filled = min(max(demand_flights[i] - n, 0.0), 1.0)
+            return unit_revenue[i] * filled - unit_cost[i]
+
+        # Mandatory minimum frequencies first
+        assigned = [0] * len(keys)
+        for i, key in enumerate(keys):
+            lower = min(min_frequency.get(key, 0), upper[i])
+            if lower:
+                assigned[i] = lower
+                aircraft_type = self.route_network.routes[key].aircraft_type
+                used[aircraft_type] += lower * hours[i]
+        for aircraft_type, hours_used in used.items():
+            if hours_used > capacity[aircraft_type] + 1e-9:
+                raise ValueError(
+                    f"Minimum frequencies need {hours_used:.1f} block hours of {aircraft_type}, "
+                    f"only {capacity[aircraft_type]:.1f} available"
+                )
+
+        # Max-heap on marginal profit per block hour
+        heap = []
+        for i in range(len(keys)):
+            if assigned[i] < upper[i] and hours[i] > 0:
+                gain = marginal_gain(i, assigned[i])
+                if gain > 0:
+                    heap.append((-gain / hours[i], i))
+        heapq.heapify(heap)
+
+        while heap:
+            _, i = heapq.heappop(heap)
+            aircraft_type = self.route_network.routes[keys[i]].aircraft_type
+            if used[aircraft_type] + hours[i] > capacity[aircraft_type] + 1e-9:
+                continue  # this type is full for this route's rotation length
+            used[aircraft_type] += hours[i]
+            assigned[i] += 1
+            if assigned[i] < upper[i]:
+                gain = marginal_gain(i, assigned[i])
+                if gain > 0:
+                    heapq.heappush(heap, (-gain / hours[i], i))
+
+        weekly_profit = 0.0
+        for i, key in enumerate(keys):
+            frequencies[key] = assigned[i]
+            weekly_profit += sum(marginal_gain(i, n) for n in range(assigned[i]))
+
+        return FrequencyPlan(
+            frequencies=frequencies,
+            weekly_profit=weekly_profit,
+            block_hours_used=used,
+            block_hours_available=capacity,
+            unserved_routes=unserved
+        )
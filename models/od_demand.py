@@ -0,0 +1,201 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from scipy import sparse
+from .fleet import Fleet
+from .route import RouteNetwork
+
+@dataclass
+class ODAllocation:
+    """Passenger allocation of an O&D demand matrix over the route network."""
+    segment_passengers: Dict[str, float]  # weekly passengers carried, both directions
+    segment_load_factors: Dict[str, float]  # carried / (2 * weekly seats)
+    local_passengers: float  # carried on nonstop itineraries
+    connecting_passengers: float  # carried on one-stop itineraries
+    spilled_passengers: float  # demand with no usable itinerary, not recaptured or over capacity
+    itinerary_flows: np.ndarray = field(repr=False, default=None)
+
+class ODDemandModel:
+    """Origin-destination demand allocated across hub itineraries.
+
+    Weekly demand is a sparse ``(n_airports, n_airports)`` matrix. Every
+    O&D pair with demand gets a nonstop itinerary (if a route serves it) and
+    one-stop itineraries over each hub. Demand is split across itineraries by
+    a logit on flight time and stops; the share of suspended itineraries is
+    spilled, and ``recapture_rate`` of it is recaptured by the remaining
+    itineraries of the same O&D. Over-capacity segments ration every
+    itinerary crossing them proportionally. All steps are sparse products over
+    an itinerary x directed-segment incidence matrix, so cost grows with the
+    number of itineraries rather than with airports squared.
+    """
+
+    def __init__(self, route_network: RouteNetwork, hubs: Sequence[str] = ('DAC',),
+                 time_weight: float = 0.3, connection_penalty: float = 1.5,
+                 recapture_rate: float = 0.5):
+        self.hubs = list(hubs)
+        self.time_weight = time_weight
+        self.connection_penalty = connection_penalty
+        self.recapture_rate = recapture_rate
+
+        self.airports: List[str] = []
+        self.airport_index: Dict[str, int] = {}
+        self.demand = sparse.lil_matrix((0, 0))
+        for code in self.hubs:
+            self._airport(code)
+        self._index_segments(route_network)
+
+    def _index_segments(self, route_network: RouteNetwork):
+        """Map routes to segments flown in both directions."""
+        self.segment_keys = list(route_network.routes)
+        # (from, to) airport indices -> directed segment column (2 * segment + direction)
+        self._directed: Dict[Tuple[int, int], int] = {}
+        for s, route in enumerate(route_network.routes.values()):
+            a, b = self._airport(route.origin), self._airport(route.destination)
+            self._directed[(a, b)] = 2 * s
+            self._directed[(b, a)] = 2 * s + 1
+        self._itineraries = None
+
+    @classmethod
+    def from_network(cls, route_network: RouteNetwork, fleet: Fleet,
+                     connecting_demand: Optional[Dict[Tuple[str, str], float]] = None,
+                     **kwargs) -> 'ODDemandModel':
+        """Seed local demand from the passengers each route carries today.
+
+        Each operating route gets ``seats * frequency * load_factor`` weekly
+        passengers in both directions, so allocating the seeded matrix alone
+        reproduces the current load factors.
+        """
+        model = cls(route_network, **kwargs)
+        seats_by_type = fleet.get_seats_by_type()
+        for route in route_network.routes.values():
+            seats = seats_by_type.get(route.aircraft_type, 0)
+            passengers = seats * route.frequency * route.load_factor
+            if passengers > 0:
+                model.set_demand(route.origin, route.destination, passengers)
+                model.set_demand(route.destination, route.origin, passengers)
+        for (origin, destination), passengers in (connecting_demand or {}).items():
+            model.set_demand(origin, destination, passengers)
+        return model
+
+    def _airport(self, code: str) -> int:
+        if code not in self.airport_index:
+            self.airport_index[code] = len(self.airports)
+            self.airports.append(code)
+            n = len(self.airports)
+            self.demand.resize((n, n))
+            self._itineraries = None
+        return self.airport_index[code]
+
+    def set_demand(self, origin: str, destination: str, passengers: float):
+        """Set weekly O&D demand from ``origin`` to ``destination``."""
+        if origin == destination:
+            raise ValueError(f"O&D demand needs distinct airports, got {origin}")
+        if passengers < 0:
+            raise ValueError(f"O&D demand must be non-negative, got {passengers}")
+        self.demand[self._airport(origin), self._airport(destination)] = passengers
+        self._itineraries = None
+
+    def _build_itineraries(self, route_network: RouteNetwork):
+        """Enumerate itineraries for every O&D with demand and their incidence matrices."""
+        demand = self.demand.tocoo()
+        hub_indices = [self.airport_index[h] for h in self.hubs if h in self.airport_index]
+        flight_time = [route.flight_time for route in route_network.routes.values()]
+
+        od_rows, itin_od, itin_stops, itin_time = [], [], [], []
+        inc_rows, inc_cols = [], []
+
+        def add_itinerary(od: int, legs: List[int]):
+            i = len(itin_od)
+            itin_od.append(od)
+            itin_stops.append(len(legs) - 1)
+            itin_time.append(sum(flight_time[leg // 2] for leg in legs))
+            inc_rows.extend([i] * len(legs))
+            inc_cols.extend(legs)
+
+        for od, (o, d) in enumerate(zip(demand.row, demand.col)):
+            od_rows.append(demand.data[od])
+            nonstop = self._directed.get((o, d))
+            if nonstop is not None:
+                add_itinerary(od, [nonstop])
+            for h in hub_indices:
+                if h in (o, d):
+                    continue
+                first, second = self._directed.get((o, h)), self._directed.get((h, d))
+                if first is not None and second is not None:
+                    add_itinerary(od, [first, second])
+
+        n_itineraries, n_directed = len(itin_od), 2 * len(self.segment_keys)
+        incidence = sparse.csr_matrix(
+            (np.ones(len(inc_rows)), (inc_rows, inc_cols)), shape=(n_itineraries, n_directed)
+        )
+        od_of = sparse.csr_matrix(
+            (np.ones(n_itineraries), (itin_od, np.arange(n_itineraries))),
+            shape=(len(od_rows), n_itineraries)
+        )
+        utility = -self.time_weight * np.array(itin_time) - self.connection_penalty * np.array(itin_stops)
+        self._itineraries = {
+            'od_demand': np.array(od_rows, dtype=float),
+            'itinerary_od': np.array(itin_od, dtype=int),
+            'stops': np.array(itin_stops, dtype=int),
+            'weight': np.exp(utility),
+            'incidence': incidence,
+            'od_of': od_of,
+        }
+
+    def allocate(self, route_network: RouteNetwork, fleet: Fleet) -> ODAllocation:
+        """Allocate demand to itineraries given current frequencies and fleet seats."""
+        if self.segment_keys != list(route_network.routes):
+            self._index_segments(route_network)
+        if self._itineraries is None:
+            self._build_itineraries(route_network)
+        it = self._itineraries
+        incidence, od_of = it['incidence'], it['od_of']
+        seats_by_type = fleet.get_seats_by_type()
+        routes = [route_network.routes[key] for key in self.segment_keys]
+
+        # Weekly seats per directed segment
+        seats = np.array([seats_by_type.get(r.aircraft_type, 0) * r.frequency for r in routes], dtype=float)
+        capacity = np.repeat(seats, 2)
+        operating = capacity > 0
+
+        # An itinerary is usable if none of its segments is suspended
+        blocked = incidence @ (~operating).astype(float)
+        available = blocked == 0
+        weight = it['weight']
+        total_weight = od_of @ weight
+        available_weight = od_of @ (weight * available)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            spilled_share = np.where(total_weight > 0, 1 - available_weight / total_weight, 1.0)
+            recapture = np.where(available_weight > 0,
+                                 1 + self.recapture_rate * spilled_share * total_weight / available_weight, 0.0)
+        od_index = it['itinerary_od']
+        flows = it['od_demand'][od_index] * weight * available / total_weight[od_index] * recapture[od_index]
+
+        # Ration over-capacity segments; the product of ratios keeps every segment feasible
+        segment_demand = incidence.T @ flows
+        with np.errstate(divide='ignore'):
+            ratio = np.where(segment_demand > capacity, capacity / np.maximum(segment_demand, 1e-12), 1.0)
+        flows = flows * np.exp(incidence @ np.log(np.maximum(ratio, 1e-300)))
+        carried = (incidence.T @ flows).reshape(-1, 2).sum(axis=1)
+
+        segment_passengers, segment_load_factors = {}, {}
+        for s, key in enumerate(self.segment_keys):
+            segment_passengers[key] = float(carried[s])
+            if seats[s] > 0:
+                segment_load_factors[key] = float(carried[s] / (2 * seats[s]))
+        nonstop = it['stops'] == 0
+        return ODAllocation(
+            segment_passengers=segment_passengers,
+            segment_load_factors=segment_load_factors,
+            local_passengers=float(flows[nonstop].sum()),
+            connecting_passengers=float(flows[~nonstop].sum()),
+            spilled_passengers=float(it['od_demand'].sum() - flows.sum()),
+            itinerary_flows=flows
+        )
+
+    def update_load_factors(self, route_network: RouteNetwork, fleet: Fleet) -> ODAllocation:
+        """Allocate demand and write the resulting load factors to operating routes."""
+        allocation = self.allocate(route_network, fleet)
+        for key, load_factor in allocation.segment_load_factors.items():
+            route_network.routes[key].load_factor = load_factor
+        return allocation
@@ -0,0 +1,176 @@
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from scipy.stats import norm
+from .fleet import Fleet
+from .route import RouteNetwork
+
+@dataclass(frozen=True)
+class FareClass:
+    """A booking class priced relative to the route's average yield."""
+    name: str
+    fare_multiplier: float  # fare / (yield_per_rpk * distance)
+    demand_share: float  # share of mean unconstrained demand
+    cv: float = 0.3  # coefficient of variation of demand
+
+# Highest fare first, as EMSR-b expects; the demand-weighted multiplier is close to 1
+DEFAULT_FARE_CLASSES: Tuple[FareClass, ...] = (
+    FareClass('J', 2.5, 0.08, 0.35),
+    FareClass('Y', 1.4, 0.15, 0.3),
+    FareClass('M', 1.0, 0.25, 0.3),
+    FareClass('K', 0.75, 0.30, 0.3),
+    FareClass('L', 0.55, 0.22, 0.4),
+)
+
+@dataclass
+class FareClassResult:
+    """Revenue-management outcome of a route's departures in a quarter."""
+    departures: int
+    passengers: float  # mean per departure
+    load_factor: float
+    revenue: float  # mean per departure
+    yield_per_rpk: float
+    class_mix: Dict[str, float]  # share of passengers per fare class
+    spilled: float  # mean rejected bookings per departure
+
+def emsr_b(fares: np.ndarray, means: np.ndarray, sigmas: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    """EMSR-b nested protection levels for many flights at once.
+
+    ``fares``, ``means`` and ``sigmas`` are ``(n, classes)`` arrays ordered from
+    the highest fare down; returns ``(n, classes - 1)`` seats protected for
+    classes ``0..j`` against class ``j + 1``.
+    """
+    demand = np.cumsum(means, axis=1)[:, :-1]
+    revenue = np.cumsum(fares * means, axis=1)[:, :-1]
+    weighted_fare = np.divide(revenue, demand, out=np.zeros_like(revenue), where=demand > 0)
+    sigma = np.sqrt(np.cumsum(sigmas ** 2, axis=1))[:, :-1]
+    ratio = np.divide(fares[:, 1:], weighted_fare, out=np.ones_like(weighted_fare), where=weighted_fare > 0)
+    protection = demand + sigma * norm.ppf(np.clip(1 - ratio, 1e-9, 1 - 1e-9))
+    return np.clip(protection, 0, capacity[:, None])
+
+class RevenueManagementModel:
+    """Fare-class booking simulation with EMSR-b booking controls.
+
+    Each departure draws normal demand per fare class around the route's
+    unconstrained demand (``seats * load_factor * demand_scale``), and
+    bookings arrive low fare first against nested booking limits
+    ``capacity - protection``. All departures of the quarter are simulated
+    as ``(departures, classes)`` arrays in chunks of ``chunk_size``.
+
+    Fares and demand are derived from each route's base ``yield_per_rpk`` and
+    ``load_factor``, remembered the first time a route is seen (or when
+    something other than this model changes them), so writing results back
+    to the routes does not compound from quarter to quarter.
+    """
+
+    def __init__(self, fare_classes: Sequence[FareClass] = DEFAULT_FARE_CLASSES,
+                 demand_scale: float = 1.0, weeks: int = 13, chunk_size: int = 1_000_000,
+                 seed: Optional[int] = None):
+        if not fare_classes:
+            raise ValueError("At least one fare class is required")
+        multipliers = [fc.fare_multiplier for fc in fare_classes]
+        if multipliers != sorted(multipliers, reverse=True):
+            raise ValueError("Fare classes must be ordered from the highest fare down")
+        self.fare_classes = list(fare_classes)
+        self.demand_scale = demand_scale
+        self.weeks = weeks
+        self.chunk_size = chunk_size
+        self.rng = np.random.default_rng(seed)
+        self._base: Dict[str, Tuple[float, float]] = {}  # route key -> (yield, load factor)
+        self._written: Dict[str, Tuple[float, float]] = {}
+
+    def cache_state(self) -> Dict:
+        """Settings, generator and remembered base values, for result cache keys."""
+        return {
+            'fare_classes': self.fare_classes,
+            'demand_scale': self.demand_scale,
+            'weeks': self.weeks,
+            'rng': self.rng,
+            'base': self._base,
+            'written': self._written,
+        }
+
+    def _base_values(self, key: str, route) -> Tuple[float, float]:
+        current = (route.yield_per_rpk, route.load_factor)
+        if key not in self._base or self._written.get(key) != current:
+            self._base[key] = current
+        return self._base[key]
+
+    def simulate(self, route_network: RouteNetwork, fleet: Fleet) -> Dict[str, FareClassResult]:
+        """Simulate every departure of the quarter and summarize per route."""
+        seats_by_type = fleet.get_seats_by_type()
+        keys: List[str] = []
+        seats, distance, base_yield, base_load, departures = [], [], [], [], []
+        for key, route in route_network.routes.items():
+            route_seats = seats_by_type.get(route.aircraft_type)
+            if route_seats is None or route.frequency <= 0:
+                continue
+            yield_per_rpk, load_factor = self._base_values(key, route)
+            keys.append(key)
+            seats.append(route_seats)
+            distance.append(route.distance)
+            base_yield.append(yield_per_rpk)
+            base_load.append(load_factor)
+            departures.append(route.frequency * self.weeks)
+        if not keys:
+            return {}
+
+        seats = np.array(seats, dtype=float)
+        departures = np.array(departures, dtype=np.int64)
+        multiplier = np.array([fc.fare_multiplier for fc in self.fare_classes])
+        share = np.array([fc.demand_share for fc in self.fare_classes])
+        cv = np.array([fc.cv for fc in self.fare_classes])
+
+        # Per-route forecasts and controls
+        fares = (np.array(base_yield) * np.array(distance))[:, None] * multiplier
+        means = (seats * np.array(base_load) * self.demand_scale)[:, None] * share
+        sigmas = means * cv
+        protection = emsr_b(fares, means, sigmas, seats)
+        # Booking limit of class j covers class j and all lower classes
+        limits = seats[:, None] - np.hstack([np.zeros((len(keys), 1)), protection])
+
+        n_routes, n_classes = len(keys), len(self.fare_classes)
+        sold_by_class = np.zeros((n_routes, n_classes))
+        demand_total = np.zeros(n_routes)
+        flight_route = np.repeat(np.arange(n_routes), departures)
+        for start in range(0, len(flight_route), self.chunk_size):
+            route_idx = flight_route[start:start + self.chunk_size]
+            demand = np.rint(self.rng.normal(means[route_idx], sigmas[route_idx]))
+            np.maximum(demand, 0, out=demand)
+            sold = np.empty_like(demand)
+            booked = np.zeros(len(route_idx))
+            for j in range(n_classes - 1, -1, -1):  # low fare arrives first
+                room = np.maximum(limits[route_idx, j] - booked, 0)
+                sold[:, j] = np.minimum(demand[:, j], room)
+                booked += sold[:, j]
+            for j in range(n_classes):
+                sold_by_class[:, j] += np.bincount(route_idx, weights=sold[:, j], minlength=n_routes)
+            demand_total += np.bincount(route_idx, weights=demand.sum(axis=1), minlength=n_routes)
+
+        passengers = sold_by_class.sum(axis=1)
+        revenue = (sold_by_class * fares).sum(axis=1)
+        results = {}
+        for r, key in enumerate(keys):
+            n = departures[r]
+            rpk = passengers[r] * distance[r]
+            results[key] = FareClassResult(
+                departures=int(n),
+                passengers=float(passengers[r] / n),
+                load_factor=float(passengers[r] / (n * seats[r])),
+                revenue=float(revenue[r] / n),
+                yield_per_rpk=float(revenue[r] / rpk) if rpk > 0 else 0.0,
+                class_mix={fc.name: float(sold_by_class[r, j] / passengers[r]) if passengers[r] > 0 else 0.0
+                           for j, fc in enumerate(self.fare_classes)},
+                spilled=float((demand_total[r] - passengers[r]) / n)
+            )
+        return results
+
+    def update_routes(self, route_network: RouteNetwork, fleet: Fleet) -> Dict[str, FareClassResult]:
+        """Simulate the quarter and write realized yield and load factor to the routes."""
+        results = self.simulate(route_network, fleet)
+        for key, result in results.items():
+            route = route_network.routes[key]
+            route.yield_per_rpk = result.yield_per_rpk
+            route.load_factor = result.load_factor
+            self._written[key] = (route.yield_per_rpk, route.load_factor)
+        return results
@@ -35,6 +35,10 @@ class Route:
         return base_cost + self.ground_handling_cost + self.airport_charges + \
                self.crew_cost + self.maintenance_cost + self.marketing_cost + self.other_costs
     
+    def calculate_fuel_cost(self, fuel_efficiency: float) -> float:
+        """Calculate fuel cost for a single flight given liters per block hour."""
+        return self.fuel_price * fuel_efficiency * self.flight_time
+    
     def calculate_profit(self, seats: int) -> float:
         """Calculate profit for a single flight."""
         revenue = self.calculate_revenue(seats)
@@ -286,17 +290,20 @@ class RouteNetwork:
         route_key = f"{origin}-{destination}"
         return self.routes.get(route_key)
     
-    def get_profitable_routes(self) -> List[Route]:
-        """Get list of profitable routes."""
+    def get_profitable_routes(self, seats_by_type: Dict[str, int]) -> List[Route]:
+        """Get list of profitable routes, given seats per aircraft type."""
         return [route for route in self.routes.values() 
-                if route.calculate_weekly_profit(route.aircraft_type) > 0]
+                if route.aircraft_type in seats_by_type
+                and route.calculate_weekly_profit(seats_by_type[route.aircraft_type]) > 0]
     
-    def get_unprofitable_routes(self) -> List[Route]:
-        """Get list of unprofitable routes."""
+    def get_unprofitable_routes(self, seats_by_type: Dict[str, int]) -> List[Route]:
+        """Get list of unprofitable routes, given seats per aircraft type."""
         return [route for route in self.routes.values() 
-                if route.calculate_weekly_profit(route.aircraft_type) <= 0]
+                if route.aircraft_type in seats_by_type
+                and route.calculate_weekly_profit(seats_by_type[route.aircraft_type]) <= 0]
     
-    def calculate_total_network_profit(self) -> float:
-        """Calculate total profit for the entire network."""
-        return sum(route.calculate_weekly_profit(route.aircraft_type) 
-                  for route in self.routes.values()) 
\ No newline at end of file
+    def calculate_total_network_profit(self, seats_by_type: Dict[str, int]) -> float:
+        """Calculate total weekly profit for the entire network, given seats per aircraft type."""
+        return sum(route.calculate_weekly_profit(seats_by_type[route.aircraft_type]) 
+                  for route in self.routes.values()
+                  if route.aircraft_type in seats_by_type)
\ No newline at end of file
@@ -0,0 +1,127 @@
+import re
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from .route import RouteNetwork
+
+_QUARTER_LABEL = re.compile(r'^\d{4}-Q([1-4])$')
+
+# Load factor index per quarter of the year (Q1..Q4), normalized to a mean of 1
+DEFAULT_SEASONAL_PROFILES: Dict[str, Tuple[float, float, float, float]] = {
+    'domestic': (1.06, 0.98, 0.92, 1.04),  # dry-season peak, monsoon trough
+    'south_asia': (1.04, 0.98, 0.94, 1.04),
+    'middle_east': (0.96, 1.06, 1.02, 0.96),  # Eid and Hajj travel
+    'southeast_asia': (1.00, 0.96, 0.98, 1.06),
+    'east_asia': (0.98, 1.04, 0.96, 1.02),
+    'europe': (0.92, 0.98, 1.10, 1.00),  # diaspora summer holidays
+}
+
+# Destination airport -> market whose profile its routes follow
+DEFAULT_MARKETS: Dict[str, str] = {
+    'CGP': 'domestic', 'ZYL': 'domestic',
+    'DEL': 'south_asia', 'CCU': 'south_asia',
+    'DXB': 'middle_east', 'AUH': 'middle_east',
+    'SIN': 'southeast_asia', 'KUL': 'southeast_asia',
+    'NRT': 'east_asia',
+    'LHR': 'europe', 'MAN': 'europe',
+}
+
+def quarter_of_year(label: str) -> int:
+    """Quarter of the year (1-4) of a 'YYYY-Qn' quarter label."""
+    match = _QUARTER_LABEL.match(label)
+    if not match:
+        raise ValueError(f"Invalid quarter label: {label}. Expected 'YYYY-Qn'")
+    return int(match.group(1))
+
+class SeasonalDemandModel:
+    """Per-route by quarter-of-year indices on load factor and yield.
+
+    ``load_factor_index`` and ``yield_index`` are ``(n_routes, 4)`` tables,
+    built once from each route's market profile (or a per-route override)
+    and extended only when routes are added. Peaks carry fares as well as
+    passengers: the yield index is ``1 + yield_elasticity * (index - 1)``.
+    Each quarter ``apply`` gathers the network's load factors and yields
+    into arrays, scales them by the quarter's column of both tables in one
+    broadcast and writes them back; ``restore`` puts the unseasoned values
+    back once the quarter is reported, so indices never compound and
+    actions keep editing unseasoned values. Models applied later in the
+    quarter (revenue management) take the seasoned values as their inputs;
+    the values they write back are replaced on ``restore``.
+    """
+
+    def __init__(self, route_network: RouteNetwork,
+                 profiles: Dict[str, Sequence[float]] = DEFAULT_SEASONAL_PROFILES,
+                 markets: Dict[str, str] = DEFAULT_MARKETS,
+                 overrides: Optional[Dict[str, Sequence[float]]] = None,
+                 yield_elasticity: float = 0.5, max_load_factor: float = 1.0):
+        self.profiles = {name: self._normalized(profile) for name, profile in profiles.items()}
+        self.markets = dict(markets)
+        self.overrides = {key: self._normalized(profile) for key, profile in (overrides or {}).items()}
+        self.yield_elasticity = yield_elasticity
+        self.max_load_factor = max_load_factor
+
+        self.route_keys: List[str] = []
+        self._row: Dict[str, int] = {}
+        self.load_factor_index = np.empty((0, 4))
+        self.yield_index = np.empty((0, 4))
+        self._unseasoned: Optional[Tuple[List[str], np.ndarray, np.ndarray]] = None
+        self._index_routes(route_network)
+
+    @staticmethod
+    def _normalized(profile: Sequence[float]) -> np.ndarray:
+        profile = np.asarray(profile, dtype=float)
+        if profile.shape != (4,) or (profile <= 0).any():
+            raise ValueError("A seasonal profile needs four positive quarterly indices")
+        return profile / profile.mean()
+
+    def _index_routes(self, route_network: RouteNetwork):
+        """Add table rows for routes not seen before."""
+        new_rows = []
+        for key, route in route_network.routes.items():
+            if key in self._row:
+                continue
+            profile = self.overrides.get(key)
+            if profile is None:
+                market = self.markets.get(route.destination)
+                profile = self.profiles[market] if market in self.profiles else np.ones(4)
+            self._row[key] = len(self.route_keys)
+            self.route_keys.append(key)
+            new_rows.append(profile)
+        if new_rows:
+            new_rows = np.array(new_rows)
+            self.load_factor_index = np.vstack([self.load_factor_index, new_rows])
+            self.yield_index = np.vstack([self.yield_index, 1 + self.yield_elasticity * (new_rows - 1)])
+
+    def indices(self, quarter: str) -> Dict[str, Tuple[float, float]]:
+        """Load factor and yield index of every indexed route in a quarter."""
+        q = quarter_of_year(quarter) - 1
+        return {key: (float(self.load_factor_index[row, q]), float(self.yield_index[row, q]))
+                for key, row in self._row.items()}
+
+    def apply(self, route_network: RouteNetwork, quarter: str):
+        """Scale every route's load factor and yield by its index for the quarter."""
+        self._index_routes(route_network)
+        q = quarter_of_year(quarter) - 1
+        keys = list(route_network.routes)
+        routes = [route_network.routes[key] for key in keys]
+        rows = np.fromiter((self._row[key] for key in keys), dtype=np.intp, count=len(keys))
+        load = np.fromiter((route.load_factor for route in routes), dtype=float, count=len(routes))
+        yields = np.fromiter((route.yield_per_rpk for route in routes), dtype=float, count=len(routes))
+        self._unseasoned = (keys, load, yields)
+
+        seasonal_load = np.minimum(load * self.load_factor_index[rows, q], self.max_load_factor)
+        seasonal_yield = yields * self.yield_index[rows, q]
+        for route, load_factor, yield_per_rpk in zip(routes, seasonal_load.tolist(), seasonal_yield.tolist()):
+            route.load_factor = load_factor
+            route.yield_per_rpk = yield_per_rpk
+
+    def restore(self, route_network: RouteNetwork):
+        """Put back the load factors and yields seen by the last ``apply``."""
+        if self._unseasoned is None:
+            return
+        keys, load, yields = self._unseasoned
+        for key, load_factor, yield_per_rpk in zip(keys, load.tolist(), yields.tolist()):
+            route = route_network.routes.get(key)
+            if route is not None:
+                route.load_factor = load_factor
+                route.yield_per_rpk = yield_per_rpk
+        self._unseasoned = None
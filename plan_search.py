@@ -0,0 +1,243 @@
+"""
+Evolutionary search over multi-quarter turnaround plans.
+
+A plan is a ``(quarters, routes)`` integer matrix of weekly frequencies; it is
+decoded into ``actions_by_quarter`` route 'modify' actions, emitting only the
+frequencies that change from the previous quarter. Fitness is cumulative net
+income, penalized when the cash balance falls below a floor.
+
+Evaluation is memoized at two levels:
+
+* the driver keeps a fitness cache keyed by the full plan, so duplicate
+  individuals across generations are never re-simulated;
+* every worker keeps an LRU cache of simulation snapshots keyed by plan
+  prefix, so plans sharing their first quarters resume from the deepest cached
+  prefix instead of re-simulating it. Populations are sorted before being
+  chunked across workers so that shared prefixes land in the same process.
+"""
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from checkpoint import restore_snapshot, snapshot_state
+from simulation import BimanSimulation, quarter_label
+
+@dataclass
+class SearchConfig:
+    """Parameters of a plan search."""
+    quarters: int = 8
+    routes: Optional[List[str]] = None  # defaults to every route in the network
+    max_frequency: int = 14
+    cash_floor: float = -1e9
+    penalty_weight: float = 10.0
+    population_size: int = 64
+    generations: int = 50
+    elite: int = 4
+    tournament_size: int = 3
+    crossover_rate: float = 0.9
+    mutation_rate: float = 0.05
+    workers: int = 0  # 0 evaluates in-process
+    prefix_cache_size: int = 4096
+    seed: Optional[int] = None
+
+@dataclass
+class SearchResult:
+    """Best plan found and search statistics."""
+    best_plan: np.ndarray
+    best_fitness: float
+    best_actions: Dict[str, Dict]
+    history: List[float] = field(default_factory=list)  # best fitness per generation
+    evaluations: int = 0
+    simulated_quarters: int = 0
+
+def decode_plan(plan: np.ndarray, routes: Sequence[str], base_frequencies: Sequence[int]) -> Dict[str, Dict]:
+    """Turn a frequency matrix into ``actions_by_quarter`` with only changed frequencies."""
+    actions_by_quarter: Dict[str, Dict] = {}
+    previous = list(base_frequencies)
+    for q in range(plan.shape[0]):
+        changes = []
+        for r, key in enumerate(routes):
+            frequency = int(plan[q, r])
+            if frequency != previous[r]:
+                origin, destination = key.split('-', 1)
+                changes.append({
+                    'action': 'modify',
+                    'origin': origin,
+                    'destination': destination,
+                    'modifications': {'frequency': frequency}
+                })
+                previous[r] = frequency
+        if changes:
+            actions_by_quarter.setdefault(quarter_label(q), {'route_changes': []})['route_changes'].extend(changes)
+    return actions_by_quarter
+
+class PlanEvaluator:
+    """Evaluates plans with a prefix-keyed LRU cache of simulation snapshots."""
+
+    def __init__(self, config: SearchConfig):
+        self.config = config
+        self.simulation = BimanSimulation(log_file=None, console=False)
+        self.routes = config.routes or list(self.simulation.route_network.routes)
+        self.base_frequencies = [self.simulation.route_network.routes[key].frequency
+                                 for key in self.routes]
+        self.base_state = snapshot_state(self.simulation)
+        # prefix bytes -> (snapshot, cumulative net income, minimum cash)
+        self.prefix_cache: 'OrderedDict[bytes, Tuple[bytes, float, float]]' = OrderedDict()
+        self.simulated_quarters = 0
+
+    def evaluate(self, plan: np.ndarray) -> float:
+        """Fitness of a plan: cumulative net income minus the cash-floor penalty."""
+        config = self.config
+        quarters = plan.shape[0]
+
+        # Resume from the deepest cached prefix
+        start, state, net_income, min_cash = 0, self.base_state, 0.0, float('inf')
+        for depth in range(quarters, 0, -1):
+            cached = self.prefix_cache.get(plan[:depth].tobytes())
+            if cached is not None:
+                self.prefix_cache.move_to_end(plan[:depth].tobytes())
+                start = depth
+                state, net_income, min_cash = cached
+                break
+        restore_snapshot(self.simulation, state)
+
+        previous = list(self.base_frequencies) if start == 0 else [int(f) for f in plan[start - 1]]
+        for q in range(start, quarters):
+            routes = self.simulation.route_network.routes
+            for r, key in enumerate(self.routes):
+                frequency = int(plan[q, r])
+                if frequency != previous[r]:
+                    routes[key].frequency = frequency
+                    previous[r] = frequency
+            quarter = quarter_label(q)
+            self.simulation.run_quarter(quarter, {})
+            metrics = self.simulation.financial_model.get_quarterly_metrics(quarter)
+            net_income += metrics.net_income
+            min_cash = min(min_cash, metrics.cash_balance)
+            self.simulated_quarters += 1
+
+            self.prefix_cache[plan[:q + 1].tobytes()] = (snapshot_state(self.simulation), net_income, min_cash)
+            if len(self.prefix_cache) > config.prefix_cache_size:
+                self.prefix_cache.popitem(last=False)
+
+        shortfall = max(config.cash_floor - min_cash, 0.0)
+        return net_income - config.penalty_weight * shortfall
+
+_worker_evaluator: Optional[PlanEvaluator] = None
+
+def _init_worker(config: SearchConfig):
+    global _worker_evaluator
+    _worker_evaluator = PlanEvaluator(config)
+
+def _evaluate_chunk(plans: List[np.ndarray]) -> Tuple[List[float], int]:
+    before = _worker_evaluator.simulated_quarters
+    fitness = [_worker_evaluator.evaluate(plan) for plan in plans]
+    return fitness, _worker_evaluator.simulated_quarters - before
+
+class PlanSearch:
+    """Genetic algorithm over quarter-by-quarter route frequency plans.
+
+    Crossover swaps whole quarters between parents and mutation nudges single
+    frequencies, so offspring tend to share prefixes with their parents.
+    """
+
+    def __init__(self, config: Optional[SearchConfig] = None):
+        self.config = config or SearchConfig()
+        self.rng = np.random.default_rng(self.config.seed)
+        self._local = PlanEvaluator(self.config)
+        self.routes = self._local.routes
+        self.base_frequencies = self._local.base_frequencies
+        self.fitness_cache: Dict[bytes, float] = {}
+        self.simulated_quarters = 0
+
+    def _random_plan(self) -> np.ndarray:
+        base = np.array(self.base_frequencies, dtype=np.int16)
+        plan = np.tile(base, (self.config.quarters, 1))
+        return self._mutate(plan, rate=0.2)
+
+    def _mutate(self, plan: np.ndarray, rate: float) -> np.ndarray:
+        plan = plan.copy()
+        mask = self.rng.random(plan.shape) < rate
+        steps = self.rng.integers(-2, 3, size=plan.shape)
+        plan[mask] = np.clip(plan[mask] + steps[mask], 0, self.config.max_frequency)
+        return plan
+
+    def _crossover(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        take_b = self.rng.random(a.shape[0]) < 0.5
+        return np.where(take_b[:, None], b, a)
+
+    def _tournament(self, population: List[np.ndarray], fitness: np.ndarray) -> np.ndarray:
+        picks = self.rng.integers(0, len(population), size=self.config.tournament_size)
+        return population[picks[np.argmax(fitness[picks])]]
+
+    def _evaluate(self, population: List[np.ndarray], pool: Optional[ProcessPoolExecutor]) -> np.ndarray:
+        """Evaluate a population, skipping plans already in the fitness cache."""
+        pending: Dict[bytes, np.ndarray] = {}
+        for plan in population:
+            key = plan.tobytes()
+            if key not in self.fitness_cache:
+                pending[key] = plan
+        # Sort so plans sharing prefixes are evaluated together
+        keys = sorted(pending, key=lambda k: pending[k].tolist())
+        plans = [pending[k] for k in keys]
+
+        if pool is None:
+            before = self._local.simulated_quarters
+            results = [self._local.evaluate(plan) for plan in plans]
+            self.simulated_quarters += self._local.simulated_quarters - before
+        else:
+            n_chunks = max(1, min(len(plans), self.config.workers * 4))
+            bounds = np.linspace(0, len(plans), n_chunks + 1).astype(int)
+            chunks = [plans[bounds[i]:bounds[i + 1]] for i in range(n_chunks)]
+            results = []
+            for chunk_fitness, simulated in pool.map(_evaluate_chunk, chunks):
+                results.extend(chunk_fitness)
+                self.simulated_quarters += simulated
+
+        for key, value in zip(keys, results):
+            self.fitness_cache[key] = value
+        return np.array([self.fitness_cache[plan.tobytes()] for plan in population])
+
+    def run(self) -> SearchResult:
+        """Run the search and return the best plan found."""
+        config = self.config
+        pool = None
+        if config.workers > 0:
+            pool = ProcessPoolExecutor(max_workers=config.workers,
+                                       initializer=_init_worker, initargs=(config,))
+        try:
+            population = [np.tile(np.array(self.base_frequencies, dtype=np.int16), (config.quarters, 1))]
+            population += [self._random_plan() for _ in range(config.population_size - 1)]
+            history = []
+            for _ in range(config.generations):
+                fitness = self._evaluate(population, pool)
+                order = np.argsort(fitness)[::-1]
+                history.append(float(fitness[order[0]]))
+
+                next_population = [population[i] for i in order[:config.elite]]
+                while len(next_population) < config.population_size:
+                    parent_a = self._tournament(population, fitness)
+                    if self.rng.random() < config.crossover_rate:
+                        child = self._crossover(parent_a, self._tournament(population, fitness))
+                    else:
+                        child = parent_a
+                    next_population.append(self._mutate(child, config.mutation_rate))
+                population = next_population
+
+            fitness = self._evaluate(population, pool)
+        finally:
+            if pool is not None:
+                pool.shutdown()
+
+        best = int(np.argmax(fitness))
+        best_plan = population[best]
+        return SearchResult(
+            best_plan=best_plan,
+            best_fitness=float(fitness[best]),
+            best_actions=decode_plan(best_plan, self.routes, self.base_frequencies),
+            history=history,
+            evaluations=len(self.fitness_cache),
+            simulated_quarters=self.simulated_quarters
+        )
@@ -0,0 +1,191 @@
+"""
+Content-addressed on-disk cache of full simulation runs.
+
+A run is identified by a SHA-256 digest of its inputs: the initial fleet,
+route network and financial model state, the attached models (O&D demand,
+seasonality, revenue management, maintenance, crew) including their random
+generator state, the canonicalized action plan for the quarters actually
+simulated, the quarter count, an optional seed and the model version
+(``MODEL_VERSION`` plus a digest of the model sources, so editing the
+economics invalidates old entries). Identical runs map to the
+same key however the plan dict was written. Runs whose state cannot be
+reduced to a key bypass the cache.
+
+Entries are gzip-compressed JSON report lists, sharded by key prefix. Hits
+refresh an entry's mtime and the cache evicts least recently used entries
+once it grows past ``max_bytes``.
+"""
+import dataclasses
+import gzip
+import hashlib
+import json
+import os
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+import numpy as np
+from scipy import sparse
+
+from models.actions import ActionPlan
+from simulation import MODEL_VERSION, BimanSimulation, quarter_label
+
+ENTRY_SUFFIX = '.json.gz'
+_SOURCE_ROOT = Path(__file__).resolve().parent
+_MODEL_SOURCES = ('simulation.py', 'models')
+
+def canonicalize(value: Any) -> Any:
+    """Reduce a value to plain JSON types with a stable ordering."""
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return {f.name: canonicalize(getattr(value, f.name)) for f in dataclasses.fields(value)}
+    if isinstance(value, dict):
+        return {str(k): canonicalize(v) for k, v in sorted(value.items(), key=lambda item: str(item[0]))}
+    if isinstance(value, (list, tuple, deque)):
+        return [canonicalize(v) for v in value]
+    if isinstance(value, (set, frozenset)):
+        return sorted(canonicalize(v) for v in value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.random.Generator):
+        return {'__class__': 'Generator', 'state': canonicalize(value.bit_generator.state)}
+    if sparse.issparse(value):
+        coo = value.tocoo()
+        order = np.lexsort((coo.col, coo.row))
+        return {'__class__': 'sparse', 'shape': list(coo.shape), 'row': coo.row[order].tolist(),
+                'col': coo.col[order].tolist(), 'data': coo.data[order].tolist()}
+    if isinstance(value, np.generic):
+        return value.item()
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    if hasattr(value, 'cache_state'):
+        return {'__class__': type(value).__name__, **canonicalize(value.cache_state())}
+    if hasattr(value, '__dict__'):
+        return {'__class__': type(value).__name__,
+                **canonicalize({k: v for k, v in vars(value).items() if not k.startswith('_')})}
+    raise TypeError(f"Cannot canonicalize {type(value).__name__} for a cache key")
+
+_source_digest: Optional[str] = None
+
+def model_version() -> str:
+    """``MODEL_VERSION`` combined with a digest of the simulation sources."""
+    global _source_digest
+    if _source_digest is None:
+        digest = hashlib.sha256()
+        for name in _MODEL_SOURCES:
+            path = _SOURCE_ROOT / name
+            for source in sorted(path.glob('*.py')) if path.is_dir() else [path]:
+                digest.update(source.name.encode('utf-8'))
+                digest.update(source.read_bytes())
+        _source_digest = digest.hexdigest()[:16]
+    return f"{MODEL_VERSION}-{_source_digest}"
+
+class ResultCache:
+    """On-disk cache of ``run_simulation`` reports keyed by a hash of the run inputs."""
+
+    def __init__(self, cache_dir: Union[str, Path] = '.sim_cache', max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, simulation: BimanSimulation, quarters: int,
+            actions_by_quarter: Union[Dict[str, Dict], ActionPlan], seed: Optional[int] = None) -> Optional[str]:
+        """Hash the initial simulation state and run parameters into a cache key.
+
+        Returns None when some of the state cannot be canonicalized.
+        """
+        if not isinstance(actions_by_quarter, ActionPlan):
+            actions_by_quarter = ActionPlan(actions_by_quarter)
+        # Only quarters that are simulated affect the result
+        plan = [actions_by_quarter.get(quarter_label(i)).ops for i in range(quarters)]
+        inputs = {
+            'model_version': model_version(),
+            'quarters': quarters,
+            'seed': seed,
+            'fleet': simulation.fleet,
+            'route_network': simulation.route_network,
+            'financial_model': simulation.financial_model,
+            'action_log': simulation.action_log,
+            'od_demand': simulation.od_demand,
+            'seasonality': simulation.seasonality,
+            'revenue_management': simulation.revenue_management,
+            'maintenance': simulation.maintenance,
+            'crew': simulation.crew,
+            'plan': plan,
+        }
+        try:
+            encoded = json.dumps(canonicalize(inputs), sort_keys=True, separators=(',', ':'))
+        except TypeError:
+            return None
+        return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}{ENTRY_SUFFIX}"
+
+    def get(self, key: str) -> Optional[List[Dict]]:
+        """Get cached reports for a key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                reports = json.load(f)
+        except (FileNotFoundError, OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)  # mark as recently used
+        self.hits += 1
+        return reports
+
+    def put(self, key: str, reports: List[Dict]):
+        """Store reports under a key and evict old entries beyond the size budget."""
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + '.tmp')
+        with gzip.open(tmp_path, 'wt', encoding='utf-8') as f:
+            json.dump(reports, f)
+        os.replace(tmp_path, path)
+        self.evict()
+
+    def evict(self):
+        """Delete least recently used entries until the cache fits in ``max_bytes``."""
+        entries = []
+        for path in self.cache_dir.glob(f'*/*{ENTRY_SUFFIX}'):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def size(self) -> int:
+        """Total bytes used by cache entries."""
+        return sum(path.stat().st_size for path in self.cache_dir.glob(f'*/*{ENTRY_SUFFIX}'))
+
+    def run(self, simulation: BimanSimulation, quarters: int,
+            actions_by_quarter: Union[Dict[str, Dict], ActionPlan],
+            seed: Optional[int] = None) -> List[Dict]:
+        """Run a simulation through the cache.
+
+        On a hit the stored reports are saved and passed to report listeners
+        as a normal run would; the simulation's model state is left at its
+        initial values. On a miss the simulation runs and its reports are
+        stored.
+        """
+        key = self.key(simulation, quarters, actions_by_quarter, seed)
+        if key is None:
+            simulation.logger.info("Result cache bypassed: simulation state has no cache key")
+            return simulation.run_simulation(quarters, actions_by_quarter)
+        reports = self.get(key)
+        if reports is not None:
+            simulation.logger.info("Result cache hit %s (%d quarters)", key[:12], len(reports))
+            for report in reports:
+                simulation.save_report(report)
+                for listener in simulation.report_listeners:
+                    listener(report)
+            return reports
+        reports = simulation.run_simulation(quarters, actions_by_quarter)
+        self.put(key, reports)
+        return reports
@@ -0,0 +1,195 @@
+"""
+Pluggable destinations for quarterly simulation reports.
+
+Each ``BimanSimulation`` writes its reports to a ``ResultSink`` chosen per
+instance, tagged with the instance's run id:
+
+* ``DirectorySink`` - one JSON file per quarter (the original ``reports/``
+  layout), optionally in a sub-directory per run;
+* ``MemorySink`` - reports kept in memory per run, for in-process batches;
+* ``ColumnarSink`` - flattened quarter and route tables written as ``.npz``
+  (or ``.parquet`` when pyarrow is installed);
+* ``SQLiteSink`` - one row per report in a SQLite database, safe to share
+  between threads and processes.
+
+All sinks are thread-safe, so many simulations can share one sink in a
+thread pool. For process pools use one ``DirectorySink``/``SQLiteSink``
+destination shared by all workers, or one ``ColumnarSink`` path per worker.
+"""
+import json
+import os
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Tuple, Union
+import numpy as np
+
+# Sections of a report flattened into columns of the quarter table
+QUARTER_SECTIONS = ('key_metrics', 'fleet_status', 'financial_summary')
+ROUTE_TOTALS = ('total_revenue', 'total_cost')
+
+def flatten_report(report: Dict) -> Tuple[Dict, List[Dict]]:
+    """Flatten a report into one quarter row and one row per route."""
+    row = {'quarter': report['quarter']}
+    for section in QUARTER_SECTIONS:
+        for name, value in report.get(section, {}).items():
+            row[f'{section}.{name}'] = value
+    route_performance = report.get('route_performance', {})
+    for name in ROUTE_TOTALS:
+        row[f'route_performance.{name}'] = route_performance.get(name, 0.0)
+    for name, value in route_performance.get('cost_breakdown', {}).items():
+        row[f'cost_breakdown.{name}'] = value
+    routes = [{'quarter': report['quarter'], 'route': route, **details}
+              for route, details in route_performance.get('route_details', {}).items()]
+    return row, routes
+
+class ResultSink(ABC):
+    """Destination for quarterly reports."""
+
+    @abstractmethod
+    def write(self, run_id: str, report: Dict):
+        """Store one quarterly report of a run."""
+
+    def close(self):
+        """Flush buffered reports and release resources."""
+
+    def __enter__(self) -> 'ResultSink':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+class DirectorySink(ResultSink):
+    """JSON file per quarter in ``directory`` (or ``directory/<run_id>`` with ``per_run``)."""
+
+    def __init__(self, directory: Union[str, Path] = 'reports', per_run: bool = False):
+        self.directory = Path(directory)
+        self.per_run = per_run
+
+    def path(self, run_id: str, quarter: str) -> Path:
+        directory = self.directory / run_id if self.per_run else self.directory
+        return directory / f'{quarter}_report.json'
+
+    def write(self, run_id: str, report: Dict):
+        path = self.path(run_id, report['quarter'])
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp name so concurrent writers never share a partial file
+        tmp_path = path.with_name(f'.{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(report, f, indent=2)
+        os.replace(tmp_path, path)
+
+class MemorySink(ResultSink):
+    """Reports kept in memory, per run, in the order they were written."""
+
+    def __init__(self):
+        self.reports: Dict[str, List[Dict]] = {}
+        self._lock = threading.Lock()
+
+    def write(self, run_id: str, report: Dict):
+        with self._lock:
+            self.reports.setdefault(run_id, []).append(report)
+
+    def get(self, run_id: str) -> List[Dict]:
+        """Reports of one run."""
+        with self._lock:
+            return list(self.reports.get(run_id, []))
+
+class ColumnarSink(ResultSink):
+    """Quarter and route tables buffered in memory and written as columns on close.
+
+    ``path`` ending in ``.npz`` stores arrays named ``quarters.<column>`` and
+    ``routes.<column>`` in one numpy archive; ``.parquet`` writes
+    ``<stem>_quarters.parquet`` and ``<stem>_routes.parquet`` with pandas.
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        if self.path.suffix not in ('.npz', '.parquet'):
+            raise ValueError(f"Columnar sink path must end in .npz or .parquet: {path}")
+        self.quarters: List[Dict] = []
+        self.routes: List[Dict] = []
+        self._sequence: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def write(self, run_id: str, report: Dict):
+        row, routes = flatten_report(report)
+        with self._lock:
+            seq = self._sequence.get(run_id, 0)
+            self._sequence[run_id] = seq + 1
+            self.quarters.append({'run_id': run_id, 'seq': seq, **row})
+            self.routes.extend({'run_id': run_id, 'seq': seq, **route} for route in routes)
+
+    @staticmethod
+    def _columns(rows: List[Dict]) -> Dict[str, np.ndarray]:
+        names = list(dict.fromkeys(name for row in rows for name in row))
+        columns = {}
+        for name in names:
+            values = [row.get(name) for row in rows]
+            if all(isinstance(v, (int, float)) and not isinstance(v, bool) or v is None for v in values):
+                columns[name] = np.array([np.nan if v is None else v for v in values], dtype=float)
+            else:
+                columns[name] = np.array(['' if v is None else str(v) for v in values])
+        return columns
+
+    def close(self):
+        with self._lock:
+            quarters, routes = self._columns(self.quarters), self._columns(self.routes)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.suffix == '.npz':
+            arrays = {f'quarters.{k}': v for k, v in quarters.items()}
+            arrays.update({f'routes.{k}': v for k, v in routes.items()})
+            np.savez_compressed(self.path, **arrays)
+        else:
+            import pandas as pd
+            stem = self.path.with_suffix('')
+            pd.DataFrame(quarters).to_parquet(f'{stem}_quarters.parquet', index=False)
+            pd.DataFrame(routes).to_parquet(f'{stem}_routes.parquet', index=False)
+
+class SQLiteSink(ResultSink):
+    """One row per report in a SQLite database (WAL mode, shared across threads and processes)."""
+
+    SCHEMA = '''
+        CREATE TABLE IF NOT EXISTS reports (
+            run_id TEXT NOT NULL,
+            seq INTEGER NOT NULL,
+            quarter TEXT NOT NULL,
+            report TEXT NOT NULL,
+            PRIMARY KEY (run_id, seq)
+        )
+    '''
+
+    def __init__(self, path: Union[str, Path] = 'reports.sqlite', timeout: float = 30.0):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(str(self.path), timeout=timeout, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        with self._connection:
+            self._connection.execute(self.SCHEMA)
+
+    def write(self, run_id: str, report: Dict):
+        payload = json.dumps(report)
+        with self._lock, self._connection:
+            self._connection.execute(
+                'INSERT INTO reports (run_id, seq, quarter, report) VALUES '
+                '(?, (SELECT COUNT(*) FROM reports WHERE run_id = ?), ?, ?)',
+                (run_id, run_id, report['quarter'], payload)
+            )
+
+    def read(self, run_id: str) -> List[Dict]:
+        """Reports of one run, in the order they were written."""
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT report FROM reports WHERE run_id = ? ORDER BY seq', (run_id,)
+            ).fetchall()
+        return [json.loads(payload) for (payload,) in rows]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+def default_sink() -> ResultSink:
+    """The original layout: ``reports/<quarter>_report.json`` in the working directory."""
+    return DirectorySink('reports')
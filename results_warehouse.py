@@ -0,0 +1,289 @@
+"""
+Embedded SQLite warehouse of simulation results.
+
+Reports are normalized into runs, quarters, key metrics, fleet status and
+route details, keyed by ``(run_id, seq)`` where ``seq`` is the quarter's
+position in its run (quarter labels alone are not unique within long runs).
+Route details are indexed on ``(run_id, seq, route)`` and on
+``(route, run_id, seq)`` so dashboards can pull a single route, run or
+quarter slice across thousands of runs without loading whole reports.
+
+The warehouse is also a ``ResultSink``, so simulations can write to it
+directly; ``ingest`` and ``ingest_directory`` load existing reports in bulk,
+one transaction per call.
+"""
+import json
+import re
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+import pandas as pd
+
+from result_sinks import ResultSink
+
+KEY_METRICS = ('operating_margin', 'roic', 'cash_burn_rate', 'debt_to_equity')
+FLEET_STATUS = ('total_aircraft', 'active_aircraft', 'maintenance_aircraft',
+                'grounded_aircraft', 'average_utilization')
+ROUTE_DETAILS = ('revenue', 'cost', 'profit', 'load_factor', 'break_even_load_factor')
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    label TEXT,
+    created_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS quarters (
+    run_id TEXT NOT NULL REFERENCES runs(run_id),
+    seq INTEGER NOT NULL,
+    quarter TEXT NOT NULL,
+    total_revenue REAL,
+    total_cost REAL,
+    cost_breakdown TEXT,
+    financial_summary TEXT,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE INDEX IF NOT EXISTS quarters_by_label ON quarters (quarter, run_id);
+CREATE TABLE IF NOT EXISTS key_metrics (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    operating_margin REAL,
+    roic REAL,
+    cash_burn_rate REAL,
+    debt_to_equity REAL,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE TABLE IF NOT EXISTS fleet_status (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    total_aircraft INTEGER,
+    active_aircraft INTEGER,
+    maintenance_aircraft INTEGER,
+    grounded_aircraft INTEGER,
+    average_utilization REAL,
+    PRIMARY KEY (run_id, seq)
+);
+CREATE TABLE IF NOT EXISTS route_details (
+    run_id TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    route TEXT NOT NULL,
+    revenue REAL,
+    cost REAL,
+    profit REAL,
+    load_factor REAL,
+    break_even_load_factor REAL,
+    PRIMARY KEY (run_id, seq, route)
+);
+CREATE INDEX IF NOT EXISTS route_details_by_route ON route_details (route, run_id, seq);
+'''
+
+_QUARTER_LABEL = re.compile(r'^(\d{4})-Q([1-4])')
+
+def quarter_sort_key(label: str) -> Tuple[int, int, str]:
+    """Chronological sort key for 'YYYY-Qn' labels (other labels sort last)."""
+    match = _QUARTER_LABEL.match(label)
+    if match:
+        return int(match.group(1)), int(match.group(2)), label
+    return 10 ** 6, 0, label
+
+def _where(filters: Sequence[Tuple[str, Optional[Iterable]]]) -> Tuple[str, List]:
+    """Build a WHERE clause of ``column IN (...)`` filters, skipping None."""
+    clauses, params = [], []
+    for column, values in filters:
+        if values is None:
+            continue
+        values = [values] if isinstance(values, (str, int)) else list(values)
+        clauses.append(f"{column} IN ({', '.join('?' * len(values))})")
+        params.extend(values)
+    return (' WHERE ' + ' AND '.join(clauses)) if clauses else '', params
+
+class ResultsWarehouse(ResultSink):
+    """SQLite store of runs and their quarterly reports with a slice query API."""
+
+    def __init__(self, path: Union[str, Path] = 'results.sqlite', timeout: float = 30.0):
+        self.path = str(path)
+        if self.path != ':memory:':
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, timeout=timeout, check_same_thread=False)
+        if self.path != ':memory:':
+            self._connection.execute('PRAGMA journal_mode=WAL')
+        with self._connection:
+            self._connection.executescript(SCHEMA)
+
+    # Ingest -------------------------------------------------------------
+
+    def _insert(self, run_id: str, seq: int, report: Dict):
+        route_performance = report.get('route_performance', {})
+        key_metrics = report.get('key_metrics', {})
+        fleet_status = report.get('fleet_status', {})
+        execute = self._connection.execute
+        execute('INSERT OR REPLACE INTO quarters VALUES (?, ?, ?, ?, ?, ?, ?)', (
+            run_id, seq, report['quarter'],
+            route_performance.get('total_revenue'), route_performance.get('total_cost'),
+            json.dumps(route_performance.get('cost_breakdown', {})),
+            json.dumps(report.get('financial_summary', {}))
+        ))
+        execute('INSERT OR REPLACE INTO key_metrics VALUES (?, ?, ?, ?, ?, ?)',
+                (run_id, seq, *(key_metrics.get(name) for name in KEY_METRICS)))
+        execute('INSERT OR REPLACE INTO fleet_status VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (run_id, seq, *(fleet_status.get(name) for name in FLEET_STATUS)))
+        self._connection.executemany(
+            'INSERT OR REPLACE INTO route_details VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            [(run_id, seq, route, *(details.get(name) for name in ROUTE_DETAILS))
+             for route, details in route_performance.get('route_details', {}).items()]
+        )
+
+    def _ensure_run(self, run_id: str, label: Optional[str] = None):
+        self._connection.execute(
+            'INSERT OR IGNORE INTO runs (run_id, label, created_at) VALUES (?, ?, ?)',
+            (run_id, label, datetime.now().isoformat(timespec='seconds'))
+        )
+
+    def _next_seq(self, run_id: str) -> int:
+        (seq,) = self._connection.execute(
+            'SELECT COALESCE(MAX(seq) + 1, 0) FROM quarters WHERE run_id = ?', (run_id,)
+        ).fetchone()
+        return seq
+
+    def write(self, run_id: str, report: Dict):
+        """Append one quarterly report to a run (ResultSink interface)."""
+        with self._lock, self._connection:
+            self._ensure_run(run_id)
+            self._insert(run_id, self._next_seq(run_id), report)
+
+    def ingest(self, run_id: str, reports: Iterable[Dict], label: Optional[str] = None) -> int:
+        """Replace a run's quarters with ``reports`` (in run order) in one transaction."""
+        with self._lock, self._connection:
+            for table in ('quarters', 'key_metrics', 'fleet_status', 'route_details'):
+                self._connection.execute(f'DELETE FROM {table} WHERE run_id = ?', (run_id,))
+            self._connection.execute('DELETE FROM runs WHERE run_id = ?', (run_id,))
+            self._ensure_run(run_id, label)
+            count = 0
+            for seq, report in enumerate(reports):
+                self._insert(run_id, seq, report)
+                count += 1
+        return count
+
+    def ingest_directory(self, reports_dir: Union[str, Path] = 'reports', run_id: Optional[str] = None) -> str:
+        """Load ``*_report.json`` files as one run, ordered chronologically by quarter label."""
+        reports_dir = Path(reports_dir)
+        run_id = run_id or reports_dir.name
+        files = sorted(reports_dir.glob('*_report.json'),
+                       key=lambda path: quarter_sort_key(path.name[:-len('_report.json')]))
+
+        def load():
+            for path in files:
+                with open(path, 'r') as f:
+                    yield json.load(f)
+
+        self.ingest(run_id, load(), label=str(reports_dir))
+        return run_id
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    # Queries ------------------------------------------------------------
+
+    def query(self, sql: str, params: Sequence = ()) -> pd.DataFrame:
+        """Run a read query and return a DataFrame."""
+        with self._lock:
+            return pd.read_sql_query(sql, self._connection, params=list(params))
+
+    def runs(self) -> pd.DataFrame:
+        """All runs with their quarter counts."""
+        return self.query(
+            'SELECT r.run_id, r.label, r.created_at, COUNT(q.seq) AS quarters '
+            'FROM runs r LEFT JOIN quarters q ON q.run_id = r.run_id '
+            'GROUP BY r.run_id ORDER BY r.created_at, r.run_id'
+        )
+
+    def _slice(self, table: str, columns: Sequence[str], run_ids, seqs,
+               extra: Sequence[Tuple[str, Optional[Iterable]]] = ()) -> pd.DataFrame:
+        where, params = _where([('t.run_id', run_ids), ('t.seq', seqs), *extra])
+        return self.query(
+            f"SELECT t.run_id, t.seq, q.quarter, {', '.join('t.' + c for c in columns)} "
+            f"FROM {table} t JOIN quarters q ON q.run_id = t.run_id AND q.seq = t.seq"
+            f"{where} ORDER BY t.run_id, t.seq", params
+        )
+
+    def key_metrics(self, run_ids=None, seqs=None) -> pd.DataFrame:
+        """Key metrics per run and quarter."""
+        return self._slice('key_metrics', KEY_METRICS, run_ids, seqs)
+
+    def fleet_status(self, run_ids=None, seqs=None) -> pd.DataFrame:
+        """Fleet status per run and quarter."""
+        return self._slice('fleet_status', FLEET_STATUS, run_ids, seqs)
+
+    def route_details(self, run_ids=None, seqs=None, routes=None) -> pd.DataFrame:
+        """Route details per run, quarter and route."""
+        frame = self._slice('route_details', ('route',) + ROUTE_DETAILS, run_ids, seqs,
+                            [('t.route', routes)])
+        return frame.sort_values(['run_id', 'seq', 'route'], kind='stable').reset_index(drop=True)
+
+    def metric_distribution(self, metric: str, run_ids=None) -> pd.DataFrame:
+        """Mean, min, max and count of a key metric per quarter position across runs."""
+        if metric not in KEY_METRICS:
+            raise ValueError(f"Unknown key metric: {metric}")
+        where, params = _where([('run_id', run_ids)])
+        return self.query(
+            f'SELECT seq, AVG({metric}) AS mean, MIN({metric}) AS min, MAX({metric}) AS max, '
+            f'COUNT(*) AS runs FROM key_metrics{where} GROUP BY seq ORDER BY seq', params
+        )
+
+    def latest_quarter(self, run_id: str) -> Optional[Tuple[int, str]]:
+        """``(seq, quarter)`` of the last quarter of a run, or None if it has none."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT seq, quarter FROM quarters WHERE run_id = ? ORDER BY seq DESC LIMIT 1', (run_id,)
+            ).fetchone()
+        return tuple(row) if row else None
+
+    def latest_run(self) -> Optional[str]:
+        """Most recently created run with at least one quarter."""
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT r.run_id FROM runs r WHERE EXISTS (SELECT 1 FROM quarters q WHERE q.run_id = r.run_id) '
+                'ORDER BY r.created_at DESC, r.rowid DESC LIMIT 1'
+            ).fetchone()
+        return row[0] if row else None
+
+    def reports(self, run_id: str, seqs=None) -> List[Dict]:
+        """Rebuild report dicts for a run (in order) from the normalized tables."""
+        quarters = self._slice('quarters', ('total_revenue', 'total_cost', 'cost_breakdown',
+                                            'financial_summary'), run_id, seqs)
+        metrics = self.key_metrics(run_id, seqs).set_index('seq')
+        fleet = self.fleet_status(run_id, seqs).set_index('seq')
+        routes = self.route_details(run_id, seqs)
+        route_groups = {seq: group for seq, group in routes.groupby('seq')}
+
+        reports = []
+        for row in quarters.itertuples(index=False):
+            group = route_groups.get(row.seq)
+            route_details = {} if group is None else {
+                r.route: {name: getattr(r, name) for name in ROUTE_DETAILS}
+                for r in group.itertuples(index=False)
+            }
+            reports.append({
+                'quarter': row.quarter,
+                'financial_summary': json.loads(row.financial_summary),
+                'route_performance': {
+                    'total_revenue': row.total_revenue,
+                    'total_cost': row.total_cost,
+                    'route_details': route_details,
+                    'cost_breakdown': json.loads(row.cost_breakdown),
+                },
+                'fleet_status': {name: fleet.at[row.seq, name].item() for name in FLEET_STATUS},
+                'key_metrics': {name: metrics.at[row.seq, name].item() for name in KEY_METRICS},
+            })
+        return reports
+
+    def latest_report(self, run_id: Optional[str] = None) -> Dict:
+        """The last quarter's report of a run (the latest run by default), or {}."""
+        run_id = run_id or self.latest_run()
+        latest = self.latest_quarter(run_id) if run_id else None
+        if latest is None:
+            return {}
+        return self.reports(run_id, seqs=[latest[0]])[0]
@@ -0,0 +1,190 @@
+"""
+Queue-based, per-run logging for simulations.
+
+Every ``BimanSimulation`` logs through a ``RunLogger``: a ``LoggerAdapter``
+with its own level that tags records with the instance's ``run_id``. Records
+go onto one in-process queue through a ``QueueHandler`` that does not format
+them, so a log call costs the caller a level check and an enqueue. A single
+``QueueListener`` thread per process formats the records and routes them by
+``run_id`` to that run's destinations: a log file (one shared handler per
+path, however many runs write to it) and/or the console.
+
+All handler state lives on the listener thread. Opening and closing a run's
+routes are queued as control records, so closing a run only happens after
+its earlier records have been written.
+"""
+import atexit
+import itertools
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import weakref
+from typing import Dict, List, Optional, Tuple
+
+LOGGER_NAME = 'BimanSimulation'
+LOG_FORMAT = '%(asctime)s - %(name)s - %(run_id)s - %(levelname)s - %(message)s'
+
+_OPEN = 'open'
+_CLOSE = 'close'
+_run_ids = itertools.count(1)
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Enqueue records as-is; message formatting happens on the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+class _RunRouter(logging.Handler):
+    """Listener-side handler that dispatches records to per-run destinations."""
+
+    def __init__(self):
+        super().__init__()
+        self.formatter = logging.Formatter(LOG_FORMAT)
+        self.routes: Dict[str, List[logging.Handler]] = {}
+        self.files: Dict[str, Tuple[logging.FileHandler, int]] = {}  # path -> (handler, runs using it)
+        self.console = logging.StreamHandler()
+        self.console.setFormatter(self.formatter)
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        control = getattr(record, 'route_control', None)
+        if control == _OPEN:
+            self._open(record.run_id, record.log_file, record.console)
+        elif control == _CLOSE:
+            self._close(record.run_id)
+        else:
+            for handler in self.routes.get(getattr(record, 'run_id', None), ()):
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+        return True
+
+    def _open(self, run_id: str, log_file: Optional[str], console: bool):
+        handlers = []
+        if log_file:
+            path = os.path.abspath(log_file)
+            handler, users = self.files.get(path, (None, 0))
+            if handler is None:
+                handler = logging.FileHandler(path)
+                handler.setFormatter(self.formatter)
+            self.files[path] = (handler, users + 1)
+            handlers.append(handler)
+        if console:
+            handlers.append(self.console)
+        self.routes[run_id] = handlers
+
+    def _close(self, run_id: str):
+        for handler in self.routes.pop(run_id, ()):
+            if isinstance(handler, logging.FileHandler):
+                path = handler.baseFilename
+                _, users = self.files[path]
+                if users > 1:
+                    self.files[path] = (handler, users - 1)
+                else:
+                    del self.files[path]
+                    handler.close()
+            else:
+                handler.flush()
+
+    def close(self):
+        for handler, _ in self.files.values():
+            handler.close()
+        self.files.clear()
+        self.routes.clear()
+        super().close()
+
+class _LogHub:
+    """Process-wide queue, listener thread and router."""
+
+    def __init__(self):
+        self.queue: queue.SimpleQueue = queue.SimpleQueue()
+        self.handler = _DeferredQueueHandler(self.queue)
+        self.router = _RunRouter()
+        self.listener = logging.handlers.QueueListener(self.queue, self.router)
+        self.listener.start()
+
+        logger = logging.getLogger(LOGGER_NAME)
+        logger.setLevel(logging.DEBUG)  # per-run levels are applied by RunLogger
+        logger.propagate = False
+        for handler in list(logger.handlers):
+            if isinstance(handler, _DeferredQueueHandler):
+                logger.removeHandler(handler)
+        logger.addHandler(self.handler)
+        self.logger = logger
+
+    def control(self, action: str, run_id: str, **fields):
+        record = logging.LogRecord(LOGGER_NAME, logging.DEBUG, __file__, 0, action, None, None)
+        record.route_control = action
+        record.run_id = run_id
+        record.__dict__.update(fields)
+        self.queue.put_nowait(record)
+
+    def stop(self):
+        self.listener.stop()  # drains the queue first
+        self.router.close()
+
+_hub: Optional[_LogHub] = None
+_hub_lock = threading.Lock()
+
+def _get_hub() -> _LogHub:
+    global _hub
+    if _hub is None:
+        with _hub_lock:
+            if _hub is None:
+                _hub = _LogHub()
+    return _hub
+
+def _forget_hub():
+    """Forked children start with their own hub; the parent's listener thread is not inherited."""
+    global _hub, _hub_lock
+    _hub = None
+    _hub_lock = threading.Lock()
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_forget_hub)
+
+@atexit.register
+def shutdown():
+    """Flush and stop the listener thread (also run at interpreter exit)."""
+    global _hub
+    if _hub is not None:
+        _hub.stop()
+        _hub = None
+
+class RunLogger(logging.LoggerAdapter):
+    """Logger for one simulation run with its own level and destinations."""
+
+    def __init__(self, hub: _LogHub, run_id: str, level: int):
+        super().__init__(hub.logger, {'run_id': run_id})
+        self.run_id = run_id
+        self.level = level
+        self._finalizer = weakref.finalize(self, hub.control, _CLOSE, run_id)
+
+    def setLevel(self, level):
+        """Set this run's level without affecting other runs."""
+        self.level = logging._checkLevel(level)
+
+    def getEffectiveLevel(self) -> int:
+        return self.level
+
+    def isEnabledFor(self, level: int) -> bool:
+        return level >= self.level
+
+    def process(self, msg, kwargs):
+        kwargs['extra'] = {**self.extra, **kwargs.get('extra', {})}
+        return msg, kwargs
+
+    def close(self):
+        """Flush this run's records and release its log file."""
+        self._finalizer()
+
+def get_run_logger(run_id: Optional[str] = None, log_file: Optional[str] = None,
+                   console: bool = False, level: int = logging.INFO) -> RunLogger:
+    """Create a run logger routed to ``log_file`` and/or the console.
+
+    The route is released when the logger is closed or garbage collected.
+    """
+    hub = _get_hub()
+    run_id = run_id or f'run-{os.getpid()}-{next(_run_ids)}'
+    hub.control(_OPEN, run_id, log_file=log_file, console=console)
+    return RunLogger(hub, run_id, level)
@@ -0,0 +1,256 @@
+"""
+Shared-memory worker pool for scenario batches.
+
+Route parameters and fleet attributes are packed once into a
+``multiprocessing.shared_memory`` block as one column per numeric field.
+Workers attach read-only, zero-copy views of those columns at startup, so
+per-worker memory and start-up cost do not grow with the network. A scenario
+only names the values it changes::
+
+    {'routes': {'DAC-DXB': {'frequency': 10}, 'DAC-LHR': {'load_factor': 0.8}},
+     'fleet': {'S2-1': {'status': 'grounded'}}}
+
+A worker copies just the columns a scenario overrides, evaluates the quarter's
+route economics (same formulas as ``BimanSimulation._calculate_route_performance``)
+and writes its rows into a shared ``(n_scenarios, n_routes)`` result block.
+The results can be fed straight into ``BatchedFinancialModel``.
+"""
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, fields
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+
+from models.aircraft import Aircraft
+from models.fleet import Fleet
+from models.route import Route, RouteNetwork
+from simulation import WEEKS_PER_QUARTER
+
+# Numeric Route fields stored as shared columns
+ROUTE_COLUMNS = tuple(f.name for f in fields(Route) if f.type in (int, float))
+# Numeric Aircraft fields stored as shared columns, plus an active flag
+FLEET_COLUMNS = tuple(f.name for f in fields(Aircraft) if f.type in (int, float)) + ('active',)
+# Per-flight fixed costs, in the order Route.calculate_operating_cost adds them
+FIXED_COST_COLUMNS = ('ground_handling_cost', 'airport_charges', 'crew_cost',
+                      'maintenance_cost', 'marketing_cost', 'other_costs')
+RESULT_COLUMNS = ('revenue', 'cost', 'profit', 'fuel_cost')
+
+@dataclass(frozen=True)
+class ArraySpec:
+    """Location of one array inside a shared memory block."""
+    name: str
+    dtype: str
+    shape: Tuple[int, ...]
+    offset: int
+
+@dataclass(frozen=True)
+class BlockSpec:
+    """Picklable description of a shared block, used to attach from another process."""
+    shm_name: str
+    arrays: Tuple[ArraySpec, ...]
+
+def _attach_shm(name: str) -> shared_memory.SharedMemory:
+    """Attach to an existing block; only the creating process unlinks it.
+
+    Pool workers share the parent's resource tracker, so attaching there
+    does not add a second owner.
+    """
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    return shared_memory.SharedMemory(name=name)
+
+class SharedArrays:
+    """Named numpy arrays laid out in a single shared memory block."""
+
+    def __init__(self, shm: shared_memory.SharedMemory, spec: BlockSpec, owner: bool, readonly: bool):
+        self.shm = shm
+        self.spec = spec
+        self.owner = owner
+        self.arrays: Dict[str, np.ndarray] = {}
+        for item in spec.arrays:
+            view = np.ndarray(item.shape, dtype=item.dtype, buffer=shm.buf, offset=item.offset)
+            if readonly:
+                view.flags.writeable = False
+            self.arrays[item.name] = view
+
+    @classmethod
+    def create(cls, arrays: Dict[str, np.ndarray]) -> 'SharedArrays':
+        """Allocate a block and copy ``arrays`` into it (8-byte aligned)."""
+        specs, offset = [], 0
+        for name, array in arrays.items():
+            array = np.ascontiguousarray(array)
+            specs.append(ArraySpec(name, array.dtype.str, array.shape, offset))
+            offset += -(-array.nbytes // 8) * 8
+        shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        shared = cls(shm, BlockSpec(shm.name, tuple(specs)), owner=True, readonly=False)
+        for name, array in arrays.items():
+            shared.arrays[name][...] = array
+        return shared
+
+    @classmethod
+    def attach(cls, spec: BlockSpec, readonly: bool = True) -> 'SharedArrays':
+        """Attach views of a block created in another process."""
+        return cls(_attach_shm(spec.shm_name), spec, owner=False, readonly=readonly)
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.arrays[name]
+
+    def close(self):
+        """Release this process's views; the owner also frees the block."""
+        self.arrays = {}
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+def pack_network(route_network: RouteNetwork, fleet: Fleet) -> Tuple[Dict[str, np.ndarray], Dict]:
+    """Lay out routes and fleet as column arrays plus the small index needed to address them."""
+    route_keys = list(route_network.routes)
+    routes = list(route_network.routes.values())
+    types = sorted({route.aircraft_type for route in routes} | {a.type for a in fleet.aircraft})
+    type_index = {aircraft_type: i for i, aircraft_type in enumerate(types)}
+
+    arrays = {f'route.{name}': np.array([getattr(r, name) for r in routes], dtype=float)
+              for name in ROUTE_COLUMNS}
+    arrays['route.type_index'] = np.array([type_index[r.aircraft_type] for r in routes], dtype=np.int32)
+    for name in FLEET_COLUMNS:
+        if name == 'active':
+            values = [a.status == 'active' for a in fleet.aircraft]
+        else:
+            values = [getattr(a, name) for a in fleet.aircraft]
+        arrays[f'fleet.{name}'] = np.array(values, dtype=float)
+    arrays['fleet.type_index'] = np.array([type_index[a.type] for a in fleet.aircraft], dtype=np.int32)
+
+    index = {
+        'routes': {key: i for i, key in enumerate(route_keys)},
+        'fleet': {a.registration: i for i, a in enumerate(fleet.aircraft)},
+        'n_types': len(types),
+    }
+    return arrays, index
+
+def _override(column: np.ndarray, positions: List[int], values: List[float]) -> np.ndarray:
+    """Copy a shared column and apply one scenario's changes to the copy."""
+    column = column.copy()
+    column[positions] = values
+    return column
+
+def _scenario_columns(shared: SharedArrays, index: Dict, scenario: Dict) -> Dict[str, np.ndarray]:
+    """Shared views for every column, with copies only for the columns a scenario changes."""
+    columns = dict(shared.arrays)
+    for group, field_names in (('routes', ROUTE_COLUMNS), ('fleet', FLEET_COLUMNS)):
+        prefix = 'route' if group == 'routes' else 'fleet'
+        changes: Dict[str, Tuple[List[int], List[float]]] = {}
+        for key, modifications in scenario.get(group, {}).items():
+            if key not in index[group]:
+                raise ValueError(f"Unknown {prefix} in scenario: {key}")
+            for name, value in modifications.items():
+                if name == 'status' and group == 'fleet':
+                    name, value = 'active', value == 'active'
+                if name not in field_names:
+                    raise ValueError(f"Scenario cannot change {prefix} attribute: {name}")
+                positions, values = changes.setdefault(name, ([], []))
+                positions.append(index[group][key])
+                values.append(float(value))
+        for name, (positions, values) in changes.items():
+            columns[f'{prefix}.{name}'] = _override(shared[f'{prefix}.{name}'], positions, values)
+    return columns
+
+def evaluate_columns(columns: Dict[str, np.ndarray], n_types: int) -> Dict[str, np.ndarray]:
+    """Quarterly revenue, cost, profit and fuel cost per route.
+
+    Each route is flown by the first active aircraft of its type, as in the
+    simulation; routes without one contribute zero.
+    """
+    active = np.flatnonzero(columns['fleet.active'] > 0)
+    active_types = columns['fleet.type_index'][active]
+    served_types, first = np.unique(active_types, return_index=True)
+    seats_by_type = np.zeros(n_types)
+    efficiency_by_type = np.zeros(n_types)
+    seats_by_type[served_types] = columns['fleet.seating_capacity'][active[first]]
+    efficiency_by_type[served_types] = columns['fleet.fuel_efficiency'][active[first]]
+
+    route_type = columns['route.type_index']
+    seats = seats_by_type[route_type]
+    flights = columns['route.frequency'] * WEEKS_PER_QUARTER * (seats > 0)
+    distance = columns['route.distance']
+
+    revenue = seats * columns['route.load_factor'] * distance * columns['route.yield_per_rpk'] * flights
+    fixed = sum(columns[f'route.{name}'] for name in FIXED_COST_COLUMNS)
+    cost = (seats * distance * columns['route.operating_cost_per_ask'] + fixed) * flights
+    fuel = columns['route.fuel_price'] * efficiency_by_type[route_type] * columns['route.flight_time'] * flights
+    return {'revenue': revenue, 'cost': cost, 'profit': revenue - cost, 'fuel_cost': fuel}
+
+# Per-process state set by _init_worker
+_worker_inputs: Optional[SharedArrays] = None
+_worker_index: Optional[Dict] = None
+_worker_outputs: Dict[str, SharedArrays] = {}
+
+def _init_worker(inputs_spec: BlockSpec, index: Dict):
+    global _worker_inputs, _worker_index
+    _worker_inputs = SharedArrays.attach(inputs_spec)
+    _worker_index = index
+
+def _evaluate_chunk(outputs_spec: BlockSpec, chunk: List[Tuple[int, Dict]]) -> int:
+    outputs = _worker_outputs.get(outputs_spec.shm_name)
+    if outputs is None:
+        for stale in _worker_outputs.values():
+            stale.close()
+        _worker_outputs.clear()
+        outputs = _worker_outputs[outputs_spec.shm_name] = SharedArrays.attach(outputs_spec, readonly=False)
+    for row, scenario in chunk:
+        columns = _scenario_columns(_worker_inputs, _worker_index, scenario)
+        for name, values in evaluate_columns(columns, _worker_index['n_types']).items():
+            outputs[name][row] = values
+    return len(chunk)
+
+class ScenarioPool:
+    """Process pool evaluating scenario batches against shared route and fleet arrays.
+
+    Use as a context manager, or call ``close`` to stop the workers and free
+    the shared block. With ``workers=0`` scenarios are evaluated in-process.
+    """
+
+    def __init__(self, route_network: RouteNetwork, fleet: Fleet, workers: int = 0):
+        arrays, self.index = pack_network(route_network, fleet)
+        self.route_keys = list(self.index['routes'])
+        self.workers = workers
+        self.inputs = SharedArrays.create(arrays)
+        self.pool: Optional[ProcessPoolExecutor] = None
+        if workers > 0:
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                            initargs=(self.inputs.spec, self.index))
+
+    def __enter__(self) -> 'ScenarioPool':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Shut down the workers and free the shared input block."""
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        if self.inputs is not None:
+            self.inputs.close()
+            self.inputs = None
+
+    def run(self, scenarios: Sequence[Dict], chunk_size: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Evaluate scenarios and return ``(n_scenarios, n_routes)`` arrays of RESULT_COLUMNS."""
+        n_routes = len(self.route_keys)
+        outputs = SharedArrays.create({name: np.zeros((len(scenarios), n_routes))
+                                       for name in RESULT_COLUMNS})
+        try:
+            jobs = list(enumerate(scenarios))
+            if self.pool is None:
+                for row, scenario in jobs:
+                    columns = _scenario_columns(self.inputs, self.index, scenario)
+                    for name, values in evaluate_columns(columns, self.index['n_types']).items():
+                        outputs[name][row] = values
+            elif jobs:
+                chunk_size = chunk_size or max(1, -(-len(jobs) // (self.workers * 4)))
+                chunks = [jobs[i:i + chunk_size] for i in range(0, len(jobs), chunk_size)]
+                list(self.pool.map(_evaluate_chunk, [outputs.spec] * len(chunks), chunks))
+            return {name: outputs[name].copy() for name in RESULT_COLUMNS}
+        finally:
+            outputs.close()
@@ -1,104 +1,172 @@
-from typing import Dict, List, Optional
-from datetime import datetime, timedelta
-import json
+from typing import Callable, Dict, List, Optional, Union
+from datetime import datetime
 import logging
+from pathlib import Path
+import numpy as np
 from models.aircraft import Aircraft
 from models.fleet import Fleet
 from models.route import Route, RouteNetwork
 from models.financial import FinancialModel, FinancialMetrics
+from models.crew import CrewPairingEngine
+from models.maintenance import MaintenanceScheduler
+from models.od_demand import ODDemandModel
+from models.revenue_management import RevenueManagementModel
+from models.seasonal_demand import SeasonalDemandModel
+from models.actions import ActionPlan, CompiledActions, compile_actions
+from run_logging import get_run_logger
+from result_sinks import ResultSink, default_sink
+from checkpoint import (check_checkpoint_run, latest_checkpoint, load_checkpoint,
+                        restore_checkpoint, save_checkpoint)
+
+# Columns of the per-route cost ledger; 'other' is the remainder of route cost
+COST_COMPONENTS = ('fuel', 'labor', 'airport', 'maintenance', 'other')
+
+# Bump when simulation economics change in ways the source hash would not show
+MODEL_VERSION = '1'
+SIMULATION_START = datetime(2025, 1, 1)
+WEEKS_PER_QUARTER = 13
+
+def quarter_label(index: int, start_date: datetime = SIMULATION_START) -> str:
+    """Label of the quarter at ``index`` in a run, as used for reports and actions.
+
+    Labels are unique within a run: ``index`` counts calendar quarters from
+    the quarter containing ``start_date``.
+    """
+    quarter = (start_date.month - 1) // 3 + index
+    return f"{start_date.year + quarter // 4}-Q{quarter % 4 + 1}"
 
 class BimanSimulation:
     """Main simulation engine for Biman Bangladesh Airlines turnaround."""
     
-    def __init__(self):
-        self.fleet = Fleet()
+    def __init__(self, run_id: Optional[str] = None, log_file: Optional[str] = 'simulation.log',
+                 console: bool = True, sink: Optional[ResultSink] = None):
+        self.fleet = Fleet(as_of=SIMULATION_START)
         self.route_network = RouteNetwork()
         self.financial_model = FinancialModel()
         self.current_quarter = "2025-Q1"
-        self.setup_logging()
+        self.action_log: List[tuple] = []
+        self.report_listeners: List[Callable[[Dict], None]] = []
+        self.od_demand: Optional[ODDemandModel] = None  # when set, drives route load factors
+        self.seasonality: Optional[SeasonalDemandModel] = None  # when set, scales load factor and yield by quarter of year
+        self.revenue_management: Optional[RevenueManagementModel] = None  # when set, drives yield and load factor
+        self.maintenance: Optional[MaintenanceScheduler] = None  # when set, drives tail status and availability
+        self.crew: Optional[CrewPairingEngine] = None  # when set, prices labor from crew pairings
+        self.sink = sink or default_sink()  # where quarterly reports are written
+        self.setup_logging(run_id, log_file, console)
+        self.run_id = self.logger.run_id
     
-    def setup_logging(self):
-        """Setup logging configuration."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('simulation.log'),
-                logging.StreamHandler()
-            ]
-        )
-        self.logger = logging.getLogger('BimanSimulation')
+    def setup_logging(self, run_id: Optional[str] = None, log_file: Optional[str] = 'simulation.log',
+                      console: bool = True, level: int = logging.INFO):
+        """Setup this run's queue-based logger.
+        
+        Records are formatted and written by a background listener thread,
+        routed by run id to ``log_file`` and/or the console. For batch runs,
+        pass a per-run ``log_file`` (or None) and ``console=False``.
+        """
+        self.logger = get_run_logger(run_id, log_file=log_file, console=console, level=level)
+    
+    def add_report_listener(self, listener: Callable[[Dict], None]):
+        """Register a callable that receives each quarterly report as it is produced."""
+        self.report_listeners.append(listener)
     
-    def run_quarter(self, quarter: str, actions: Dict) -> Dict:
+    def run_quarter(self, quarter: str, actions: Union[Dict, CompiledActions]) -> Dict:
         """Run simulation for a single quarter with given actions."""
-        self.logger.info(f"Running simulation for {quarter}")
+        self.logger.info("Running simulation for %s", quarter)
         
         # Apply actions
-        self._apply_actions(actions)
-        
-        # Calculate route performance
-        route_performance = self._calculate_route_performance()
+        applied = self._apply_actions(actions)
+        if len(applied):
+            self.action_log.append((quarter, applied))
         
-        # Update financial metrics
-        financial_metrics = self._update_financials(quarter, route_performance)
+        service_factors = None
+        if self.maintenance is not None:
+            self.maintenance.advance(self.fleet, days=90)
+            service_factors = self.maintenance.service_factors(self.fleet, self.route_network)
         
-        # Generate quarterly report
-        report = self._generate_quarterly_report(quarter, route_performance, financial_metrics)
+        if self.od_demand is not None:
+            self.od_demand.update_load_factors(self.route_network, self.fleet)
+        if self.seasonality is not None:
+            self.seasonality.apply(self.route_network, quarter)
+        try:
+            if self.revenue_management is not None:
+                self.revenue_management.update_routes(self.route_network, self.fleet)
+            
+            crew_costs = None
+            if self.crew is not None:
+                crew_costs = self.crew.solve(self.route_network, self.fleet).route_costs
+            
+            # Calculate route performance
+            route_performance = self._calculate_route_performance(service_factors, crew_costs)
+            
+            # Update financial metrics
+            financial_metrics = self._update_financials(quarter, route_performance)
+            
+            # Generate quarterly report
+            report = self._generate_quarterly_report(quarter, route_performance, financial_metrics)
+        finally:
+            # Put unseasoned values back even if the quarter failed
+            if self.seasonality is not None:
+                self.seasonality.restore(self.route_network)
         
         self.current_quarter = quarter
         return report
     
-    def _apply_actions(self, actions: Dict):
+    def _apply_actions(self, actions: Union[Dict, CompiledActions]):
         """Apply simulation actions for the quarter."""
-        # Route changes
-        if 'route_changes' in actions:
-            for change in actions['route_changes']:
-                if change['action'] == 'add':
-                    self.route_network.add_route(Route(**change['route_data']))
-                elif change['action'] == 'modify':
-                    route = self.route_network.get_route(change['origin'], change['destination'])
-                    if route:
-                        for key, value in change['modifications'].items():
-                            setattr(route, key, value)
-        
-        # Fleet changes
-        if 'fleet_changes' in actions:
-            for change in actions['fleet_changes']:
-                if change['action'] == 'add':
-                    self.fleet.aircraft.append(Aircraft(**change['aircraft_data']))
-                elif change['action'] == 'remove':
-                    self.fleet.aircraft = [a for a in self.fleet.aircraft 
-                                         if a.registration != change['registration']]
-        
-        # Financial changes
-        if 'financial_changes' in actions:
-            for change in actions['financial_changes']:
-                if change['type'] == 'liability':
-                    self.financial_model.update_liabilities(change['category'], change['amount'])
-                elif change['type'] == 'asset':
-                    self.financial_model.update_assets(change['category'], change['amount'])
+        if not isinstance(actions, CompiledActions):
+            actions = compile_actions(actions)
+        actions.apply(self.fleet, self.route_network, self.financial_model)
+        return actions
     
-    def _calculate_route_performance(self) -> Dict:
-        """Calculate performance metrics for all routes."""
+    def _calculate_route_performance(self, service_factors: Optional[Dict[str, float]] = None,
+                                     crew_costs: Optional[Dict[str, float]] = None) -> Dict:
+        """Calculate performance metrics for all routes.
+        
+        With ``service_factors`` (share of flights each aircraft type can fly
+        given maintenance availability), a route is flown by the first tail of
+        its type still under scheduler control and its flights are scaled by
+        the factor. With ``crew_costs`` (quarterly pairing cost per route at
+        full frequency), labor replaces the flat per-flight ``crew_cost``.
+        """
         performance = {
             'total_revenue': 0,
             'total_cost': 0,
             'route_details': {}
         }
+        ledger_rows = []
         
         for route_key, route in self.route_network.routes.items():
             # Get appropriate aircraft for route
             aircraft = next((a for a in self.fleet.aircraft 
                            if a.type == route.aircraft_type and a.status == 'active'), None)
+            if aircraft is None and service_factors is not None:
+                aircraft = next((a for a in self.fleet.aircraft
+                                 if a.type == route.aircraft_type and a.registration in self.maintenance.tails), None)
             
             if aircraft:
-                revenue = route.calculate_revenue(aircraft.seating_capacity)
-                cost = route.calculate_operating_cost(aircraft.seating_capacity)
+                # Quarterly totals: per-flight economics x weekly frequency x weeks
+                flights = route.frequency * WEEKS_PER_QUARTER
+                if service_factors is not None:
+                    flights *= service_factors.get(route.aircraft_type, 1.0)
+                revenue = route.calculate_revenue(aircraft.seating_capacity) * flights
+                cost = route.calculate_operating_cost(aircraft.seating_capacity) * flights
+                labor = route.crew_cost * flights
+                if crew_costs is not None and route.frequency:
+                    paired = crew_costs.get(route_key, 0.0) * flights / (route.frequency * WEEKS_PER_QUARTER)
+                    cost += paired - labor
+                    labor = paired
                 profit = revenue - cost
                 
                 performance['total_revenue'] += revenue
                 performance['total_cost'] += cost
                 
+                # Cost ledger row in COST_COMPONENTS order
+                fuel = route.calculate_fuel_cost(aircraft.fuel_efficiency) * flights
+                airport = route.airport_charges * flights
+                maintenance = route.maintenance_cost * flights
+                ledger_rows.append((fuel, labor, airport, maintenance,
+                                    cost - fuel - labor - airport - maintenance))
+                
                 performance['route_details'][route_key] = {
                     'revenue': revenue,
                     'cost': cost,
@@ -109,19 +177,22 @@ class BimanSimulation:
                     )
                 }
         
+        ledger = np.array(ledger_rows, dtype=float).reshape(-1, len(COST_COMPONENTS))
+        performance['cost_breakdown'] = dict(zip(COST_COMPONENTS, ledger.sum(axis=0).tolist()))
         return performance
     
     def _update_financials(self, quarter: str, route_performance: Dict) -> FinancialMetrics:
         """Update financial metrics based on route performance."""
+        costs = route_performance['cost_breakdown']
         return self.financial_model.calculate_quarterly_metrics(
             quarter=quarter,
             route_revenue=route_performance['total_revenue'],
             operating_costs=route_performance['total_cost'],
-            fuel_costs=sum(route['cost'] * 0.3 for route in route_performance['route_details'].values()),
-            maintenance_costs=self.fleet.calculate_total_maintenance_cost(),
-            labor_costs=sum(route['cost'] * 0.25 for route in route_performance['route_details'].values()),
-            airport_costs=sum(route['cost'] * 0.15 for route in route_performance['route_details'].values()),
-            other_costs=sum(route['cost'] * 0.1 for route in route_performance['route_details'].values())
+            fuel_costs=costs['fuel'],
+            maintenance_costs=costs['maintenance'],
+            labor_costs=costs['labor'],
+            airport_costs=costs['airport'],
+            other_costs=costs['other']
         )
     
     def _generate_quarterly_report(self, quarter: str, 
@@ -147,23 +218,58 @@ class BimanSimulation:
             }
         }
     
-    def run_simulation(self, quarters: int, actions_by_quarter: Dict[str, Dict]) -> List[Dict]:
-        """Run simulation for multiple quarters."""
+    def save_report(self, report: Dict):
+        """Write a quarterly report to this run's result sink."""
+        self.sink.write(self.run_id, report)
+    
+    def run_simulation(self, quarters: int,
+                       actions_by_quarter: Union[Dict[str, Dict], ActionPlan],
+                       checkpoint_dir: Optional[str] = None,
+                       checkpoint_interval: int = 1,
+                       resume: bool = False) -> List[Dict]:
+        """Run simulation for multiple quarters.
+        
+        When ``checkpoint_dir`` is given, a binary checkpoint is written every
+        ``checkpoint_interval`` quarters; with ``resume`` the run continues from
+        the latest checkpoint found there instead of starting over. Raises
+        ``ValueError`` if ``checkpoint_interval`` is below 1 or the checkpoint
+        was written by a run with a different quarter count or action plan.
+        """
+        if checkpoint_interval < 1:
+            raise ValueError(f"checkpoint_interval must be at least 1, got {checkpoint_interval}")
+        if not isinstance(actions_by_quarter, ActionPlan):
+            actions_by_quarter = ActionPlan(actions_by_quarter)
+        run = {
+            'quarters': quarters,
+            'plan': [actions_by_quarter.get(quarter_label(i)).ops for i in range(quarters)]
+        }
         reports = []
-        current_date = datetime(2025, 1, 1)
+        start_index = 0
         
-        for i in range(quarters):
-            quarter = f"{current_date.year}-Q{(i % 4) + 1}"
-            actions = actions_by_quarter.get(quarter, {})
+        if resume and checkpoint_dir:
+            checkpoint_file = latest_checkpoint(checkpoint_dir)
+            if checkpoint_file:
+                state = load_checkpoint(checkpoint_file)
+                check_checkpoint_run(state, run, checkpoint_file)
+                restore_checkpoint(self, state)
+                reports = state['reports']
+                start_index = state['quarter_index']
+                self.logger.info("Resumed from %s after %d quarters", checkpoint_file, start_index)
+        
+        for i in range(start_index, quarters):
+            quarter = quarter_label(i)
+            actions = actions_by_quarter.get(quarter)
             
             report = self.run_quarter(quarter, actions)
             reports.append(report)
             
-            # Save report to file
-            with open(f'reports/{quarter}_report.json', 'w') as f:
-                json.dump(report, f, indent=2)
+            self.save_report(report)
+            
+            for listener in self.report_listeners:
+                listener(report)
             
-            current_date += timedelta(days=90)
+            if checkpoint_dir and ((i + 1) % checkpoint_interval == 0 or i + 1 == quarters):
+                save_checkpoint(self, Path(checkpoint_dir), i + 1, reports, run=run)
         
         return reports
 
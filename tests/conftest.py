@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from simulation import BimanSimulation
+from result_sinks import MemorySink
+
+@pytest.fixture(autouse=True)
+def _scratch_dir(tmp_path, monkeypatch):
+    """Run every test in its own directory so reports and logs never touch the repo."""
+    monkeypatch.chdir(tmp_path)
+
+@pytest.fixture
+def make_simulation():
+    """Factory for quiet simulations that keep their reports in memory."""
+    def make() -> BimanSimulation:
+        return BimanSimulation(log_file=None, console=False, sink=MemorySink())
+    return make
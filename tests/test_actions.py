@@ -0,0 +1,97 @@
+import copy
+import dataclasses
+
+import pytest
+
+from models.actions import ActionPlan, compile_actions
+from models.aircraft import Aircraft
+from models.route import Route
+
+def interpret(actions, fleet, route_network, financial_model):
+    """The original dict interpreter the compiled op-log replaced."""
+    for change in actions.get('route_changes', []):
+        if change['action'] == 'add':
+            route_network.add_route(Route(**change['route_data']))
+        elif change['action'] == 'modify':
+            route = route_network.get_route(change['origin'], change['destination'])
+            if route:
+                for key, value in change['modifications'].items():
+                    setattr(route, key, value)
+    for change in actions.get('fleet_changes', []):
+        if change['action'] == 'add':
+            fleet.aircraft.append(Aircraft(**change['aircraft_data']))
+        elif change['action'] == 'remove':
+            fleet.aircraft = [a for a in fleet.aircraft if a.registration != change['registration']]
+    for change in actions.get('financial_changes', []):
+        if change['type'] == 'liability':
+            financial_model.update_liabilities(change['category'], change['amount'])
+        elif change['type'] == 'asset':
+            financial_model.update_assets(change['category'], change['amount'])
+
+def _actions(simulation):
+    route = dataclasses.asdict(simulation.route_network.routes['DAC-CGP'])
+    aircraft = dataclasses.asdict(simulation.fleet.aircraft[0])
+    return {
+        'route_changes': [
+            {'action': 'modify', 'origin': 'DAC', 'destination': 'DXB',
+             'modifications': {'frequency': 3, 'load_factor': 0.9}},
+            {'action': 'add', 'route_data': {**route, 'destination': 'CXB', 'frequency': 7}},
+            {'action': 'modify', 'origin': 'DAC', 'destination': 'CXB', 'modifications': {'frequency': 10}},
+            {'action': 'modify', 'origin': 'DAC', 'destination': 'XXX', 'modifications': {'frequency': 1}},
+        ],
+        'fleet_changes': [
+            {'action': 'remove', 'registration': 'S2-2'},
+            {'action': 'remove', 'registration': 'S2-3'},
+            {'action': 'add', 'aircraft_data': {**aircraft, 'registration': 'S2-NEW'}},
+            {'action': 'remove', 'registration': 'S2-NEW'},
+            {'action': 'add', 'aircraft_data': {**aircraft, 'registration': 'S2-2'}},
+            {'action': 'remove', 'registration': 'S2-MISSING'},
+        ],
+        'financial_changes': [
+            {'type': 'liability', 'category': 'aircraft_loans', 'amount': -50000000},
+            {'type': 'asset', 'category': 'cash', 'amount': 2.5e7},
+            {'type': 'liability', 'category': 'aircraft_loans', 'amount': 1e6},
+            {'type': 'asset', 'category': 'unknown', 'amount': 1},
+        ],
+    }
+
+def _state(simulation):
+    return (simulation.fleet.aircraft, simulation.route_network.routes,
+            simulation.financial_model.liabilities, simulation.financial_model.assets)
+
+def test_compiled_actions_match_interpreter(make_simulation):
+    interpreted = make_simulation()
+    compiled = make_simulation()
+    actions = _actions(interpreted)
+
+    interpret(copy.deepcopy(actions), interpreted.fleet, interpreted.route_network,
+              interpreted.financial_model)
+    compile_actions(actions).apply(compiled.fleet, compiled.route_network, compiled.financial_model)
+
+    assert _state(compiled) == _state(interpreted)
+    # The op-log copies its payloads, so applying it leaves the plan untouched
+    assert actions == _actions(make_simulation())
+
+def test_compiled_plan_can_be_reapplied(make_simulation):
+    reference = make_simulation()
+    actions = _actions(reference)
+    plan = ActionPlan({'2025-Q1': actions})
+    for _ in range(2):
+        simulation = make_simulation()
+        plan.get('2025-Q1').apply(simulation.fleet, simulation.route_network, simulation.financial_model)
+        expected = make_simulation()
+        interpret(actions, expected.fleet, expected.route_network, expected.financial_model)
+        assert _state(simulation) == _state(expected)
+
+@pytest.mark.parametrize('actions', [
+    {'route_changes': [{'action': 'close', 'origin': 'DAC', 'destination': 'DXB'}]},
+    {'route_changes': [{'action': 'modify', 'origin': 'DAC', 'destination': 'DXB',
+                        'modifications': {'frequncy': 3}}]},
+    {'route_changes': [{'action': 'modify', 'origin': 'DAC', 'destination': 'DXB',
+                        'modifications': {'frequency': '3'}}]},
+    {'fleet_changes': [{'action': 'lease', 'registration': 'S2-1'}]},
+    {'financial_changes': [{'type': 'equity', 'category': 'cash', 'amount': 1}]},
+])
+def test_invalid_actions_are_rejected_at_compile_time(actions):
+    with pytest.raises(ValueError):
+        compile_actions(actions)
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from bootstrap import bootstrap_ci, resample_counts
+
+N_RESAMPLES = 300
+SEED = 11
+
+def _values():
+    rng = np.random.default_rng(3)
+    values = rng.lognormal(10, 1, size=(7, 12)) * rng.choice([-1, 1], size=(7, 12))
+    values[1, ::3] = np.nan  # gaps
+    values[2, 1:] = np.nan   # a single observation
+    values[3] = np.nan       # never observed
+    values[4] += 1e9         # large offset, small spread
+    return values
+
+def naive_bootstrap(values, statistic, confidence):
+    """Resample each row observation by observation with the shared counts."""
+    counts = resample_counts(values.shape[1], N_RESAMPLES, SEED).astype(int)
+    alpha = (1 - confidence) / 2
+    lower, upper, std_error = [], [], []
+    for row in values:
+        resampled = []
+        for draw in counts:
+            sample = np.repeat(row, draw)
+            sample = sample[~np.isnan(sample)]
+            if statistic == 'mean':
+                resampled.append(sample.mean() if len(sample) else np.nan)
+            else:
+                resampled.append(sample.std(ddof=1) if len(sample) > 1 else np.nan)
+        resampled = np.array(resampled)
+        if np.isnan(resampled).all():
+            lower.append(np.nan), upper.append(np.nan), std_error.append(np.nan)
+            continue
+        low, high = np.nanquantile(resampled, [alpha, 1 - alpha])
+        lower.append(low), upper.append(high), std_error.append(np.nanstd(resampled))
+    return np.array(lower), np.array(upper), np.array(std_error)
+
+@pytest.mark.parametrize('statistic', ['mean', 'std'])
+@pytest.mark.parametrize('workers', [0, 2])
+def test_matches_naive_resampling(statistic, workers):
+    values = _values()
+    result = bootstrap_ci(values, statistic, n_resamples=N_RESAMPLES, confidence=0.9, seed=SEED,
+                          workers=workers, parallel_threshold=0, chunk_rows=2)
+
+    lower, upper, std_error = naive_bootstrap(values, statistic, 0.9)
+    np.testing.assert_allclose(result.lower, lower, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(result.upper, upper, rtol=1e-9, equal_nan=True)
+    np.testing.assert_allclose(result.std_error, std_error, rtol=1e-6, atol=1e-6, equal_nan=True)
+
+    observed = [row[~np.isnan(row)] for row in values]
+    expected = [(row.mean() if statistic == 'mean' else row.std(ddof=1))
+                if len(row) > (statistic == 'std') else np.nan for row in observed]
+    np.testing.assert_allclose(result.estimate, expected, rtol=1e-12, equal_nan=True)
+
+def test_resample_counts_draw_n_observations():
+    counts = resample_counts(9, 50, seed=1)
+    assert counts.shape == (50, 9)
+    assert (counts.sum(axis=1) == 9).all()
+    np.testing.assert_array_equal(counts, resample_counts(9, 50, seed=1))
@@ -0,0 +1,78 @@
+import pytest
+
+from build_graph import BuildGraph, Target
+
+def _writer(path, calls, name, content=lambda: 'out'):
+    def build():
+        calls.append(name)
+        path.write_text(content())
+    return build
+
+def _graph(tmp_path):
+    return BuildGraph(tmp_path / 'manifest.json')
+
+def test_unchanged_rebuild_is_skipped(tmp_path):
+    source, output, calls = tmp_path / 'report.json', tmp_path / 'chart.html', []
+    source.write_text('{"quarter": "2025-Q1"}')
+    target = Target('chart', outputs=[output], inputs=[source], params={'width': 800},
+                    build=_writer(output, calls, 'chart'))
+    graph = _graph(tmp_path)
+    graph.add(target)
+    assert graph.build() == {'chart': True}
+
+    # A fresh graph reads the manifest back and finds nothing to do
+    reloaded = _graph(tmp_path)
+    reloaded.add(target)
+    assert reloaded.build() == {'chart': False}
+    assert calls == ['chart']
+
+@pytest.mark.parametrize('change', ['input', 'param', 'deleted output'])
+def test_changes_mark_the_target_stale(tmp_path, change):
+    source, output, calls = tmp_path / 'report.json', tmp_path / 'chart.html', []
+    source.write_text('{"quarter": "2025-Q1"}')
+    params = {'width': 800}
+    graph = _graph(tmp_path)
+    target = graph.add(Target('chart', outputs=[output], inputs=[source], params=params,
+                              build=_writer(output, calls, 'chart')))
+    graph.build()
+    assert not graph.stale(target)
+
+    if change == 'input':
+        source.write_text('{"quarter": "2025-Q1", "revised": true}')
+    elif change == 'param':
+        params['width'] = 1200
+    else:
+        output.unlink()
+    assert graph.stale(target)
+    assert graph.build() == {'chart': True}
+    assert calls == ['chart', 'chart'] and output.exists()
+
+def test_producers_build_before_their_consumers(tmp_path):
+    source, table, page, calls = (tmp_path / 'report.json', tmp_path / 'table.csv',
+                                  tmp_path / 'page.html', [])
+    source.write_text('1')
+    graph = _graph(tmp_path)
+    # Added consumer first: the order must come from the file dependency
+    graph.add(Target('page', outputs=[page], inputs=[table], build=_writer(page, calls, 'page')))
+    graph.add(Target('table', outputs=[table], inputs=[source],
+                     build=_writer(table, calls, 'table', lambda: source.read_text() * 2)))
+    assert [target.name for target in graph._order()] == ['table', 'page']
+
+    assert graph.build() == {'table': True, 'page': True}
+    assert calls == ['table', 'page']
+    assert graph.build() == {'table': False, 'page': False}
+
+    # A new producer output propagates to the consumer in the same build
+    source.write_text('22')
+    assert graph.build() == {'table': True, 'page': True}
+    assert calls == ['table', 'page', 'table', 'page']
+
+def test_dependency_cycles_are_rejected(tmp_path):
+    a, b = tmp_path / 'a.txt', tmp_path / 'b.txt'
+    graph = _graph(tmp_path)
+    graph.add(Target('a', outputs=[a], inputs=[b]))
+    graph.add(Target('b', outputs=[b], inputs=[a]))
+    with pytest.raises(ValueError, match='cycle'):
+        graph._order()
+    with pytest.raises(ValueError, match='Duplicate'):
+        graph.add(Target('a'))
@@ -0,0 +1,55 @@
+import pytest
+
+from models.maintenance import MaintenanceProgram, MaintenanceScheduler
+from models.revenue_management import RevenueManagementModel
+
+QUARTERS = 6
+ACTIONS = {'2025-Q3': {'route_changes': [
+    {'action': 'modify', 'origin': 'DAC', 'destination': 'DXB', 'modifications': {'frequency': 10}}]}}
+
+class Crash(Exception):
+    pass
+
+def _attach(simulation, models):
+    if 'maintenance' in models:
+        simulation.maintenance = MaintenanceScheduler(
+            MaintenanceProgram(failure_rate_per_1000_hours=0.5), seed=7)
+    if 'revenue_management' in models:
+        simulation.revenue_management = RevenueManagementModel(seed=42)
+    return simulation
+
+@pytest.mark.parametrize('models', [(), ('maintenance',), ('revenue_management',),
+                                    ('maintenance', 'revenue_management')])
+def test_resumed_run_matches_uninterrupted_run(make_simulation, tmp_path, models):
+    expected = _attach(make_simulation(), models).run_simulation(QUARTERS, ACTIONS)
+
+    crashing = _attach(make_simulation(), models)
+    seen = []
+    def crash_after_checkpoint(report):
+        seen.append(report)
+        if len(seen) == 4:  # the checkpoint of quarter 4 is never written
+            raise Crash()
+    crashing.add_report_listener(crash_after_checkpoint)
+    with pytest.raises(Crash):
+        crashing.run_simulation(QUARTERS, ACTIONS, checkpoint_dir=tmp_path / 'ckpt')
+
+    resumed = _attach(make_simulation(), models)
+    reports = resumed.run_simulation(QUARTERS, ACTIONS, checkpoint_dir=tmp_path / 'ckpt', resume=True)
+    assert reports == expected
+
+def test_checkpoint_interval_must_be_positive(make_simulation, tmp_path):
+    with pytest.raises(ValueError, match='checkpoint_interval'):
+        make_simulation().run_simulation(QUARTERS, ACTIONS, checkpoint_dir=tmp_path / 'ckpt',
+                                         checkpoint_interval=0)
+
+@pytest.mark.parametrize('quarters, actions, mismatch', [
+    (QUARTERS + 2, ACTIONS, 'quarter count'),
+    (QUARTERS, {}, 'action plan'),
+])
+def test_resume_rejects_checkpoint_of_another_run(make_simulation, tmp_path, quarters, actions, mismatch):
+    make_simulation().run_simulation(QUARTERS, ACTIONS, checkpoint_dir=tmp_path / 'ckpt', checkpoint_interval=2)
+
+    resumed = make_simulation()
+    with pytest.raises(ValueError, match=mismatch):
+        resumed.run_simulation(quarters, actions, checkpoint_dir=tmp_path / 'ckpt', resume=True)
+    assert resumed.current_quarter == make_simulation().current_quarter
@@ -0,0 +1,48 @@
+import time
+
+from models.crew import CrewPairingEngine
+from simulation import WEEKS_PER_QUARTER
+
+def test_roster_covers_every_leg_without_redundant_pairings(make_simulation):
+    simulation = make_simulation()
+    engine = CrewPairingEngine()
+    solution = engine.solve(simulation.route_network, simulation.fleet)
+
+    covered = {}
+    for pairing in solution.pairings:
+        for leg in pairing.legs:
+            covered[leg] = covered.get(leg, 0) + 1
+    assert sorted(covered) == list(range(solution.legs))
+    for pairing in solution.pairings:
+        assert any(covered[leg] == 1 for leg in pairing.legs)
+
+def test_default_rates_match_flat_crew_cost(make_simulation):
+    simulation = make_simulation()
+    solution = CrewPairingEngine().solve(simulation.route_network, simulation.fleet)
+    flat = sum(route.crew_cost * route.frequency * WEEKS_PER_QUARTER
+               for route in simulation.route_network.routes.values())
+    assert abs(solution.total_cost / flat - 1) < 0.05
+
+def test_quarter_roster_solves_within_a_second(make_simulation):
+    simulation = make_simulation()
+    engine = CrewPairingEngine()
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        engine.solve(simulation.route_network, simulation.fleet)
+        timings.append(time.perf_counter() - start)
+    assert min(timings) < 1.0
+
+def test_more_than_daily_routes_spread_departures_through_the_day(make_simulation):
+    simulation = make_simulation()
+    route = simulation.route_network.routes['DAC-CGP']
+    route.frequency = 17
+    legs = CrewPairingEngine(weeks=2).build_schedule(simulation.route_network, simulation.fleet)
+
+    keys = [(leg.route_key, leg.origin, leg.departure) for leg in legs]
+    assert len(set(keys)) == len(keys)
+    outbound = [leg.departure for leg in legs if leg.route_key == 'DAC-CGP' and leg.origin == 'DAC']
+    assert len(outbound) == 2 * 17
+    first_week = outbound[:17]
+    assert min(b - a for a, b in zip(first_week, first_week[1:])) >= 24 / 3 - 1e-9
+    assert sorted({int(departure // 24) for departure in first_week}) == list(range(7))
@@ -0,0 +1,47 @@
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+from dashboard_output import split_subplot_panels
+
+def _figure():
+    fig = make_subplots(
+        rows=2, cols=2,
+        subplot_titles=('Profit', 'Mix', 'Routes', 'Load'),
+        specs=[[{'secondary_y': True}, {'type': 'domain'}],
+               [{'type': 'table'}, {'type': 'scatter'}]]
+    )
+    fig.add_trace(go.Scatter(x=[1, 2], y=[3, 4], name='profit'), row=1, col=1)
+    fig.add_trace(go.Scatter(x=[1, 2], y=[0.5, 0.6], name='margin'), row=1, col=1, secondary_y=True)
+    fig.add_trace(go.Pie(labels=['A', 'B'], values=[1, 2], name='mix'), row=1, col=2)
+    fig.add_trace(go.Scatter(x=[1], y=[0.8], name='load'), row=2, col=2)
+    fig.update_layout(barmode='stack')
+    return fig
+
+def test_panels_follow_trace_anchors_without_private_grid(monkeypatch):
+    fig = _figure()
+    def private_grid(self):
+        raise AssertionError('split_subplot_panels must not use the private grid ref')
+    monkeypatch.setattr(go.Figure, '_validate_get_grid_ref', private_grid, raising=False)
+
+    panels = split_subplot_panels(fig)
+
+    # The empty table cell is dropped; titles stay with their own panels
+    assert [panel['title'] for panel in panels] == ['Profit', 'Mix', 'Load']
+    assert [[trace['name'] for trace in panel['data']] for panel in panels] == [
+        ['profit', 'margin'], ['mix'], ['load']
+    ]
+    for panel in panels:
+        assert panel['layout']['title']['text'] == panel['title']
+        for trace in panel['data']:
+            assert not {'xaxis', 'domain'} & trace.keys()
+    assert panels[0]['layout']['barmode'] == 'stack'
+    assert 'xaxis' not in panels[1]['layout']
+    assert 'anchor' not in panels[2]['layout']['xaxis']
+    assert 'yaxis2' not in panels[2]['layout']
+
+def test_secondary_y_axis_stays_with_its_panel():
+    profit = split_subplot_panels(_figure())[0]
+    assert [trace.get('yaxis') for trace in profit['data']] == [None, 'y2']
+    yaxis2 = profit['layout']['yaxis2']
+    assert yaxis2['overlaying'] == 'y' and yaxis2['anchor'] == 'x' and yaxis2['side'] == 'right'
+    assert 'domain' not in profit['layout']['yaxis']
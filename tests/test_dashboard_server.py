@@ -0,0 +1,70 @@
+import socket
+import threading
+
+import pytest
+
+from dashboard_server import LiveDashboardServer
+
+def _read_until(sock, marker: bytes, count: int) -> bytes:
+    data = b''
+    while data.count(marker) < count:
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        data += chunk
+    return data
+
+@pytest.fixture
+def reports(make_simulation):
+    return make_simulation().run_simulation(3, {})
+
+def test_client_receives_history_then_live_events(reports):
+    server = LiveDashboardServer(port=0).start()
+    try:
+        server.publish(reports[0])
+        with socket.create_connection((server.host, server.port), timeout=5) as sock:
+            sock.sendall(b'GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n')
+            data = _read_until(sock, b'event: quarter', 1)
+            server.publish(reports[1])
+            server.publish(reports[2])
+            data += _read_until(sock, b'event: quarter', 2)
+        assert data.startswith(b'HTTP/1.1 200 OK')
+        assert data.count(b'event: quarter') == 3
+        assert [report['quarter'].encode() in data for report in reports] == [True] * 3
+    finally:
+        server.stop()
+
+def test_publish_after_stop_is_a_no_op(reports):
+    server = LiveDashboardServer(port=0).start()
+    server.stop()
+    server.publish(reports[0])
+    server(reports[1])
+
+def test_start_raises_any_server_setup_error():
+    server = LiveDashboardServer(port=70000)
+    outcome = []
+    def start():
+        try:
+            server.start()
+        except BaseException as exc:
+            outcome.append(exc)
+    thread = threading.Thread(target=start, daemon=True)
+    thread.start()
+    thread.join(timeout=5)
+    assert not thread.is_alive(), 'start() blocked after the server failed'
+    assert len(outcome) == 1 and isinstance(outcome[0], OverflowError)
+
+def test_history_keeps_only_the_latest_deltas(reports):
+    server = LiveDashboardServer(port=0, max_history=2)
+    for report in reports:
+        server.publish(report)
+    server.start()
+    try:
+        with socket.create_connection((server.host, server.port), timeout=5) as sock:
+            sock.sendall(b'GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n')
+            data = _read_until(sock, b'event: quarter', 2)
+        assert data.count(b'event: quarter') == 2
+        assert reports[0]['quarter'].encode() not in data
+        assert reports[2]['quarter'].encode() in data
+    finally:
+        server.stop()
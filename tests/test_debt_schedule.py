@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+from models.debt_schedule import DebtScheduleEngine, LiabilityTerms
+from models.financial import FinancialModel
+
+def _quarterly_loans(action_quarter=None, amount=-500e6, quarters=8):
+    model = FinancialModel()
+    model.attach_debt_schedule(DebtScheduleEngine.from_financial_model(model, horizon_quarters=12))
+    balances = []
+    for q in range(quarters):
+        if q == action_quarter:
+            model.update_liabilities('aircraft_loans', amount)
+        model.calculate_quarterly_metrics(f'Q{q}', 1e8, 9e7, 0, 0, 0, 0, 0)
+        balances.append(model.liabilities['aircraft_loans'])
+    return np.array(balances)
+
+def test_liability_action_survives_later_quarters():
+    baseline = _quarterly_loans()
+    repaid = _quarterly_loans(action_quarter=2)
+    np.testing.assert_allclose(repaid[:2], baseline[:2])
+    # The repayment is re-amortized, not overwritten by the schedule a quarter later
+    assert (baseline[2:] - repaid[2:] > 400e6).all()
+    assert (np.diff(repaid[2:]) < 0).all()
+
+def test_adjusting_at_start_equals_smaller_principal():
+    terms = LiabilityTerms(annual_rate=0.06, term_quarters=20)
+    adjusted = DebtScheduleEngine(24)
+    adjusted.add_liability('loan', 1000.0, terms)
+    adjusted.adjust_balance('loan', 0, -200.0)
+    fresh = DebtScheduleEngine(24)
+    fresh.add_liability('loan', 800.0, terms)
+    for key in ('interest', 'principal', 'closing'):
+        np.testing.assert_allclose(adjusted.liability_schedule('loan')[key],
+                                   fresh.liability_schedule('loan')[key])
+
+def test_mid_term_adjustment_keeps_payoff_quarter():
+    engine = DebtScheduleEngine(24)
+    engine.add_liability('loan', 1000.0, LiabilityTerms(annual_rate=0.08, term_quarters=12))
+    engine.adjust_balance('loan', 5, 300.0)
+    engine.adjust_balance('loan', 5, -100.0)  # same quarter: changes accumulate
+    closing = engine.liability_schedule('loan')['closing']
+    assert closing[11] == pytest.approx(0.0, abs=1e-6) and closing[10] > 0
+    assert engine.liability_schedule('loan')['opening'][5] == pytest.approx(
+        closing[4] + 200.0)
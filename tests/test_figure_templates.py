@@ -0,0 +1,24 @@
+import matplotlib
+matplotlib.use('Agg')
+
+import pytest
+
+from figure_templates import ChartTemplates, FigureTemplate
+
+def test_templates_are_built_once_per_layout(make_simulation, tmp_path):
+    reports = make_simulation().run_simulation(5, {})
+    templates = ChartTemplates()
+    try:
+        template = templates.financial_metrics
+        for i in range(3):
+            template.render(reports, str(tmp_path / f'financial_{i}.png'))
+        assert template.builds == 1
+        template.render(reports[:4], str(tmp_path / 'financial_short.png'))
+        assert template.builds == 2
+        assert all((tmp_path / f'financial_{i}.png').stat().st_size > 0 for i in range(3))
+    finally:
+        templates.close()
+
+def test_template_base_class_is_abstract():
+    with pytest.raises(TypeError):
+        FigureTemplate()
@@ -0,0 +1,130 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+from incremental_stats import FINANCIAL_METRICS, IncrementalAnalysis, QuantileSketch, RunningMoments
+from simulation import quarter_label
+
+def synthetic_reports(n_quarters=22, seed=5):
+    """Reports with trending, skewed metrics and routes that open and close mid-run."""
+    rng = np.random.default_rng(seed)
+    reports = []
+    for i in range(n_quarters):
+        routes = {}
+        for r, route in enumerate(['DAC-CGP', 'DAC-DXB', 'DAC-LHR', 'DAC-NRT']):
+            if route == 'DAC-NRT' and not 5 <= i < 15:
+                continue
+            routes[route] = {
+                'profit': float(rng.normal(1e6 * (r - 1), 4e5) + 2e4 * i),
+                'load_factor': float(np.clip(0.7 + 0.1 * np.sin(i * np.pi / 2) + rng.normal(0, 0.03), 0, 1)),
+            }
+        reports.append({
+            'quarter': quarter_label(i),
+            'key_metrics': {
+                'operating_margin': float(rng.normal(-2 + 0.3 * i, 1.5)),
+                'roic': float(rng.gamma(2.0, 0.5)),
+                'cash_burn_rate': float(rng.normal(-5e5, 8e4) + 1e4 * i),
+            },
+            'route_performance': {'route_details': routes},
+        })
+    return reports
+
+def batch_analysis(reports):
+    """Reference batch analysis: one full pass over all reports per statistic."""
+    analysis = {}
+    for metric, field in FINANCIAL_METRICS.items():
+        values = [report['key_metrics'][field] for report in reports]
+        regression = stats.linregress(np.arange(len(values)), values)
+        p_value = stats.shapiro(values)[1]
+        analysis[metric] = {
+            'mean': np.mean(values), 'std': np.std(values),
+            'min': np.min(values), 'max': np.max(values),
+            'median': np.median(values), 'iqr': stats.iqr(values),
+            'skewness': stats.skew(values), 'kurtosis': stats.kurtosis(values),
+            'trend': np.polyfit(range(len(values)), values, 1)[0],
+            'normality_test': {'p_value': p_value, 'is_normal': p_value > 0.05},
+            'trend_analysis': {'slope': regression.slope, 'r_squared': regression.rvalue ** 2,
+                               'p_value': regression.pvalue, 'std_err': regression.stderr},
+        }
+    rows = pd.DataFrame([
+        {'Route': route, 'Profit': m['profit'], 'Load Factor': m['load_factor'],
+         'Quarter of year': report['quarter'][-2:]}
+        for report in reports for route, m in report['route_performance']['route_details'].items()
+    ])
+    routes = {}
+    for route, df in rows.groupby('Route', sort=False):
+        seasonal = df.groupby('Quarter of year')['Load Factor'].mean()
+        routes[route] = {
+            'profitability': {
+                'mean': df['Profit'].mean(), 'std': df['Profit'].std(),
+                'min': df['Profit'].min(), 'max': df['Profit'].max(), 'median': df['Profit'].median(),
+                'profit_margin': (df['Profit'].sum() / len(df)) / df['Profit'].abs().max(),
+            },
+            'load_factor': {
+                'mean': df['Load Factor'].mean(), 'std': df['Load Factor'].std(),
+                'min': df['Load Factor'].min(), 'max': df['Load Factor'].max(),
+                'median': df['Load Factor'].median(),
+            },
+            'seasonality': {f'q{q}_mean': seasonal.get(f'Q{q}', 0) for q in range(1, 5)},
+        }
+    analysis['Route Performance'] = routes
+    comparison = {}
+    names = list(routes)
+    for i, route1 in enumerate(names):
+        for route2 in names[i + 1:]:
+            t_stat, p_value = stats.ttest_ind(rows.loc[rows['Route'] == route1, 'Profit'],
+                                              rows.loc[rows['Route'] == route2, 'Profit'])
+            comparison[f'{route1}_vs_{route2}'] = {
+                't_statistic': t_stat, 'p_value': p_value, 'significant_difference': p_value < 0.05}
+    analysis['Route Comparison'] = comparison
+    return analysis
+
+def assert_same_analysis(actual, expected, path='analysis'):
+    if isinstance(expected, dict):
+        assert actual.keys() == expected.keys(), path
+        for key in expected:
+            assert_same_analysis(actual[key], expected[key], f'{path}.{key}')
+    elif isinstance(expected, (bool, np.bool_)):
+        assert bool(actual) == bool(expected), path
+    else:
+        assert actual == pytest.approx(float(expected), rel=1e-7, abs=1e-9), path
+
+def test_incremental_analysis_matches_batch_analysis():
+    reports = synthetic_reports()
+    incremental = IncrementalAnalysis()
+    for report in reports:
+        incremental.update(report)
+    assert_same_analysis(incremental.analysis(), batch_analysis(reports))
+
+def test_merged_moments_match_single_pass():
+    values = np.random.default_rng(1).lognormal(size=500)
+    left, right, whole = RunningMoments(), RunningMoments(), RunningMoments()
+    for v in values[:180]:
+        left.update(v)
+    for v in values[180:]:
+        right.update(v)
+    for v in values:
+        whole.update(v)
+    left.merge(right)
+    assert left.mean == pytest.approx(whole.mean)
+    assert left.std(ddof=1) == pytest.approx(np.std(values, ddof=1))
+    assert left.skewness() == pytest.approx(stats.skew(values))
+    assert left.kurtosis() == pytest.approx(stats.kurtosis(values))
+
+def test_quantile_sketch_is_exact_up_to_k_and_close_beyond():
+    rng = np.random.default_rng(2)
+    small = rng.normal(size=150)
+    sketch = QuantileSketch(k=200, seed=0)
+    for v in small:
+        sketch.update(v)
+    assert sketch.median() == pytest.approx(np.median(small))
+
+    large = rng.normal(size=20000)
+    sketch = QuantileSketch(k=200, seed=0)
+    for v in large:
+        sketch.update(v)
+    rank = np.searchsorted(np.sort(large), sketch.median()) / len(large)
+    assert math.isclose(rank, 0.5, abs_tol=0.03)
@@ -0,0 +1,25 @@
+import copy
+
+from models.maintenance import CHECK_DUE, MaintenanceScheduler
+
+def test_re_added_tail_ignores_events_of_the_removed_one(make_simulation):
+    fleet = make_simulation().fleet
+    scheduler = MaintenanceScheduler(seed=1)
+    scheduler.advance(fleet, 1.0)
+    tail = next(a for a in fleet.aircraft if a.registration == 'S2-20')
+    old_due = next(day for day, _, kind, registration, _ in scheduler.heap
+                   if kind == CHECK_DUE and registration == 'S2-20')
+
+    fleet.remove_aircraft(['S2-20'])
+    scheduler.advance(fleet, 1.0)
+    fleet.aircraft.append(copy.deepcopy(tail))
+    scheduler.advance(fleet, 0.5)
+    state = scheduler.tails['S2-20']
+    live = [event for event in scheduler.heap
+            if event[3] == 'S2-20' and event[4] == state.version]
+    assert len(live) == 1 and live[0][0] > old_due
+
+    # Run past the removed tail's check: the new tail keeps flying
+    scheduler.advance(fleet, old_due + 1.0 - scheduler.clock)
+    assert tail.registration not in scheduler.in_check
+    assert next(a for a in fleet.aircraft if a.registration == 'S2-20').status == 'active'
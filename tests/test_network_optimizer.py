@@ -0,0 +1,83 @@
+import pytest
+
+from models.network_optimizer import FrequencyOptimizer
+
+def _tight_fleet(simulation, keep=2):
+    """Keep ``keep`` active aircraft per type so block hours bind."""
+    seen = {}
+    for aircraft in simulation.fleet.aircraft:
+        seen[aircraft.type] = seen.get(aircraft.type, 0) + 1
+        if seen[aircraft.type] > keep:
+            aircraft.status = 'grounded'
+    return simulation
+
+def _long_haul_trade_off(simulation):
+    """Make DAC-LHR earn more per frequency than DAC-DXB, but less per block hour."""
+    seats = simulation.fleet.get_seats_by_type()['B777-300ER']
+    dxb, lhr = simulation.route_network.routes['DAC-DXB'], simulation.route_network.routes['DAC-LHR']
+    dxb_gain = dxb.calculate_revenue(seats) - dxb.calculate_operating_cost(seats)
+    target = lhr.calculate_operating_cost(seats) + 1.5 * dxb_gain
+    lhr.yield_per_rpk *= target / lhr.calculate_revenue(seats)
+    assert dxb_gain > 0 and 1.5 * dxb_gain / (2 * lhr.flight_time) < dxb_gain / (2 * dxb.flight_time)
+    return simulation
+
+def _increments(optimizer):
+    """Marginal profit and block hours of every weekly frequency of every route."""
+    seats = optimizer.fleet.get_seats_by_type()
+    increments = {}
+    for key, route in optimizer.route_network.routes.items():
+        if route.aircraft_type not in seats:
+            continue
+        revenue = route.calculate_revenue(seats[route.aircraft_type])
+        cost = route.calculate_operating_cost(seats[route.aircraft_type])
+        demand = max(route.frequency, 1) * optimizer.demand_headroom
+        gains = [revenue * min(max(demand - n, 0.0), 1.0) - cost for n in range(optimizer.max_frequency)]
+        increments[key] = (gains, route.flight_time * 2, route.aircraft_type)
+    return increments
+
+def test_plan_respects_block_hours_and_picks_best_increments(make_simulation):
+    simulation = _long_haul_trade_off(_tight_fleet(make_simulation(), keep=1))
+    optimizer = FrequencyOptimizer(simulation.route_network, simulation.fleet)
+    plan = optimizer.optimize()
+    increments = _increments(optimizer)
+
+    used = {}
+    for key, (_, hours, aircraft_type) in increments.items():
+        used[aircraft_type] = used.get(aircraft_type, 0.0) + plan.frequencies[key] * hours
+    for aircraft_type, hours in used.items():
+        assert hours == pytest.approx(plan.block_hours_used[aircraft_type])
+        assert hours <= plan.block_hours_available[aircraft_type] + 1e-9
+
+    # Naive greedy: repeatedly add the increment with the best profit per block hour that fits
+    assigned = dict.fromkeys(increments, 0)
+    remaining = dict(plan.block_hours_available)
+    while True:
+        fits = [(gains[assigned[key]] / hours, key) for key, (gains, hours, aircraft_type) in increments.items()
+                if assigned[key] < optimizer.max_frequency and gains[assigned[key]] > 0
+                and hours <= remaining[aircraft_type] + 1e-9]
+        if not fits:
+            break
+        _, key = max(fits, key=lambda item: item[0])
+        assigned[key] += 1
+        remaining[increments[key][2]] -= increments[key][1]
+    assert {key: plan.frequencies[key] for key in increments} == assigned
+    # The block hours, not demand, stop some profitable route from growing
+    assert any(assigned[key] < optimizer.max_frequency and gains[assigned[key]] > 0
+               for key, (gains, _, _) in increments.items())
+    assert plan.weekly_profit == pytest.approx(
+        sum(sum(increments[key][0][:n]) for key, n in assigned.items()))
+
+def test_minimum_frequencies_beyond_block_hours_are_rejected(make_simulation):
+    simulation = _tight_fleet(make_simulation(), keep=1)
+    optimizer = FrequencyOptimizer(simulation.route_network, simulation.fleet)
+    with pytest.raises(ValueError, match='block hours'):
+        optimizer.optimize(min_frequency={'DAC-LHR': 21, 'DAC-MAN': 21})
+
+def test_profitability_helpers_take_seats_per_type(make_simulation):
+    simulation = make_simulation()
+    network, seats = simulation.route_network, simulation.fleet.get_seats_by_type()
+    profitable = network.get_profitable_routes(seats)
+    unprofitable = network.get_unprofitable_routes(seats)
+    assert len(profitable) + len(unprofitable) == len(network.routes)
+    assert network.calculate_total_network_profit(seats) == pytest.approx(sum(
+        route.calculate_weekly_profit(seats[route.aircraft_type]) for route in network.routes.values()))
@@ -0,0 +1,67 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from models.od_demand import ODDemandModel
+
+def _add_route(simulation, origin, destination, **changes):
+    template = simulation.route_network.routes['DAC-DXB']
+    route = dataclasses.replace(template, origin=origin, destination=destination, **changes)
+    simulation.route_network.add_route(route)
+
+def test_connecting_flows_through_the_hub_reach_long_haul_legs(make_simulation):
+    simulation = make_simulation()
+    network, fleet = simulation.route_network, simulation.fleet
+    local = ODDemandModel.from_network(network, fleet)
+    connecting = ODDemandModel.from_network(network, fleet,
+                                            connecting_demand={('CGP', 'LHR'): 30.0, ('MAN', 'ZYL'): 20.0})
+
+    before, after = local.allocate(network, fleet), connecting.allocate(network, fleet)
+    assert after.connecting_passengers == pytest.approx(50.0)
+    assert after.local_passengers == pytest.approx(before.local_passengers)
+    for key, extra in (('DAC-CGP', 30.0), ('DAC-LHR', 30.0), ('DAC-MAN', 20.0), ('DAC-ZYL', 20.0)):
+        assert after.segment_passengers[key] - before.segment_passengers[key] == pytest.approx(extra)
+    assert after.segment_passengers['DAC-DXB'] == pytest.approx(before.segment_passengers['DAC-DXB'])
+
+def test_spill_is_bounded_by_segment_capacity(make_simulation):
+    simulation = make_simulation()
+    network, fleet = simulation.route_network, simulation.fleet
+    model = ODDemandModel.from_network(network, fleet, connecting_demand={
+        ('CGP', 'LHR'): 5000.0, ('LHR', 'CGP'): 5000.0, ('SIN', 'MAN'): 800.0, ('CCU', 'DXB'): 50.0})
+    model.set_demand('DAC', 'LHR', 4000.0)
+
+    allocation = model.allocate(network, fleet)
+    seats = fleet.get_seats_by_type()
+    incidence = model._itineraries['incidence']
+    directed = incidence.T @ allocation.itinerary_flows
+    capacity = np.repeat([seats.get(route.aircraft_type, 0) * route.frequency
+                          for route in network.routes.values()], 2)
+    assert (directed <= capacity + 1e-6).all()
+    assert max(allocation.segment_load_factors.values()) <= 1 + 1e-9
+    demand = model.demand.sum()
+    assert allocation.spilled_passengers == pytest.approx(demand - allocation.itinerary_flows.sum())
+    # DAC->LHR alone is asked for 9000 seats a week beyond its local demand
+    lhr = network.routes['DAC-LHR']
+    assert allocation.spilled_passengers >= 9000.0 - seats[lhr.aircraft_type] * lhr.frequency
+
+@pytest.mark.parametrize('recapture_rate', [0.0, 0.5, 1.0])
+def test_recapture_moves_suspended_demand_to_remaining_itineraries(make_simulation, recapture_rate):
+    simulation = make_simulation()
+    network, fleet = simulation.route_network, simulation.fleet
+    _add_route(simulation, 'CCU', 'DXB', flight_time=4.5)
+    model = ODDemandModel(network, recapture_rate=recapture_rate)
+    model.set_demand('CCU', 'DXB', 100.0)
+
+    open_allocation = model.allocate(network, fleet)
+    assert open_allocation.itinerary_flows.sum() == pytest.approx(100.0)
+    nonstop_share = open_allocation.local_passengers / 100.0
+    assert 0 < nonstop_share < 1
+
+    network.routes['CCU-DXB'].frequency = 0
+    suspended = model.allocate(network, fleet)
+    assert suspended.local_passengers == 0
+    lost = 100.0 * nonstop_share
+    assert suspended.connecting_passengers == pytest.approx(100.0 - lost + recapture_rate * lost)
+    assert suspended.spilled_passengers == pytest.approx((1 - recapture_rate) * lost)
+    assert suspended.connecting_passengers + suspended.spilled_passengers == pytest.approx(100.0)
@@ -0,0 +1,30 @@
+import numpy as np
+
+from plan_search import PlanEvaluator, SearchConfig, decode_plan
+from simulation import quarter_label
+
+def test_quarter_labels_are_unique_and_chronological():
+    labels = [quarter_label(i) for i in range(9)]
+    assert labels == ['2025-Q1', '2025-Q2', '2025-Q3', '2025-Q4',
+                      '2026-Q1', '2026-Q2', '2026-Q3', '2026-Q4', '2027-Q1']
+
+def test_decoded_plan_reproduces_scored_plan(make_simulation):
+    config = SearchConfig(quarters=8, population_size=4, generations=1, workers=0)
+    evaluator = PlanEvaluator(config)
+    rng = np.random.default_rng(3)
+    plan = rng.integers(0, config.max_frequency + 1, size=(config.quarters, len(evaluator.routes)))
+    fitness = evaluator.evaluate(plan)
+
+    simulation = make_simulation()
+    frequencies = []
+    simulation.add_report_listener(lambda report: frequencies.append(
+        [simulation.route_network.routes[key].frequency for key in evaluator.routes]))
+    actions = decode_plan(plan, evaluator.routes, evaluator.base_frequencies)
+    reports = simulation.run_simulation(config.quarters, actions)
+
+    np.testing.assert_array_equal(np.array(frequencies), plan)
+    assert len({report['quarter'] for report in reports}) == config.quarters
+    metrics = [simulation.financial_model.get_quarterly_metrics(report['quarter']) for report in reports]
+    net_income = sum(m.net_income for m in metrics)
+    shortfall = max(config.cash_floor - min(m.cash_balance for m in metrics), 0.0)
+    assert fitness == net_income - config.penalty_weight * shortfall
@@ -0,0 +1,54 @@
+from models.maintenance import MaintenanceScheduler
+from models.od_demand import ODDemandModel
+from models.revenue_management import RevenueManagementModel
+from result_cache import ResultCache
+
+ACTIONS = {'2025-Q2': {'route_changes': [
+    {'action': 'modify', 'origin': 'DAC', 'destination': 'LHR', 'modifications': {'frequency': 3}}]}}
+
+def test_cache_miss_then_hit(make_simulation, tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    first = cache.run(make_simulation(), 4, ACTIONS)
+    assert (cache.hits, cache.misses) == (0, 1)
+    second = cache.run(make_simulation(), 4, ACTIONS)
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert second == first
+
+def test_key_changes_with_plan_and_quarters(make_simulation, tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    simulation = make_simulation()
+    key = cache.key(simulation, 4, ACTIONS)
+    assert key == cache.key(make_simulation(), 4, ACTIONS)
+    assert key != cache.key(simulation, 4, {})
+    assert key != cache.key(simulation, 5, ACTIONS)
+    # Actions after the simulated quarters do not matter
+    assert cache.key(simulation, 1, ACTIONS) == cache.key(simulation, 1, {})
+
+def test_key_covers_attached_models(make_simulation, tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    bare = make_simulation()
+    keys = {cache.key(bare, 4, {})}
+    for attach in (
+        lambda s: setattr(s, 'od_demand', ODDemandModel.from_network(s.route_network, s.fleet)),
+        lambda s: setattr(s, 'revenue_management', RevenueManagementModel(seed=1)),
+        lambda s: setattr(s, 'revenue_management', RevenueManagementModel(seed=2)),
+        lambda s: setattr(s, 'maintenance', MaintenanceScheduler(seed=1)),
+    ):
+        simulation = make_simulation()
+        attach(simulation)
+        keys.add(cache.key(simulation, 4, {}))
+    assert len(keys) == 5
+
+def test_key_follows_generator_state(make_simulation, tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    simulation = make_simulation()
+    simulation.revenue_management = RevenueManagementModel(seed=1)
+    before = cache.key(simulation, 2, {})
+    simulation.revenue_management.rng.random()
+    assert cache.key(simulation, 2, {}) != before
+
+def test_uncanonicalizable_state_has_no_key(make_simulation, tmp_path):
+    cache = ResultCache(tmp_path / 'cache')
+    simulation = make_simulation()
+    simulation.crew = object()
+    assert cache.key(simulation, 2, {}) is None
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from scenario_pool import RESULT_COLUMNS, ScenarioPool
+
+SCENARIOS = [
+    {},
+    {'routes': {'DAC-DXB': {'frequency': 10}, 'DAC-LHR': {'load_factor': 0.85}}},
+    {'routes': {'DAC-NRT': {'frequency': 3}, 'DAC-CGP': {'yield_per_rpk': 0.2, 'crew_cost': 950}}},
+    {'fleet': {'S2-1': {'status': 'grounded'}, 'S2-5': {'status': 'maintenance'}}},
+    {'fleet': {f'S2-{i}': {'status': 'grounded'} for i in range(17, 22)},
+     'routes': {'DAC-SIN': {'fuel_price': 1.6}}},
+]
+
+def _apply(simulation, scenario):
+    for key, modifications in scenario.get('routes', {}).items():
+        for name, value in modifications.items():
+            setattr(simulation.route_network.routes[key], name, value)
+    for aircraft in simulation.fleet.aircraft:
+        status = scenario.get('fleet', {}).get(aircraft.registration, {}).get('status')
+        if status is not None:
+            aircraft.status = status
+    return simulation
+
+def _run(simulation, workers):
+    with ScenarioPool(simulation.route_network, simulation.fleet, workers=workers) as pool:
+        return pool.route_keys, pool.run(SCENARIOS, chunk_size=2)
+
+def test_worker_pool_matches_in_process_evaluation(make_simulation):
+    simulation = make_simulation()
+    _, serial = _run(simulation, workers=0)
+    _, pooled = _run(simulation, workers=2)
+    for name in RESULT_COLUMNS:
+        assert serial[name].shape == (len(SCENARIOS), len(simulation.route_network.routes))
+        np.testing.assert_array_equal(pooled[name], serial[name])
+
+def test_scenarios_match_simulation_route_totals(make_simulation):
+    route_keys, results = _run(make_simulation(), workers=0)
+    for row, scenario in enumerate(SCENARIOS):
+        performance = _apply(make_simulation(), scenario)._calculate_route_performance()
+        details = performance['route_details']
+        for column, key in enumerate(route_keys):
+            expected = details.get(key, {'revenue': 0.0, 'cost': 0.0, 'profit': 0.0})
+            for name in ('revenue', 'cost', 'profit'):
+                assert results[name][row, column] == pytest.approx(expected[name], rel=1e-12, abs=1e-6)
+        assert results['revenue'][row].sum() == pytest.approx(performance['total_revenue'], rel=1e-12)
+        assert results['cost'][row].sum() == pytest.approx(performance['total_cost'], rel=1e-12)
+        assert results['fuel_cost'][row].sum() == pytest.approx(performance['cost_breakdown']['fuel'], rel=1e-12)
+
+def test_unknown_scenario_keys_are_rejected(make_simulation):
+    simulation = make_simulation()
+    with ScenarioPool(simulation.route_network, simulation.fleet) as pool:
+        with pytest.raises(ValueError, match='Unknown route'):
+            pool.run([{'routes': {'DAC-XXX': {'frequency': 1}}}])
+        with pytest.raises(ValueError, match='cannot change'):
+            pool.run([{'routes': {'DAC-DXB': {'aircraft_type': 'B787-8'}}}])
@@ -0,0 +1,70 @@
+import numpy as np
+import pytest
+
+from incremental_stats import IncrementalAnalysis
+from models.seasonal_demand import DEFAULT_SEASONAL_PROFILES, SeasonalDemandModel, quarter_of_year
+from models.revenue_management import RevenueManagementModel
+from test_incremental_stats import synthetic_reports
+
+def _route_values(simulation):
+    return {key: (route.load_factor, route.yield_per_rpk)
+            for key, route in simulation.route_network.routes.items()}
+
+def test_quarter_of_year():
+    assert [quarter_of_year(label) for label in ('2025-Q1', '2026-Q4')] == [1, 4]
+    with pytest.raises(ValueError):
+        quarter_of_year('Q1')
+
+def test_index_tables_follow_market_profiles(make_simulation):
+    model = SeasonalDemandModel(make_simulation().route_network, overrides={'DAC-DXB': (1, 1, 1, 1)},
+                                yield_elasticity=0.5)
+    profile = np.array(DEFAULT_SEASONAL_PROFILES['europe'])
+    lhr = model._row['DAC-LHR']
+    np.testing.assert_allclose(model.load_factor_index[lhr], profile / profile.mean())
+    np.testing.assert_allclose(model.yield_index[lhr], 1 + 0.5 * (profile / profile.mean() - 1))
+    np.testing.assert_allclose(model.load_factor_index[model._row['DAC-DXB']], 1.0)
+    np.testing.assert_allclose(model.load_factor_index.mean(axis=1), 1.0)
+
+def test_seasonal_run_repeats_yearly_and_restores_routes(make_simulation):
+    simulation = make_simulation()
+    before = _route_values(simulation)
+    simulation.seasonality = SeasonalDemandModel(simulation.route_network)
+    reports = simulation.run_simulation(8, {})
+    assert _route_values(simulation) == before
+
+    lhr = [report['route_performance']['route_details']['DAC-LHR']['load_factor'] for report in reports]
+    index = simulation.seasonality.load_factor_index[simulation.seasonality._row['DAC-LHR']]
+    np.testing.assert_allclose(lhr, np.tile(before['DAC-LHR'][0] * index, 2))
+
+def test_revenue_management_does_not_compound_seasonality(make_simulation):
+    simulation = make_simulation()
+    before = _route_values(simulation)
+    simulation.seasonality = SeasonalDemandModel(simulation.route_network)
+    simulation.revenue_management = RevenueManagementModel(seed=3)
+    simulation.run_simulation(8, {})
+    assert _route_values(simulation) == before
+
+def test_failed_quarter_restores_unseasoned_values(make_simulation):
+    simulation = make_simulation()
+    before = _route_values(simulation)
+    simulation.seasonality = SeasonalDemandModel(simulation.route_network)
+
+    class FailingCrew:
+        def solve(self, route_network, fleet):
+            raise RuntimeError('solver failed')
+
+    simulation.crew = FailingCrew()
+    with pytest.raises(RuntimeError):
+        simulation.run_quarter('2025-Q3', {})
+    assert _route_values(simulation) == before
+
+def test_seasonality_groups_by_quarter_of_year():
+    reports = synthetic_reports(n_quarters=8)
+    incremental = IncrementalAnalysis()
+    for report in reports:
+        incremental.update(report)
+    seasonality = incremental.analysis()['Route Performance']['DAC-CGP']['seasonality']
+    for q in range(1, 5):
+        expected = np.mean([report['route_performance']['route_details']['DAC-CGP']['load_factor']
+                            for report in reports if report['quarter'].endswith(f'Q{q}')])
+        assert seasonality[f'q{q}_mean'] == pytest.approx(expected)
@@ -0,0 +1,84 @@
+import csv
+import json
+
+from openpyxl import load_workbook
+
+from incremental_stats import IncrementalAnalysis
+from test_incremental_stats import synthetic_reports
+from visualization import SimulationVisualizer
+
+def test_excel_export_header_is_union_of_row_fields(tmp_path):
+    visualizer = SimulationVisualizer(str(tmp_path / 'reports'))
+    analysis = {'Route Performance': {
+        'DAC-CGP': {'load_factor': {'mean': 0.7}},
+        'DAC-LHR': {'load_factor': {'mean': 0.8, 'std': 0.1}, 'spill': 12.0},
+    }}
+    path = visualizer.export_analysis(analysis, format='excel')
+
+    rows = list(load_workbook(path)['Route Performance'].values)
+    header = rows[0]
+    assert header[0] == 'name' and len(header) == 4
+    by_name = {row[0]: dict(zip(header, row)) for row in rows[1:]}
+    spill = next(column for column in header if 'spill' in column)
+    std = next(column for column in header if 'std' in column)
+    assert by_name['DAC-LHR'][spill] == 12.0 and by_name['DAC-LHR'][std] == 0.1
+    assert by_name['DAC-CGP'][spill] is None and by_name['DAC-CGP'][std] is None
+
+def test_csv_export_matches_excel_columns(tmp_path):
+    visualizer = SimulationVisualizer(str(tmp_path / 'reports'))
+    analysis = {
+        'revenue': {'mean': 1.5, 'trend': {'slope': 0.2, 'significant': True}},
+        'Route Performance': {
+            'DAC-CGP': {'load_factor': {'mean': 0.7}},
+            'DAC-LHR': {'load_factor': {'mean': 0.8, 'std': 0.1}, 'spill': 12.0},
+        },
+        'cost': {'mean': 2.5},
+    }
+    path = visualizer.export_analysis(analysis, format='csv')
+    excel = load_workbook(visualizer.export_analysis(analysis, format='excel'))
+
+    with open(path, newline='') as f:
+        blocks = [block.splitlines() for block in f.read().split('\r\n\r\n')]
+    assert len(blocks) == 2
+    for block, sheet in zip(blocks, excel.worksheets):
+        rows = list(csv.reader(block))
+        header = list(next(sheet.values))
+        assert rows[0] == ['section'] + header
+        assert {row[0] for row in rows[1:]} == {sheet.title}
+    financial = list(csv.DictReader(blocks[0]))
+    assert [row['name'] for row in financial] == ['revenue', 'cost']
+    assert financial[0]['trend.significant'] == 'True' and financial[1]['trend.slope'] == ''
+    routes = {row['name']: row for row in csv.DictReader(blocks[1])}
+    assert routes['DAC-LHR']['spill'] == '12.0' and routes['DAC-CGP']['spill'] == ''
+
+def _write_reports(directory, reports):
+    directory.mkdir(exist_ok=True)
+    for report in reports:
+        (directory / f"{report['quarter']}_report.json").write_text(json.dumps(report))
+
+def test_reloaded_reports_reset_the_analysis(tmp_path):
+    reports_dir = tmp_path / 'reports'
+    _write_reports(reports_dir, synthetic_reports(seed=1))
+    visualizer = SimulationVisualizer(str(reports_dir), update_interval=0)
+    visualizer.perform_advanced_statistical_analysis()
+
+    # A re-run rewrites the same report files with different results
+    rerun = synthetic_reports(seed=2)
+    _write_reports(reports_dir, rerun)
+    assert visualizer._check_for_updates()
+    expected = IncrementalAnalysis()
+    for report in rerun:
+        expected.update(report)
+    assert visualizer.perform_advanced_statistical_analysis() == expected.analysis()
+
+def test_queries_follow_reloaded_reports(tmp_path, make_simulation):
+    reports_dir = tmp_path / 'reports'
+    _write_reports(reports_dir, make_simulation().run_simulation(3, {}))
+    visualizer = SimulationVisualizer(str(reports_dir), update_interval=0)
+    assert len(visualizer.query_key_metrics()) == 3
+
+    _write_reports(reports_dir, make_simulation().run_simulation(6, {}))
+    assert visualizer._check_for_updates()
+    assert visualizer.warehouse is None
+    assert len(visualizer.reports) == 6
+    assert len(visualizer.query_key_metrics()) == 6
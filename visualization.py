@@ -2,25 +2,95 @@ import matplotlib.pyplot as plt
 import pandas as pd
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
+import csv
 import seaborn as sns
-from scipy import stats
 import numpy as np
 from datetime import datetime
 import plotly.graph_objects as go
 import plotly.express as px
 from plotly.subplots import make_subplots
 import plotly.io as pio
-from scipy.stats import shapiro, ttest_ind, f_oneway
+from scipy.stats import f_oneway
 import warnings
+from openpyxl import Workbook
+from dashboard_output import write_split_dashboard
+from results_warehouse import ResultsWarehouse, quarter_sort_key
+from incremental_stats import IncrementalAnalysis
+from bootstrap import BootstrapResult, bootstrap_ci
+from build_graph import BuildGraph, Target
+from figure_templates import ChartTemplates, summary_text
 warnings.filterwarnings('ignore')
 
+# Analysis sections keyed by entity (route, route pair) rather than by metric
+ANALYSIS_ENTITY_SECTIONS = ('Route Performance', 'Route Comparison')
+
+
+def lttb_downsample(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Select indices of a series with Largest-Triangle-Three-Buckets downsampling.
+    
+    Returns all indices when the series already fits within ``threshold`` points.
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    indices = np.empty(threshold, dtype=int)
+    indices[0], indices[-1] = 0, n - 1
+    
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        next_end = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[end:next_end].mean()
+        avg_y = y[end:next_end].mean()
+        area = np.abs((x[a] - avg_x) * (y[start:end] - y[a]) -
+                      (x[a] - x[start:end]) * (avg_y - y[a]))
+        a = start + int(area.argmax())
+        indices[i + 1] = a
+    return indices
+
+
+def bucket_top_n(pivot: pd.DataFrame, top_n: int, aggfunc: str = 'sum',
+                 rank_by: Optional[List[str]] = None) -> pd.DataFrame:
+    """Keep the top-N columns of a pivot and aggregate the rest into 'Other'.
+    
+    Columns are ranked by mean absolute value unless ``rank_by`` gives the
+    columns to keep (an 'Other' entry in it is ignored).
+    """
+    if rank_by is not None:
+        keep = [col for col in rank_by if col in pivot.columns]
+    else:
+        keep = list(pivot.abs().mean().sort_values(ascending=False).index[:top_n])
+    rest = [col for col in pivot.columns if col not in keep]
+    result = pivot[keep]
+    if rest:
+        result = result.assign(Other=pivot[rest].agg(aggfunc, axis=1))
+    return result
+
+
+def ci_error_bars(result: BootstrapResult, i: int, n_points: int = 1) -> Dict:
+    """Plotly ``error_y`` drawing row ``i``'s bootstrap interval around its estimate."""
+    above = np.nan_to_num(result.upper[i] - result.estimate[i])
+    below = np.nan_to_num(result.estimate[i] - result.lower[i])
+    return dict(type='data', symmetric=False, array=[above] * n_points,
+                arrayminus=[below] * n_points, visible=True)
+
 class SimulationVisualizer:
     """Visualizes simulation results and generates analysis plots."""
     
-    def __init__(self, reports_dir: str = 'reports', update_interval: int = 300):
+    def __init__(self, reports_dir: str = 'reports', update_interval: int = 300,
+                 warehouse: Optional[ResultsWarehouse] = None, run_id: Optional[str] = None,
+                 templates: Optional[ChartTemplates] = None):
         self.reports_dir = Path(reports_dir)
-        self.reports = self._load_reports()
+        self.warehouse = warehouse  # reports are read from here instead of reports_dir when set
+        self.run_id = run_id  # warehouse run to plot; defaults to the latest run
+        self.templates = templates  # persistent figures reused across renders, if set
+        self._snapshot: Optional[ResultsWarehouse] = None  # in-memory copy of self.reports for queries
+        self._set_reports(self._load_reports())
         self.setup_style()
         self.update_interval = update_interval  # seconds
         self.last_update = datetime.now()
@@ -32,24 +102,74 @@ class SimulationVisualizer:
         pio.templates.default = "plotly_white"
     
     def _load_reports(self) -> List[Dict]:
-        """Load all quarterly reports."""
+        """Load all quarterly reports in chronological order."""
+        if self.warehouse is not None:
+            run_id = self.run_id or self.warehouse.latest_run()
+            return self.warehouse.reports(run_id) if run_id else []
         reports = []
-        for report_file in sorted(self.reports_dir.glob('*_report.json')):
+        report_files = sorted(self.reports_dir.glob('*_report.json'),
+                              key=lambda path: quarter_sort_key(path.name[:-len('_report.json')]))
+        for report_file in report_files:
             with open(report_file, 'r') as f:
                 reports.append(json.load(f))
         return reports
     
+    def _set_reports(self, reports: List[Dict]):
+        """Replace the report history; the analysis state is rebuilt on next use."""
+        self.reports = reports
+        self.analysis_state = IncrementalAnalysis()  # folded forward as reports are appended
+        self._snapshot = None
+    
+    def add_report(self, report: Dict):
+        """Append a new quarterly report (e.g. as a simulation report listener)."""
+        self.reports.append(report)
+        self._snapshot = None
+        self._sync_analysis_state()
+    
+    def _sync_analysis_state(self):
+        """Fold reports added since the last sync into the incremental analysis state."""
+        for report in self.reports[self.analysis_state.count:]:
+            self.analysis_state.update(report)
+    
+    def _get_warehouse(self) -> ResultsWarehouse:
+        """The attached warehouse, or an in-memory snapshot of the loaded reports.
+        
+        The snapshot is private and is rebuilt after the reports change, so it
+        never replaces ``reports_dir`` as the source of ``_load_reports``.
+        """
+        if self.warehouse is not None:
+            return self.warehouse
+        if self._snapshot is None:
+            self._snapshot = ResultsWarehouse(':memory:')
+            self._snapshot.ingest(self.reports_dir.name, self.reports, label=str(self.reports_dir))
+        return self._snapshot
+    
+    def query_key_metrics(self, run_ids=None, seqs=None) -> pd.DataFrame:
+        """Key metrics for selected runs and quarter positions, one row per quarter."""
+        return self._get_warehouse().key_metrics(run_ids, seqs)
+    
+    def query_fleet_status(self, run_ids=None, seqs=None) -> pd.DataFrame:
+        """Fleet status for selected runs and quarter positions."""
+        return self._get_warehouse().fleet_status(run_ids, seqs)
+    
+    def query_routes(self, routes=None, run_ids=None, seqs=None) -> pd.DataFrame:
+        """Route details for selected routes, runs and quarter positions."""
+        return self._get_warehouse().route_details(run_ids, seqs, routes)
+    
     def _check_for_updates(self) -> bool:
         """Check if reports need to be updated."""
         current_time = datetime.now()
         if (current_time - self.last_update).total_seconds() >= self.update_interval:
-            self.reports = self._load_reports()
+            self._set_reports(self._load_reports())
             self.last_update = current_time
             return True
         return False
     
     def plot_financial_metrics(self, save_path: str = None):
         """Plot key financial metrics over time."""
+        if self.templates is not None:
+            self.templates.financial_metrics.render(self.reports, save_path)
+            return
         quarters = [report['quarter'] for report in self.reports]
         metrics = {
             'Operating Margin (%)': [report['key_metrics']['operating_margin'] for report in self.reports],
@@ -87,6 +207,9 @@ class SimulationVisualizer:
     
     def plot_route_performance(self, save_path: str = None):
         """Plot route performance metrics."""
+        if self.templates is not None:
+            self.templates.route_performance.render(self.reports, save_path)
+            return
         route_data = []
         for report in self.reports:
             quarter = report['quarter']
@@ -133,6 +256,9 @@ class SimulationVisualizer:
     
     def plot_fleet_utilization(self, save_path: str = None):
         """Plot fleet utilization metrics."""
+        if self.templates is not None:
+            self.templates.fleet_utilization.render(self.reports, save_path)
+            return
         quarters = [report['quarter'] for report in self.reports]
         fleet_status = {
             'Active': [report['fleet_status']['active_aircraft'] for report in self.reports],
@@ -169,120 +295,34 @@ class SimulationVisualizer:
         plt.close()
     
     def perform_advanced_statistical_analysis(self) -> Dict:
-        """Perform comprehensive statistical analysis on key metrics."""
-        analysis = {}
+        """Perform comprehensive statistical analysis on key metrics.
         
-        # Financial metrics analysis
-        financial_data = {
-            'Operating Margin': [report['key_metrics']['operating_margin'] for report in self.reports],
-            'ROIC': [report['key_metrics']['roic'] for report in self.reports],
-            'Cash Burn Rate': [report['key_metrics']['cash_burn_rate'] for report in self.reports]
+        Statistics come from the incremental analysis state, so each call
+        only folds in the reports added since the previous one.
+        """
+        self._sync_analysis_state()
+        return self.analysis_state.analysis()
+    
+    def bootstrap_confidence_intervals(self, n_resamples: int = 2000, confidence: float = 0.95,
+                                       seed: Optional[int] = 0, workers: Optional[int] = None) -> Dict:
+        """Bootstrap intervals for the mean of each financial metric and of each route's profit and load factor.
+        
+        Quarters are resampled jointly for all series; routes missing from a
+        quarter are skipped in the resamples that draw it.
+        """
+        financial = {
+            name: [report['key_metrics'][field] for report in self.reports]
+            for name, field in (('Operating Margin', 'operating_margin'), ('ROIC', 'roic'),
+                                ('Cash Burn Rate', 'cash_burn_rate'))
         }
-        
-        for metric, values in financial_data.items():
-            # Basic statistics
-            analysis[metric] = {
-                'mean': np.mean(values),
-                'std': np.std(values),
-                'min': np.min(values),
-                'max': np.max(values),
-                'median': np.median(values),
-                'iqr': stats.iqr(values),
-                'skewness': stats.skew(values),
-                'kurtosis': stats.kurtosis(values),
-                'trend': np.polyfit(range(len(values)), values, 1)[0]
-            }
-            
-            # Normality test
-            _, p_value = shapiro(values)
-            analysis[metric]['normality_test'] = {
-                'p_value': p_value,
-                'is_normal': p_value > 0.05
-            }
-            
-            # Trend analysis
-            x = np.arange(len(values))
-            slope, intercept, r_value, p_value, std_err = stats.linregress(x, values)
-            analysis[metric]['trend_analysis'] = {
-                'slope': slope,
-                'r_squared': r_value**2,
-                'p_value': p_value,
-                'std_err': std_err
-            }
-        
-        # Route performance analysis
-        route_data = []
-        for report in self.reports:
-            for route, metrics in report['route_performance']['route_details'].items():
-                route_data.append({
-                    'Route': route,
-                    'Profit': metrics['profit'],
-                    'Load Factor': metrics['load_factor'],
-                    'Quarter': report['quarter']
-                })
-        
-        df_routes = pd.DataFrame(route_data)
-        
-        # Route-specific analysis
-        route_analysis = {}
-        for route in df_routes['Route'].unique():
-            route_df = df_routes[df_routes['Route'] == route]
-            
-            # Profitability analysis
-            profit_stats = {
-                'mean': route_df['Profit'].mean(),
-                'std': route_df['Profit'].std(),
-                'min': route_df['Profit'].min(),
-                'max': route_df['Profit'].max(),
-                'median': route_df['Profit'].median(),
-                'profit_margin': (route_df['Profit'].sum() / len(route_df)) / route_df['Profit'].abs().max()
-            }
-            
-            # Load factor analysis
-            lf_stats = {
-                'mean': route_df['Load Factor'].mean(),
-                'std': route_df['Load Factor'].std(),
-                'min': route_df['Load Factor'].min(),
-                'max': route_df['Load Factor'].max(),
-                'median': route_df['Load Factor'].median()
-            }
-            
-            # Seasonality analysis
-            quarterly_means = route_df.groupby('Quarter')['Load Factor'].mean()
-            seasonality = {
-                'q1_mean': quarterly_means.get('Q1', 0),
-                'q2_mean': quarterly_means.get('Q2', 0),
-                'q3_mean': quarterly_means.get('Q3', 0),
-                'q4_mean': quarterly_means.get('Q4', 0)
-            }
-            
-            route_analysis[route] = {
-                'profitability': profit_stats,
-                'load_factor': lf_stats,
-                'seasonality': seasonality
-            }
-        
-        analysis['Route Performance'] = route_analysis
-        
-        # Comparative analysis between routes
-        route_comparison = {}
-        routes = df_routes['Route'].unique()
-        for i, route1 in enumerate(routes):
-            for route2 in routes[i+1:]:
-                route1_data = df_routes[df_routes['Route'] == route1]['Profit']
-                route2_data = df_routes[df_routes['Route'] == route2]['Profit']
-                
-                # T-test for profit comparison
-                t_stat, p_value = ttest_ind(route1_data, route2_data)
-                route_comparison[f"{route1}_vs_{route2}"] = {
-                    't_statistic': t_stat,
-                    'p_value': p_value,
-                    'significant_difference': p_value < 0.05
-                }
-        
-        analysis['Route Comparison'] = route_comparison
-        
-        return analysis
+        df_routes = self._route_frame()
+        options = dict(n_resamples=n_resamples, confidence=confidence, seed=seed, workers=workers)
+        intervals = {'Financial': bootstrap_ci(list(financial.values()), labels=list(financial), **options)}
+        for section, column in (('Route Profit', 'Profit'), ('Route Load Factor', 'Load Factor')):
+            pivot = df_routes.pivot_table(index='Route', columns='Quarter', values=column,
+                                          aggfunc='mean', sort=False)
+            intervals[section] = bootstrap_ci(pivot.to_numpy(dtype=float), labels=list(pivot.index), **options)
+        return intervals
     
     def _to_native(self, obj):
         """Recursively convert numpy types to native Python types."""
@@ -295,6 +335,84 @@ class SimulationVisualizer:
         else:
             return obj
 
+    def _flatten_entry(self, value, prefix: str = '', out: Optional[Dict] = None) -> Dict:
+        """Flatten a nested dict into dotted column names with native scalar values."""
+        if out is None:
+            out = {}
+        if isinstance(value, dict):
+            for key, subvalue in value.items():
+                self._flatten_entry(subvalue, f"{prefix}.{key}" if prefix else str(key), out)
+        else:
+            out[prefix or 'value'] = value.item() if isinstance(value, np.generic) else value
+        return out
+    
+    def _iter_analysis_rows(self, analysis: Dict) -> Iterator[Tuple[str, str, Dict]]:
+        """Walk the analysis tree, yielding (section, name, flattened fields) rows."""
+        for key, value in analysis.items():
+            if key in ANALYSIS_ENTITY_SECTIONS:
+                for name, entry in value.items():
+                    yield key, name, self._flatten_entry(entry)
+            else:
+                yield 'Financial Metrics', key, self._flatten_entry(value)
+    
+    def _iter_section_rows(self, analysis: Dict, section: str) -> Iterator[Tuple[str, Dict]]:
+        """Yield the (name, flattened fields) rows of one section of the analysis tree."""
+        if section in ANALYSIS_ENTITY_SECTIONS:
+            for name, entry in analysis[section].items():
+                yield name, self._flatten_entry(entry)
+        else:
+            for key, value in analysis.items():
+                if key not in ANALYSIS_ENTITY_SECTIONS:
+                    yield key, self._flatten_entry(value)
+    
+    def _section_columns(self, analysis: Dict) -> Dict[str, List[str]]:
+        """Columns of each section: the union of its rows' fields in first-seen order."""
+        columns_by_section: Dict[str, Dict[str, None]] = {}
+        for section, _, fields in self._iter_analysis_rows(analysis):
+            columns_by_section.setdefault(section, {}).update(dict.fromkeys(fields))
+        return {section: list(columns) for section, columns in columns_by_section.items()}
+    
+    def _write_excel_stream(self, analysis: Dict, output_path: str):
+        """Write analysis rows to a write-only workbook, one sheet per section.
+        
+        A first pass collects each sheet's columns (``_section_columns``), so
+        the header can be written before streaming the rows; fields a row
+        lacks are left blank.
+        """
+        workbook = Workbook(write_only=True)
+        for section, columns in self._section_columns(analysis).items():
+            sheet = workbook.create_sheet(title=section[:31])
+            sheet.append(['name'] + columns)
+            for name, fields in self._iter_section_rows(analysis, section):
+                # Excel has no NaN/inf cell values; leave those cells blank
+                sheet.append([name] + [
+                    None if isinstance(value, float) and not np.isfinite(value) else value
+                    for value in (fields.get(column) for column in columns)
+                ])
+        workbook.save(output_path)
+    
+    def _write_csv_stream(self, analysis: Dict, output_path: str, chunk_size: int = 1000):
+        """Write analysis rows as CSV in the Excel export's layout.
+        
+        Each section is a block with its own ``section,name,<fields>`` header
+        (the same columns as its Excel sheet) followed by one row per entry,
+        so every field has its own typed column; fields a row lacks are left
+        blank and sections are separated by an empty line.
+        """
+        with open(output_path, 'w', newline='', buffering=1 << 16) as f:
+            writer = csv.writer(f)
+            for i, (section, columns) in enumerate(self._section_columns(analysis).items()):
+                if i:
+                    writer.writerow([])
+                writer.writerow(['section', 'name'] + columns)
+                chunk = []
+                for name, fields in self._iter_section_rows(analysis, section):
+                    chunk.append([section, name] + [fields.get(column) for column in columns])
+                    if len(chunk) >= chunk_size:
+                        writer.writerows(chunk)
+                        chunk.clear()
+                writer.writerows(chunk)
+    
     def export_analysis(self, analysis: Dict, format: str = 'json') -> str:
         """Export analysis results in various formats."""
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -306,40 +424,84 @@ class SimulationVisualizer:
         
         elif format.lower() == 'excel':
             output_path = f'analysis_{timestamp}.xlsx'
-            with pd.ExcelWriter(output_path) as writer:
-                # Financial metrics
-                financial_df = pd.DataFrame(analysis).T
-                financial_df.to_excel(writer, sheet_name='Financial Metrics')
-                
-                # Route performance
-                route_perf = analysis['Route Performance']
-                route_df = pd.DataFrame.from_dict(route_perf, orient='index')
-                route_df.to_excel(writer, sheet_name='Route Performance')
-                
-                # Route comparison
-                comp_df = pd.DataFrame.from_dict(analysis['Route Comparison'], orient='index')
-                comp_df.to_excel(writer, sheet_name='Route Comparison')
+            self._write_excel_stream(analysis, output_path)
         
         elif format.lower() == 'csv':
             output_path = f'analysis_{timestamp}.csv'
-            # Flatten nested dictionary for CSV export
-            flat_analysis = {}
-            for key, value in analysis.items():
-                if isinstance(value, dict):
-                    for subkey, subvalue in value.items():
-                        flat_analysis[f"{key}_{subkey}"] = subvalue
-                else:
-                    flat_analysis[key] = value
-            
-            pd.DataFrame.from_dict(self._to_native(flat_analysis), orient='index').to_csv(output_path)
+            self._write_csv_stream(analysis, output_path)
         
         return output_path
     
-    def generate_interactive_dashboard(self, save_path: str = None):
-        """Generate an interactive dashboard using Plotly."""
+    def generate_interactive_dashboard(self, save_path: str = None, large_data: bool = False,
+                                       point_budget: int = 20000, top_n_routes: int = 10,
+                                       output_mode: str = 'cdn', gzip_payload: bool = False):
+        """Generate an interactive dashboard using Plotly.
+        
+        With ``large_data`` the dashboard uses WebGL traces, LTTB-downsampled
+        time series and top-N route bucketing so the whole figure stays within
+        roughly ``point_budget`` plotted points.
+        
+        ``output_mode`` selects how the HTML is written: 'cdn' loads plotly.js
+        from the CDN, 'offline' references a plotly.min.js bundle shared by
+        the output directory, and 'split' additionally stores each panel's
+        data in a separate (optionally gzipped) JSON file loaded lazily.
+        """
+        if output_mode not in ('cdn', 'offline', 'split'):
+            raise ValueError("Invalid output_mode. Must be one of ['cdn', 'offline', 'split']")
+        
         # Check for updates
         self._check_for_updates()
         
+        if large_data:
+            fig = self._build_large_data_dashboard(point_budget, top_n_routes)
+        else:
+            fig = self._build_dashboard_figure()
+        
+        # Update layout with more interactive features
+        fig.update_layout(
+            height=1600,
+            width=1800,
+            title_text="Biman Bangladesh Airlines Performance Dashboard",
+            showlegend=True,
+            hovermode='closest' if large_data else 'x unified',
+            template='plotly_white',
+            updatemenus=[
+                dict(
+                    type="buttons",
+                    direction="right",
+                    x=0.7,
+                    y=1.2,
+                    showactive=True,
+                    buttons=list([
+                        dict(
+                            args=[{"visible": [True] * len(fig.data)}],
+                            label="Show All",
+                            method="update"
+                        ),
+                        dict(
+                            args=[{"visible": [True if (trace.name and "LF" in trace.name) else False for trace in fig.data]}],
+                            label="Load Factors Only",
+                            method="update"
+                        ),
+                        dict(
+                            args=[{"visible": [True if (trace.name and "Profit" in trace.name) else False for trace in fig.data]}],
+                            label="Profitability Only",
+                            method="update"
+                        )
+                    ])
+                )
+            ]
+        )
+        
+        if save_path:
+            if output_mode == 'split':
+                write_split_dashboard(fig, save_path, gzip_payload=gzip_payload)
+            else:
+                fig.write_html(save_path,
+                               include_plotlyjs='directory' if output_mode == 'offline' else 'cdn')
+    
+    def _build_dashboard_figure(self) -> go.Figure:
+        """Build the standard eight-panel dashboard figure."""
         # Create subplot figure with more detailed layout
         fig = make_subplots(
             rows=4, cols=2,
@@ -347,7 +509,7 @@ class SimulationVisualizer:
                 'Financial Performance', 'Route Profitability',
                 'Fleet Status', 'Load Factors',
                 'Cash Flow Analysis', 'Route Network Map',
-                'Statistical Analysis', 'Performance Trends'
+                'Statistical Analysis', 'Mean Route Profit (95% Bootstrap CI)'
             ),
             specs=[
                 [{"type": "scatter"}, {"type": "bar"}],
@@ -364,19 +526,16 @@ class SimulationVisualizer:
             'ROIC (%)': [report['key_metrics']['roic'] for report in self.reports]
         }
         
-        for metric, values in metrics.items():
-            # Calculate confidence intervals
-            mean = np.mean(values)
-            std = np.std(values)
-            ci = 1.96 * std / np.sqrt(len(values))
-            
+        # Bootstrap 95% intervals for the mean of each metric
+        intervals = bootstrap_ci(list(metrics.values()), labels=list(metrics), seed=0)
+        for i, (metric, values) in enumerate(metrics.items()):
             fig.add_trace(
                 go.Scatter(
                     x=quarters,
                     y=values,
                     name=metric,
                     mode='lines+markers',
-                    error_y=dict(type='data', array=[ci]*len(values), visible=True)
+                    error_y=ci_error_bars(intervals, i, len(values))
                 ),
                 row=1, col=1
             )
@@ -474,50 +633,163 @@ class SimulationVisualizer:
             row=4, col=1
         )
         
-        # Update layout with more interactive features
-        fig.update_layout(
-            height=1600,
-            width=1800,
-            title_text="Biman Bangladesh Airlines Performance Dashboard",
-            showlegend=True,
-            hovermode='x unified',
-            template='plotly_white',
-            updatemenus=[
-                dict(
-                    type="buttons",
-                    direction="right",
-                    x=0.7,
-                    y=1.2,
-                    showactive=True,
-                    buttons=list([
-                        dict(
-                            args=[{"visible": [True] * len(fig.data)}],
-                            label="Show All",
-                            method="update"
-                        ),
-                        dict(
-                            args=[{"visible": [True if (trace.name and "LF" in trace.name) else False for trace in fig.data]}],
-                            label="Load Factors Only",
-                            method="update"
-                        ),
-                        dict(
-                            args=[{"visible": [True if (trace.name and "Profit" in trace.name) else False for trace in fig.data]}],
-                            label="Profitability Only",
-                            method="update"
-                        )
-                    ])
-                )
+        self._add_route_profit_intervals(fig, pivot_routes)
+        
+        return fig
+    
+    def _build_large_data_dashboard(self, point_budget: int, top_n_routes: int) -> go.Figure:
+        """Build the dashboard figure for large report sets within a point budget."""
+        fig = make_subplots(
+            rows=4, cols=2,
+            subplot_titles=(
+                'Financial Performance', f'Route Profitability (Top {top_n_routes})',
+                'Fleet Status', f'Load Factors (Top {top_n_routes})',
+                'Cash Flow Analysis', 'Route Network Map',
+                'Statistical Analysis', 'Mean Route Profit (95% Bootstrap CI)'
+            ),
+            specs=[
+                [{"type": "scatter"}, {"type": "bar"}],
+                [{"type": "bar"}, {"type": "scatter"}],
+                [{"type": "scatter"}, {"type": "scatter"}],
+                [{"type": "table"}, {"type": "scatter"}]
             ]
         )
         
-        if save_path:
-            fig.write_html(save_path, include_plotlyjs='cdn')
+        quarters = np.array([report['quarter'] for report in self.reports])
+        positions = np.arange(len(quarters))
+        financial = {
+            'Operating Margin (%)': np.array([r['key_metrics']['operating_margin'] for r in self.reports], dtype=float),
+            'ROIC (%)': np.array([r['key_metrics']['roic'] for r in self.reports], dtype=float)
+        }
+        fleet = {
+            'Active': np.array([r['fleet_status']['active_aircraft'] for r in self.reports], dtype=float),
+            'Maintenance': np.array([r['fleet_status']['maintenance_aircraft'] for r in self.reports], dtype=float),
+            'Grounded': np.array([r['fleet_status']['grounded_aircraft'] for r in self.reports], dtype=float)
+        }
+        
+        df_routes = self._route_frame()
+        profit = bucket_top_n(
+            df_routes.pivot_table(index='Quarter', columns='Route', values='Profit', aggfunc='mean'),
+            top_n_routes, aggfunc='sum'
+        )
+        load = df_routes.pivot_table(index='Quarter', columns='Route', values='Load Factor', aggfunc='mean')
+        break_even = df_routes.pivot_table(index='Quarter', columns='Route', values='Break-even LF', aggfunc='mean')
+        load = bucket_top_n(load, top_n_routes, aggfunc='mean', rank_by=profit.columns)
+        break_even = bucket_top_n(break_even, top_n_routes, aggfunc='mean', rank_by=profit.columns)
+        
+        # Split the point budget evenly across all plotted series
+        n_series = len(financial) + len(fleet) + len(profit.columns) + 2 * len(load.columns)
+        per_series = max(3, point_budget // max(n_series, 1))
+        
+        intervals = bootstrap_ci(list(financial.values()), labels=list(financial), seed=0)
+        for i, (metric, values) in enumerate(financial.items()):
+            idx = lttb_downsample(positions, values, per_series)
+            fig.add_trace(
+                go.Scattergl(
+                    x=positions[idx], y=values[idx], text=quarters[idx], name=metric,
+                    mode='lines+markers',
+                    error_y=ci_error_bars(intervals, i, len(idx))
+                ),
+                row=1, col=1
+            )
+        
+        for status, values in fleet.items():
+            idx = lttb_downsample(positions, values, per_series)
+            fig.add_trace(
+                go.Bar(x=positions[idx], y=values[idx], text=quarters[idx], name=status,
+                       textposition='none'),
+                row=2, col=1
+            )
+        
+        route_positions = np.arange(len(profit.index))
+        route_quarters = np.asarray(profit.index)
+        for route in profit.columns:
+            values = profit[route].to_numpy(dtype=float)
+            idx = lttb_downsample(route_positions, values, per_series)
+            fig.add_trace(
+                go.Bar(x=route_quarters[idx], y=values[idx], name=route, textposition='none'),
+                row=1, col=2
+            )
+        
+        for route in load.columns:
+            for frame, name, line in ((load, f'{route} LF', None),
+                                      (break_even, f'{route} Break-even', dict(dash='dash'))):
+                values = frame[route].to_numpy(dtype=float) * 100
+                idx = lttb_downsample(route_positions, values, per_series)
+                fig.add_trace(
+                    go.Scattergl(x=route_quarters[idx], y=values[idx], name=name,
+                                 mode='lines' if line else 'lines+markers', line=line),
+                    row=2, col=2
+                )
+        
+        stats_table = self._financial_statistics_table(financial).round(4)
+        fig.add_trace(
+            go.Table(
+                header=dict(values=['Metric'] + list(stats_table.columns)),
+                cells=dict(values=[stats_table.index] + [stats_table[col] for col in stats_table.columns])
+            ),
+            row=4, col=1
+        )
+        
+        self._add_route_profit_intervals(fig, profit)
+        
+        return fig
+    
+    @staticmethod
+    def _add_route_profit_intervals(fig: go.Figure, profit: pd.DataFrame):
+        """Plot each route's mean quarterly profit with its bootstrap interval."""
+        intervals = bootstrap_ci(profit.to_numpy(dtype=float).T, labels=list(profit.columns), seed=0)
+        fig.add_trace(
+            go.Scatter(
+                x=intervals.labels,
+                y=intervals.estimate,
+                name='Mean Profit (95% CI)',
+                mode='markers',
+                error_y=dict(type='data', symmetric=False, visible=True,
+                             array=np.nan_to_num(intervals.upper - intervals.estimate),
+                             arrayminus=np.nan_to_num(intervals.estimate - intervals.lower))
+            ),
+            row=4, col=2
+        )
+    
+    def _route_frame(self) -> pd.DataFrame:
+        """Collect per-quarter route details from all reports into one frame."""
+        rows = []
+        for report in self.reports:
+            quarter = report['quarter']
+            for route, metrics in report['route_performance']['route_details'].items():
+                rows.append((quarter, route, metrics['profit'], metrics['load_factor'],
+                             metrics['break_even_load_factor']))
+        return pd.DataFrame(rows, columns=['Quarter', 'Route', 'Profit', 'Load Factor', 'Break-even LF'])
+    
+    @staticmethod
+    def _financial_statistics_table(series: Dict[str, np.ndarray]) -> pd.DataFrame:
+        """Compute summary statistics for equal-length metric series in one pass."""
+        names = list(series)
+        data = np.vstack([series[name] for name in names])
+        x = np.arange(data.shape[1], dtype=float)
+        x_centered = x - x.mean()
+        denom = (x_centered ** 2).sum()
+        trend = (data @ x_centered) / denom if denom else np.zeros(len(names))
+        return pd.DataFrame({
+            'mean': data.mean(axis=1),
+            'std': data.std(axis=1),
+            'min': data.min(axis=1),
+            'max': data.max(axis=1),
+            'median': np.median(data, axis=1),
+            'trend': trend
+        }, index=names)
     
     def generate_summary_report(self, save_path: str = None):
         """Generate a comprehensive summary report with multiple visualizations."""
         # Check for updates
         self._check_for_updates()
         
+        if self.templates is not None:
+            self.templates.summary_report.render(self.reports, save_path,
+                                                 analysis=self.perform_advanced_statistical_analysis())
+            return
+        
         # Create subplots with enhanced layout
         fig = plt.figure(figsize=(20, 15))
         gs = fig.add_gridspec(4, 2)
@@ -530,14 +802,14 @@ class SimulationVisualizer:
             'ROIC (%)': [report['key_metrics']['roic'] for report in self.reports]
         }
         
-        for metric, values in metrics.items():
-            mean = np.mean(values)
-            std = np.std(values)
-            ci = 1.96 * std / np.sqrt(len(values))
+        intervals = bootstrap_ci(list(metrics.values()), labels=list(metrics), seed=0)
+        for i, (metric, values) in enumerate(metrics.items()):
+            below = intervals.estimate[i] - intervals.lower[i]
+            above = intervals.upper[i] - intervals.estimate[i]
             ax1.plot(quarters, values, marker='o', label=metric)
             ax1.fill_between(quarters, 
-                           [v - ci for v in values],
-                           [v + ci for v in values],
+                           [v - below for v in values],
+                           [v + above for v in values],
                            alpha=0.2)
         
         ax1.set_title('Financial Performance with Confidence Intervals')
@@ -608,15 +880,7 @@ class SimulationVisualizer:
         # Statistical summary
         ax5 = fig.add_subplot(gs[3, :])
         analysis = self.perform_advanced_statistical_analysis()
-        stats_text = "Statistical Summary:\n\n"
-        for metric, stats in analysis.items():
-            if isinstance(stats, dict) and 'mean' in stats:
-                stats_text += f"{metric}:\n"
-                stats_text += f"Mean: {stats['mean']:.2f}\n"
-                stats_text += f"Std: {stats['std']:.2f}\n"
-                stats_text += f"Trend: {stats['trend']:.2f}\n\n"
-        
-        ax5.text(0.1, 0.5, stats_text, fontsize=10, va='center')
+        ax5.text(0.1, 0.5, summary_text(analysis), fontsize=10, va='center')
         ax5.axis('off')
         
         plt.tight_layout()
@@ -625,30 +889,45 @@ class SimulationVisualizer:
             plt.savefig(save_path, bbox_inches='tight')
         plt.close()
 
-def main():
-    """Generate visualization reports."""
-    visualizer = SimulationVisualizer()
-    
+def main(force: bool = False):
+    """Generate visualization reports, rebuilding only artifacts whose inputs changed."""
     # Create visualizations directory
     viz_dir = Path('visualizations')
     viz_dir.mkdir(exist_ok=True)
     
-    # Generate individual plots
-    visualizer.plot_financial_metrics(viz_dir / 'financial_metrics.png')
-    visualizer.plot_route_performance(viz_dir / 'route_performance.png')
-    visualizer.plot_fleet_utilization(viz_dir / 'fleet_utilization.png')
+    # The visualizer and analysis are only computed if some artifact is stale
+    cache = {}
+    def visualizer() -> SimulationVisualizer:
+        if 'visualizer' not in cache:
+            cache['visualizer'] = SimulationVisualizer()
+        return cache['visualizer']
+    def analysis() -> Dict:
+        if 'analysis' not in cache:
+            cache['analysis'] = visualizer().perform_advanced_statistical_analysis()
+        return cache['analysis']
+    
+    reports = sorted(Path('reports').glob('*_report.json'))
+    graph = BuildGraph(viz_dir / '.build_manifest.json')
+    
+    # Individual plots and comprehensive summary
+    for name, method in (('financial_metrics.png', 'plot_financial_metrics'),
+                         ('route_performance.png', 'plot_route_performance'),
+                         ('fleet_utilization.png', 'plot_fleet_utilization'),
+                         ('summary_report.png', 'generate_summary_report')):
+        graph.add(Target(name, outputs=[viz_dir / name], inputs=reports,
+                         build=lambda method=method, path=viz_dir / name: getattr(visualizer(), method)(path)))
     
-    # Generate comprehensive summary
-    visualizer.generate_summary_report(viz_dir / 'summary_report.png')
+    # Interactive dashboard
+    graph.add(Target('dashboard.html', outputs=[viz_dir / 'dashboard.html'], inputs=reports,
+                     params={'output_mode': 'cdn'},
+                     build=lambda: visualizer().generate_interactive_dashboard(viz_dir / 'dashboard.html')))
     
-    # Generate interactive dashboard
-    visualizer.generate_interactive_dashboard(viz_dir / 'dashboard.html')
+    # Statistical analysis exports (timestamped, so outputs are recorded after building)
+    for format in ('json', 'excel', 'csv'):
+        graph.add(Target(f'analysis_{format}', inputs=reports, params={'format': format},
+                         build=lambda format=format: [visualizer().export_analysis(analysis(), format)]))
     
-    # Perform statistical analysis and export
-    analysis = visualizer.perform_advanced_statistical_analysis()
-    visualizer.export_analysis(analysis, 'json')
-    visualizer.export_analysis(analysis, 'excel')
-    visualizer.export_analysis(analysis, 'csv')
+    graph.build(force=force)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()